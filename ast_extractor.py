@@ -1,30 +1,14 @@
-import code_ast
 import json
 from pathlib import Path
 import os
 import datetime
 import logging
-from tree_sitter import Language, Parser
+from compact_ast import CompactAST
+from parser_pool import parse
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-# Build the TypeScript language
-Language.build_library(
-    'build/my-languages.so',
-    [
-        'tree-sitter-typescript/typescript'
-    ]
-)
-
-try:
-    TYPESCRIPT_LANGUAGE = Language('build/my-languages.so', 'typescript')
-    parser = Parser()
-    parser.set_language(TYPESCRIPT_LANGUAGE)
-except:
-    logger.error("Failed to load TypeScript language parser")
-    raise
+# Grammars are loaded lazily on the first parse (see parser_pool.py)
 
 class JavaScriptASTExtractor:
     def __init__(self, repo_path):
@@ -53,81 +37,44 @@ class JavaScriptASTExtractor:
         return self.process_node(node)
 
     def process_node(self, node):
-        """Process individual AST nodes"""
+        """Process an AST node into a compact array-backed tree (see compact_ast.CompactAST)"""
         if node is None:
             return None
         
         try:
-            # Basic node information
-            result = {
-                'type': node.type if hasattr(node, 'type') else node.__class__.__name__,
-                'start_byte': node.start_byte if hasattr(node, 'start_byte') else None,
-                'end_byte': node.end_byte if hasattr(node, 'end_byte') else None,
-                'start_point': node.start_point if hasattr(node, 'start_point') else None,
-                'end_point': node.end_point if hasattr(node, 'end_point') else None,
-            }
-            
-            # Add text content
-            if hasattr(node, 'text'):
-                if isinstance(node.text, bytes):
-                    result['text'] = node.text.decode('utf-8')
-                else:
-                    result['text'] = str(node.text)
-            
-            # Process child nodes
-            if hasattr(node, 'children'):
-                children = []
-                for child in node.children:
-                    child_result = self.process_node(child)
-                    if child_result:
-                        children.append(child_result)
-                if children:
-                    result['children'] = children
-            # Handle named children separately
-            elif hasattr(node, 'named_children'):
-                children = []
-                for child in node.named_children:
-                    child_result = self.process_node(child)
-                    if child_result:
-                        children.append(child_result)
-                if children:
-                    result['children'] = children
-                
-            return result
+            return CompactAST.from_tree_sitter(node).root
             
         except Exception as e:
             logger.error(f"Error processing node: {e}")
             logger.exception("Stack trace:")
             return None
 
-    def process_js_file(self, file_path):
-        """Process a single JavaScript file and return its AST"""
+    def process_js_file(self, file_path, content=None):
+        """Process a single JavaScript file and return its AST
+
+        Args:
+            file_path: Path to the file
+            content: Source of the file if the caller already read it
+        """
         try:
-            if not os.path.isfile(file_path):
-                logger.error(f"File does not exist: {file_path}")
-                return None
-            
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
+            if content is None:
+                if not os.path.isfile(file_path):
+                    logger.error(f"File does not exist: {file_path}")
+                    return None
+
+                with open(file_path, 'r', encoding='utf-8') as file:
+                    content = file.read()
             
             # Handle empty files gracefully
             if not content or content.strip() == "":
                 logger.warning(f"Empty file detected: {file_path}")
-                return {
-                    "type": "program",
-                    "start_byte": 0,
-                    "end_byte": 0,
-                    "start_point": [0, 0],
-                    "end_point": [0, 0],
-                    "text": "",
-                    "children": []
-                }
+                return CompactAST.empty().root
   
             try:
-                tree = code_ast.ast(content, lang="javascript")
+                tree = parse(content, "javascript", syntax_error="raise")
                 if tree:
                     self.processed_files += 1
-                    return self.traverse_tree(tree)
+                    return self.traverse_tree(tree.root_node)
                 else:
                     logger.error(f"Failed to parse: {file_path}")
                     self.failed_files += 1
@@ -135,15 +82,7 @@ class JavaScriptASTExtractor:
             except ValueError as ve:
                 if "empty" in str(ve).lower():
                     logger.warning(f"Empty file detected: {file_path}")
-                    return {
-                        "type": "program",
-                        "start_byte": 0,
-                        "end_byte": 0,
-                        "start_point": [0, 0],
-                        "end_point": [0, 0],
-                        "text": "",
-                        "children": []
-                    }
+                    return CompactAST.empty().root
                 logger.error(f"Parsing error for {file_path}: {str(ve)}")
                 logger.exception("Stack trace:")
                 self.failed_files += 1
@@ -160,10 +99,10 @@ class JavaScriptASTExtractor:
                 with open(file_path, 'r', encoding='latin-1') as file:
                     content = file.read()
                 logger.debug("Attempting parse with latin-1 encoding")
-                tree = code_ast.ast(content, lang="javascript")
+                tree = parse(content, "javascript", syntax_error="raise")
                 if tree:
                     self.processed_files += 1
-                    return self.traverse_tree(tree)
+                    return self.traverse_tree(tree.root_node)
                 self.failed_files += 1
                 return None
             except Exception as e:
@@ -198,78 +137,46 @@ class TypeScriptASTExtractor:
         return self.process_node(node)
 
     def process_node(self, node):
-        """Process individual AST nodes"""
+        """Process an AST node into a compact array-backed tree (see compact_ast.CompactAST)"""
         if node is None:
             return None
         
         try:
-            # Basic node information
-            result = {
-                'type': node.type if hasattr(node, 'type') else node.__class__.__name__,
-                'start_byte': node.start_byte if hasattr(node, 'start_byte') else None,
-                'end_byte': node.end_byte if hasattr(node, 'end_byte') else None,
-                'start_point': node.start_point if hasattr(node, 'start_point') else None,
-                'end_point': node.end_point if hasattr(node, 'end_point') else None,
-            }
-            
-            # Add text content
-            if hasattr(node, 'text'):
-                if isinstance(node.text, bytes):
-                    result['text'] = node.text.decode('utf-8')
-                else:
-                    result['text'] = str(node.text)
-            
-            # Process child nodes
-            if hasattr(node, 'children'):
-                children = []
-                for child in node.children:
-                    child_result = self.process_node(child)
-                    if child_result:
-                        children.append(child_result)
-                if children:
-                    result['children'] = children
-            # Handle named children separately
-            elif hasattr(node, 'named_children'):
-                children = []
-                for child in node.named_children:
-                    child_result = self.process_node(child)
-                    if child_result:
-                        children.append(child_result)
-                if children:
-                    result['children'] = children
-                
-            return result
+            return CompactAST.from_tree_sitter(node).root
             
         except Exception as e:
             logger.error(f"Error processing node: {e}")
             logger.exception("Stack trace:")
             return None
 
-    def process_ts_file(self, file_path):
-        """Process a single TypeScript file and return its AST"""
+    @staticmethod
+    def _language(file_path):
+        """Grammar of a TypeScript file: .tsx files need the JSX-aware grammar"""
+        return "tsx" if file_path.endswith(".tsx") else "typescript"
+
+    def process_ts_file(self, file_path, content=None):
+        """Process a single TypeScript file and return its AST
+
+        Args:
+            file_path: Path to the file
+            content: Source of the file if the caller already read it
+        """
         try:
-            if not os.path.isfile(file_path):
-                logger.error(f"File does not exist: {file_path}")
-                return None
-            
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
+            if content is None:
+                if not os.path.isfile(file_path):
+                    logger.error(f"File does not exist: {file_path}")
+                    return None
+
+                with open(file_path, 'r', encoding='utf-8') as file:
+                    content = file.read()
             
             # Handle empty files gracefully
             if not content or content.strip() == "":
                 logger.warning(f"Empty file detected: {file_path}")
-                return {
-                    "type": "program",
-                    "start_byte": 0,
-                    "end_byte": 0,
-                    "start_point": [0, 0],
-                    "end_point": [0, 0],
-                    "text": "",
-                    "children": []
-                }
+                return CompactAST.empty().root
 
             try:
-                tree = parser.parse(bytes(content, 'utf8'))
+                tree = parse(content, self._language(file_path))
                 if tree:
                     self.processed_files += 1
                     return self.traverse_tree(tree.root_node)
@@ -280,15 +187,7 @@ class TypeScriptASTExtractor:
             except ValueError as ve:
                 if "empty" in str(ve).lower():
                     logger.warning(f"Empty file detected: {file_path}")
-                    return {
-                        "type": "program",
-                        "start_byte": 0,
-                        "end_byte": 0,
-                        "start_point": [0, 0],
-                        "end_point": [0, 0],
-                        "text": "",
-                        "children": []
-                    }
+                    return CompactAST.empty().root
                 logger.error(f"Parsing error for {file_path}: {str(ve)}")
                 logger.exception("Stack trace:")
                 self.failed_files += 1
@@ -305,10 +204,10 @@ class TypeScriptASTExtractor:
                 with open(file_path, 'r', encoding='latin-1') as file:
                     content = file.read()
                 logger.debug("Attempting parse with latin-1 encoding")
-                tree = code_ast.ast(content, lang="typescript")
+                tree = parse(content, self._language(file_path))
                 if tree:
                     self.processed_files += 1
-                    return self.traverse_tree(tree)
+                    return self.traverse_tree(tree.root_node)
                 self.failed_files += 1
                 return None
             except Exception as e:
@@ -330,4 +229,4 @@ if __name__ == "__main__":
     extractor = TypeScriptASTExtractor("./")
     ast = extractor.process_ts_file("exports.ts")
     with open("ast.json", "w") as f:
-        json.dump(ast, f, indent=4)
\ No newline at end of file
+        json.dump(ast.to_dict() if ast else ast, f, indent=4)
\ No newline at end of file
@@ -1,13 +1,24 @@
-import code_ast
 import logging
+from compact_ast import CompactAST, CompactNode
+from interval_index import FunctionIntervalIndex
+from extraction_visitor import CallSiteVisitor, SymbolTableVisitor
+from call_index import CallIndex
+from parser_pool import parse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Node types indexed by find_function_by_location
+FUNCTION_NODE_TYPES = ('function_declaration', 'method_definition')
+
 class ASTHelper:
-    def __init__(self):
-        pass
+    def __init__(self, call_index: CallIndex = None):
+        """
+        Args:
+            call_index: Optional repository-wide call index for find_functions_calling_in_repo
+        """
+        self.call_index = call_index
 
     def get_ast(self, file_content: str, language: str = "javascript") -> dict:
         """
@@ -18,10 +29,13 @@ class ASTHelper:
         Returns:
             Dictionary containing the AST
         """
-        tree = code_ast.ast(file_content, lang=language)
+        if not file_content.strip():
+            raise ValueError("The code string is empty. Cannot tokenize anything empty: %s" % file_content)
+
+        tree = parse(file_content, language, syntax_error="raise")
         if tree:
             logger.debug("Successfully created AST")
-            return self.traverse_tree(tree)
+            return self.traverse_tree(tree.root_node)
         else:
             logger.error("Failed to parse file content")
             return None
@@ -40,75 +54,61 @@ class ASTHelper:
         return self.process_node(node)
 
     def process_node(self, node) -> dict:
-        """Process individual AST nodes"""
+        """Process an AST node into a compact array-backed tree (see compact_ast.CompactAST)"""
         if node is None:
             return None
         
         try:
-            # Basic node information
-            result = {
-                'type': node.type if hasattr(node, 'type') else node.__class__.__name__,
-                'start_byte': node.start_byte if hasattr(node, 'start_byte') else None,
-                'end_byte': node.end_byte if hasattr(node, 'end_byte') else None,
-                'start_point': node.start_point if hasattr(node, 'start_point') else None,
-                'end_point': node.end_point if hasattr(node, 'end_point') else None,
-            }
-            
-            # Add text content
-            if hasattr(node, 'text'):
-                if isinstance(node.text, bytes):
-                    result['text'] = node.text.decode('utf-8')
-                else:
-                    result['text'] = str(node.text)
-            
-            # Process child nodes
-            if hasattr(node, 'children'):
-                children = []
-                for child in node.children:
-                    child_result = self.process_node(child)
-                    if child_result:
-                        children.append(child_result)
-                if children:
-                    result['children'] = children
-            
-            return result
+            return CompactAST.from_tree_sitter(node).root
             
         except Exception as e:
             logger.error(f"Error processing node: {e}")
             logger.exception("Stack trace:")
             return None
 
+    def function_index(self, ast: dict, node_types: tuple = FUNCTION_NODE_TYPES) -> FunctionIntervalIndex:
+        """
+        Get the line-range index of the functions and methods of an AST
+        Args:
+            ast: The AST dictionary
+            node_types: Node types treated as functions
+        Returns:
+            FunctionIntervalIndex, built once per compact AST and node types and cached
+        """
+        if not isinstance(ast, CompactNode):
+            return FunctionIntervalIndex(ast, node_types)
+
+        indexes = ast.tree.indexes
+        key = (ast.index, node_types)
+        if key not in indexes:
+            indexes[key] = FunctionIntervalIndex(ast, node_types)
+        return indexes[key]
+
     def find_function_by_location(self, ast: dict, line: int) -> dict:
         """
-        Find function node containing the given line number
+        Find the innermost function node containing the given line number
         Args:
             ast: The AST dictionary
             line: Line number to search for
         Returns:
             Function node containing the line, or None
         """
-        def search_node(node, line):
-            if not node:
-                return None
-                
-            start_line = node.get('start_point', [0])[0]
-            end_line = node.get('end_point', [0])[0]
-            
-            # Check if this is a function node and contains our line
-            if (node.get('type') in ['function_declaration', 'method_definition'] and 
-                start_line <= line <= end_line):
-                return node
-            
-            # Search children
-            if 'children' in node:
-                for child in node['children']:
-                    result = search_node(child, line)
-                    if result:
-                        return result
-            
+        if not ast:
             return None
-        
-        return search_node(ast, line)
+        return self.function_index(ast).find(line)
+
+    def find_functions_by_lines(self, ast: dict, lines: list) -> dict:
+        """
+        Find the innermost function node containing each of the given line numbers
+        Args:
+            ast: The AST dictionary
+            lines: Line numbers to search for
+        Returns:
+            Dictionary mapping each line to its function node, or None
+        """
+        if not ast:
+            return {line: None for line in lines}
+        return self.function_index(ast).find_many(lines)
 
 
     def find_function_by_hunk(self, ast: dict, hunk: str) -> dict:
@@ -116,199 +116,109 @@ class ASTHelper:
         Find function node containing the given hunk
         Args:
             ast: The AST dictionary
-            hunk: The hunk content
+            hunk: The hunk content, including its @@ header
         Returns:
-            Function node containing the hunk
+            Innermost function node containing the changed lines of the hunk, or None
         """
-        # Extract lines of code from the hunk (excluding diff markers)
-        hunk_lines = [line for line in hunk.split('\n') if line.strip()]
-        search_lines = []
-        
-        for line in hunk_lines:
-            # Skip the @@ line
-            if line.startswith('@@'):
+        from hunk_mapper import HunkFunctionMapper
+
+        return HunkFunctionMapper(self).map_hunk(ast, hunk)['function']
+
+    def call_sites(self, ast: dict) -> dict:
+        """
+        Get the inverted call index of a single AST
+        Args:
+            ast: The AST dictionary
+        Returns:
+            Dictionary mapping callee names and callee texts to the enclosing function
+            nodes calling them, built once per compact AST and cached
+        """
+        if isinstance(ast, CompactNode):
+            indexes = ast.tree.indexes
+            if ('calls', ast.index) in indexes:
+                return indexes[('calls', ast.index)]
+
+        callers = {}
+        for callee, callee_text, scope, _ in CallSiteVisitor().visit(ast).sites:
+            if scope is None:
                 continue
-            # Remove +/- and leading/trailing whitespace
-            cleaned_line = line.lstrip('+ -').strip()
-            if cleaned_line and not cleaned_line.startswith('//'):
-                search_lines.append(cleaned_line)
-        
-        if not search_lines:
-            return None
+            for key in {callee, callee_text}:
+                scopes = callers.setdefault(key, [])
+                if scope not in scopes:
+                    scopes.append(scope)
 
-        def search_node(node):
-            if not node:
-                return None
-            
-            # Get node's text content
-            node_text = node.get('text', '')
-            
-            # Check if this node contains any of our search lines
-            if any(search_line in node_text for search_line in search_lines):
-                # Check if current node is a function node
-                if node.get('type') in [
-                    'function_declaration',          # function foo() {}
-                    'method_definition',            # class { foo() {} }
-                    'arrow_function',               # const foo = () => {}
-                    'function_expression',          # const foo = function() {}
-                    'object_method',                # { foo() {} }
-                    'pair',                         # { foo: function() {} }
-                    'property',                     # { foo: () => {} }
-                    'assignment_expression',        # foo = function() {}
-                    'variable_declarator'           # const foo = function() {}
-                ]:
-                    return node
-                
-                # Walk up the tree to find the containing function
-                current = node
-                while current.get('parent'):
-                    current = current.get('parent')
-                    if current.get('type') in [
-                        'function_declaration',
-                        'method_definition',
-                        'arrow_function',
-                        'function_expression',
-                        'object_method',
-                        'pair',
-                        'property',
-                        'assignment_expression',
-                        'variable_declarator'
-                    ]:
-                        return current
-            
-            # Search children
-            if 'children' in node:
-                for child in node['children']:
-                    result = search_node(child)
-                    if result:
-                        return result
-            
-            return None
-        
-        # Find the function node
-        function_node = search_node(ast)
-        
-        # If found, return its text content
-        return function_node
-        
-        return None
+        if isinstance(ast, CompactNode):
+            indexes[('calls', ast.index)] = callers
+        return callers
 
     def find_functions_calling(self, ast: dict, function_name: str) -> list:
         """
         Find all functions that call the given function
         Args:
             ast: The AST dictionary
-            function_name: Name of the function to search for calls
+            function_name: Name (e.g. 'query') or callee text (e.g. 'db.query') of the function
         Returns:
             List of function nodes that call the given function
         """
-        calling_functions = []
-        
-        def search_node(node, current_function=None):
-            if not node:
-                return
-            
-            # If this is a function definition, update current_function
-            if node.get('type') in ['method_definition', 'function_declaration']:
-                current_function = node
-            
-            # Check if this node is a function call
-            if node.get('type') == 'call_expression':
-                call_text = node.get('text', '')
-                if function_name in call_text and current_function:
-                    if current_function not in calling_functions:
-                        calling_functions.append(current_function)
-            
-            # Search children
-            if 'children' in node:
-                for child in node['children']:
-                    search_node(child, current_function)
-        
-        search_node(ast)
-        return calling_functions
+        if not ast:
+            return []
+        return list(self.call_sites(ast).get(function_name, []))
+
+    def find_functions_calling_in_repo(self, function_name: str) -> list:
+        """
+        Find all functions across the repository that call the given function
+        Args:
+            function_name: Name (e.g. 'query') or callee text (e.g. 'db.query') of the function
+        Returns:
+            List of (file path, function name) pairs from the repository call index
+        """
+        if self.call_index is None:
+            raise ValueError("ASTHelper was created without a call index")
+        return self.call_index.calling_functions(function_name)
+
+    def symbol_table(self, ast: dict) -> dict:
+        """
+        Get the symbol table of a single AST
+        Args:
+            ast: The AST dictionary
+        Returns:
+            Dictionary mapping definition names to (kind, start_byte, end_byte), built
+            once per compact AST and cached
+        """
+        if isinstance(ast, CompactNode):
+            indexes = ast.tree.indexes
+            if ('symbols', ast.index) in indexes:
+                return indexes[('symbols', ast.index)]
+
+        symbols = SymbolTableVisitor().visit(ast).symbols
+
+        if isinstance(ast, CompactNode):
+            indexes[('symbols', ast.index)] = symbols
+        return symbols
 
-    def find_function_text(self, ast: dict, function_name: str,code) -> str:
+    def find_function_text(self, ast: dict, function_name: str, code: str = None) -> str:
         """
         Find function text from AST by function name
         Args:
             ast: The AST dictionary
             function_name: Name of the function to find
+            code: Source of the file, only needed for legacy dict ASTs
         Returns:
             Function text if found, None otherwise
         """
         if not ast:
             return None
-        
-        def search_node(node):
-            if not node:
-                return None
-            
-            node_type = node.get('type')
-            node_text = node.get('text', '')
-            
-            # Add handling for module.exports pattern
-            if node_type == 'pair' and function_name in node_text:
-                return node_text
-            
-            # Case 1: Regular function declarations
-            if node_type == 'function_declaration':
-                if any(child.get('text') == function_name for child in node.get('children', [])):
-                    return node_text
-            
-            # Case 2: Method definitions in classes/objects
-            elif node_type == 'method_definition':
-                for child in node.get('children', []):
-                    if child.get('type') == 'property_identifier' and child.get('text') == function_name:
-                        return node_text
-            
-            # Case 3: Arrow functions in property pairs
-            elif node_type == 'pair':
-                children = node.get('children', [])
-                if len(children) >= 2:
-                    property_id = children[0]
-                    if (property_id.get('type') == 'property_identifier' and 
-                        property_id.get('text') == function_name and
-                        any(c.get('type') == 'arrow_function' for c in children[1:])):
-                        return node_text
-            
-            # Case 4: Variable declarations with function expressions
-            elif node_type == 'variable_declarator':
-                children = node.get('children', [])
-                if len(children) >= 2:
-                    identifier = children[0]
-                    value = children[1]
-                    if (identifier.get('text') == function_name and 
-                        value.get('type') in ['function_expression', 'arrow_function']):
-                        return node_text
-            
-            # Case 5: Object property with function expression
-            elif node_type == 'property':
-                key = node.get('key', {})
-                value = node.get('value', {})
-                if (key.get('name') == function_name and 
-                    value.get('type') in ['FunctionExpression', 'ArrowFunctionExpression']):
-                    return node_text
-            
-            # Case 6: Assignment expressions
-            elif node_type == 'assignment_expression':
-                children = node.get('children', [])
-                if len(children) >= 2:
-                    left = children[0]
-                    right = children[1]
-                    if (left.get('text') == function_name and 
-                        right.get('type') in ['function_expression', 'arrow_function']):
-                        return node.get('text')
-            
-            # Recursively search children
-            if 'children' in node:
-                for child in node['children']:
-                    result = search_node(child)
-                    if result:
-                        return result
-            
+
+        symbol = self.symbol_table(ast).get(function_name)
+        if symbol is None:
             return None
-        
-        return search_node(ast)
+
+        _, start_byte, end_byte = symbol
+        if isinstance(ast, CompactNode):
+            return ast.tree.slice(start_byte, end_byte)
+        if code is not None:
+            return code.encode('utf-8')[start_byte:end_byte].decode('utf-8', errors='replace')
+        return None
 
 if __name__ == "__main__":
     # Test the AST helper with complete test code including all functions
@@ -0,0 +1,103 @@
+import os
+import json
+import tempfile
+from typing import Dict, Iterable, List, Tuple
+
+
+class CallIndex:
+    """Repository-wide inverted index from callee identifier to its call sites.
+
+    Call sites come from extraction (the ``call_sites`` of create_file_node) as
+    ``[callee, callee_text, function_name, start_byte, end_byte]``. Sites are kept per
+    file so a changed file is replaced without touching the others, and looked up by
+    both the bare callee name (``query``) and the full callee text (``db.query``).
+    """
+
+    def __init__(self, index_path: str = None):
+        """
+        Args:
+            index_path: JSON file the index is loaded from and saved to (optional)
+        """
+        self.index_path = index_path
+        self.files: Dict[str, List[list]] = {}
+        self.callees: Dict[str, Dict[str, List[list]]] = {}
+
+        if index_path and os.path.isfile(index_path):
+            self.load()
+
+    def update_file(self, file_path: str, call_sites: List[list]):
+        """Replace the call sites of a file"""
+        self.remove_file(file_path)
+        self.files[file_path] = call_sites
+        for site in call_sites:
+            callee, callee_text = site[0], site[1]
+            self.callees.setdefault(callee, {}).setdefault(file_path, []).append(site)
+            if callee_text != callee:
+                self.callees.setdefault(callee_text, {}).setdefault(file_path, []).append(site)
+
+    def remove_file(self, file_path: str):
+        """Drop every call site of a file"""
+        for site in self.files.pop(file_path, []):
+            for key in {site[0], site[1]}:
+                by_file = self.callees.get(key)
+                if by_file is not None:
+                    by_file.pop(file_path, None)
+                    if not by_file:
+                        del self.callees[key]
+
+    def prune(self, file_paths: Iterable[str], extensions: Tuple[str, ...]):
+        """Drop the files with one of the extensions that are not in file_paths, the files
+        of a full run: deleted files and files the walker now skips lose their call sites"""
+        keep = set(file_paths)
+        for file_path in [path for path in self.files if path.endswith(extensions) and path not in keep]:
+            self.remove_file(file_path)
+
+    def callers(self, function_name: str, file_path: str = None) -> List[Dict]:
+        """
+        Find the call sites of a function
+        Args:
+            function_name: Callee name (e.g. 'query') or callee text (e.g. 'db.query')
+            file_path: Restrict the search to one file
+        Returns:
+            List of {'file', 'function', 'callee', 'start_byte', 'end_byte'} dictionaries,
+            'function' being the enclosing function name (None at module level)
+        """
+        by_file = self.callees.get(function_name, {})
+        paths = [file_path] if file_path is not None else sorted(by_file)
+        return [
+            {
+                'file': path,
+                'function': site[2],
+                'callee': site[1],
+                'start_byte': site[3],
+                'end_byte': site[4]
+            }
+            for path in paths
+            for site in by_file.get(path, [])
+        ]
+
+    def calling_functions(self, function_name: str) -> List[tuple]:
+        """Distinct (file, function name) pairs calling a function"""
+        seen = {}
+        for caller in self.callers(function_name):
+            if caller['function'] is not None:
+                seen.setdefault((caller['file'], caller['function']), None)
+        return list(seen)
+
+    def load(self):
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.files = {}
+        self.callees = {}
+        for file_path, call_sites in data.get('files', {}).items():
+            self.update_file(file_path, call_sites)
+
+    def save(self):
+        """Write the index atomically to its index_path"""
+        if not self.index_path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.index_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'files': self.files}, f)
+        os.replace(tmp_path, self.index_path)
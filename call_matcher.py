@@ -0,0 +1,139 @@
+import re
+from typing import Dict, Iterable, List, Tuple
+
+# One token per identifier chain (a, a.b, a?.b.c), with a flag for a following '(';
+# strings and comments (JavaScript, and '# ' Python comments) are consumed so calls
+# inside them are never reported
+TOKEN_PATTERN = re.compile(r"""
+    (?P<skip>//[^\n]*|/\*.*?\*/|\#(?=\s|$)[^\n]*|"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*')
+  | (?P<chain>[A-Za-z_$][\w$]*(?:\s*\??\.\s*[A-Za-z_$][\w$]*)*)(?P<call>\s*\()?
+""", re.S | re.X)
+
+CHAIN_SEPARATOR = re.compile(r'\s*\??\.\s*')
+
+# Identifiers followed by '(' that are not calls
+NON_CALL_KEYWORDS = {
+    'if', 'for', 'while', 'switch', 'catch', 'function', 'return', 'typeof',
+    'await', 'async', 'yield', 'delete', 'void', 'in', 'of', 'instanceof', 'do', 'else',
+}
+
+# Keywords after which an identifier followed by '(' is a declaration
+DECLARATION_KEYWORDS = {'function', 'class', 'def'}
+
+# Name of the function whose body is analyzed (excluded from its own calls)
+FUNCTION_DEF_PATTERN = re.compile(r'^(?:function\s+|(?:async\s+)?def\s+)?(\w+)\s*\([^)]*\)\s*(?:{|->|:)')
+
+
+def call_tokens(code: str) -> Iterable[Tuple[List[str], int]]:
+    """
+    Tokenize a piece of JavaScript once and yield its call sites
+    Args:
+        code: Source text
+    Returns:
+        Iterator of (callee path segments, start offset), e.g. (['this', 'db', 'query'], 120)
+    """
+    previous = None
+    for match in TOKEN_PATTERN.finditer(code):
+        chain = match.group('chain')
+        if chain is None:
+            continue
+
+        if (match.group('call') and previous not in DECLARATION_KEYWORDS and chain not in NON_CALL_KEYWORDS
+                and not _follows_dot(code, match.start())):
+            yield CHAIN_SEPARATOR.split(chain), match.start()
+        previous = chain
+
+
+def _follows_dot(code: str, offset: int) -> bool:
+    """Whether a chain continues an expression like 'a().b' or 'a[0].b', whose object is unknown"""
+    offset -= 1
+    while offset >= 0 and code[offset].isspace():
+        offset -= 1
+    return offset >= 0 and code[offset] == '.'
+
+
+def extract_calls(code: str) -> List[str]:
+    """
+    Names called in a function body, in order of first occurrence
+    Args:
+        code: Function or method source
+    Returns:
+        'object.method' for member calls (last two segments of the chain) and the bare
+        name for direct calls, without the analyzed function's own name
+    """
+    function_match = FUNCTION_DEF_PATTERN.search(code.strip())
+    function_name = function_match.group(1) if function_match else None
+
+    calls = {}
+    for segments, _ in call_tokens(code):
+        call_name = '.'.join(segments[-2:])
+        if call_name != function_name:
+            calls.setdefault(call_name, None)
+    return list(calls)
+
+
+class ImportedCallMatcher:
+    """Matches call sites against the imported names of a file through hash lookups.
+
+    Imported functions, imported variables and the variables holding instances of
+    imported classes are indexed once by name, so every call site is resolved with
+    a single dictionary lookup whatever the number of imports.
+    """
+
+    def __init__(self, imported_variables: List, imported_functions: List, instantiations: Iterable = ()):
+        """
+        Args:
+            imported_variables: [variable_name, path] pairs of the file
+            imported_functions: [function_name, path] pairs of the file
+            instantiations: (variable_name, class_name) pairs of 'const x = new Foo()'
+        """
+        self.function_paths: Dict[str, List[str]] = {}
+        for name, path in imported_functions:
+            self.function_paths.setdefault(name, []).append(path)
+
+        self.variable_paths: Dict[str, List[str]] = {}
+        for name, path in imported_variables:
+            self.variable_paths.setdefault(name, []).append(path)
+
+        # Instances of imported classes: 'service' -> 'DefaultService'
+        self.instances = {
+            var_name: class_name
+            for var_name, class_name in instantiations
+            if class_name in self.variable_paths or class_name in self.function_paths
+        }
+
+    def match(self, direct_calls: Iterable[str], member_calls: Iterable[Tuple[str, str]]) -> List[Dict[str, str]]:
+        """
+        Resolve call sites to the files they come from
+        Args:
+            direct_calls: Callee names of 'foo()' calls
+            member_calls: (object_name, method_name) of 'obj.method()' calls
+        Returns:
+            List of {'function_call', 'path'} dictionaries, without duplicates
+        """
+        function_calls = []
+        seen_calls = set()
+
+        def add_function_call(func_call, path):
+            call_key = (func_call, path)
+            if call_key not in seen_calls:
+                function_calls.append({
+                    'function_call': func_call,
+                    'path': path
+                })
+                seen_calls.add(call_key)
+
+        # Direct function calls
+        for func_name in direct_calls:
+            for path in self.function_paths.get(func_name, ()):
+                add_function_call(func_name, path)
+
+        # Method calls on imported and instantiated variables
+        for var_name, method_name in member_calls:
+            target = self.instances.get(var_name, var_name)
+            if var_name not in self.instances and var_name not in self.variable_paths:
+                continue
+            for path in self.variable_paths.get(target, ()):
+                add_function_call(f"{var_name}.{method_name}", path)
+
+        return function_calls
@@ -0,0 +1,202 @@
+from array import array
+from collections.abc import Mapping
+
+
+class CompactAST:
+    """Array-backed syntax tree built from a tree-sitter node.
+
+    Nodes are stored in pre-order as parallel arrays (type id, byte range, line/column
+    range, parent and subtree end). The children of node ``i`` start at ``i + 1`` and
+    each following sibling starts at the ``subtree_end`` of the previous one, so no
+    per-node lists are kept. Node text is sliced lazily from the single shared source
+    buffer instead of being copied into every ancestor.
+    """
+
+    def __init__(self, source: bytes = b'', base: int = 0):
+        """
+        Args:
+            source: Source bytes covered by the root node
+            base: Byte offset of ``source`` inside the original file
+        """
+        self.source = source
+        self.base = base
+        self.type_names = []
+        self._type_ids = {}
+        self.types = array('H')
+        self.start_byte = array('I')
+        self.end_byte = array('I')
+        self.start_row = array('I')
+        self.start_col = array('I')
+        self.end_row = array('I')
+        self.end_col = array('I')
+        self.parent = array('i')
+        self.subtree_end = array('I')
+        # Indexes derived from the tree (see ast_helper.ASTHelper), freed with it
+        self.indexes = {}
+
+    @classmethod
+    def from_tree_sitter(cls, node) -> 'CompactAST':
+        """Build a compact tree from a tree-sitter node with an iterative cursor walk."""
+        tree = cls(node.text or b'', node.start_byte)
+        cursor = node.walk()
+        stack = [tree._add(cursor.node, -1)]
+
+        while stack:
+            if cursor.goto_first_child():
+                stack.append(tree._add(cursor.node, stack[-1]))
+                continue
+
+            # Close finished subtrees until a sibling is found
+            while stack:
+                tree.subtree_end[stack.pop()] = len(tree.types)
+                if not stack:
+                    break
+                if cursor.goto_next_sibling():
+                    stack.append(tree._add(cursor.node, stack[-1]))
+                    break
+                cursor.goto_parent()
+
+        return tree
+
+    @classmethod
+    def empty(cls) -> 'CompactAST':
+        """Tree with a single empty ``program`` node, used for empty files."""
+        tree = cls()
+        index = tree._append('program', 0, 0, (0, 0), (0, 0), -1)
+        tree.subtree_end[index] = 1
+        return tree
+
+    def _add(self, node, parent: int) -> int:
+        return self._append(node.type, node.start_byte, node.end_byte,
+                            node.start_point, node.end_point, parent)
+
+    def _append(self, node_type, start_byte, end_byte, start_point, end_point, parent) -> int:
+        type_id = self._type_ids.get(node_type)
+        if type_id is None:
+            type_id = len(self.type_names)
+            self._type_ids[node_type] = type_id
+            self.type_names.append(node_type)
+
+        index = len(self.types)
+        self.types.append(type_id)
+        self.start_byte.append(start_byte)
+        self.end_byte.append(end_byte)
+        self.start_row.append(start_point[0])
+        self.start_col.append(start_point[1])
+        self.end_row.append(end_point[0])
+        self.end_col.append(end_point[1])
+        self.parent.append(parent)
+        self.subtree_end.append(0)
+        return index
+
+    def __len__(self):
+        return len(self.types)
+
+    @property
+    def root(self) -> 'CompactNode':
+        return CompactNode(self, 0)
+
+    def node(self, index: int) -> 'CompactNode':
+        return CompactNode(self, index)
+
+    def type_of(self, index: int) -> str:
+        return self.type_names[self.types[index]]
+
+    def text_of(self, index: int) -> str:
+        return self.slice(self.start_byte[index], self.end_byte[index])
+
+    def slice(self, start_byte: int, end_byte: int) -> str:
+        """Source text between two file byte offsets."""
+        return self.source[start_byte - self.base:end_byte - self.base].decode('utf-8', errors='replace')
+
+    def child_indices(self, index: int):
+        """Yield the indices of the direct children of a node."""
+        end = self.subtree_end[index]
+        child = index + 1
+        while child < end:
+            yield child
+            child = self.subtree_end[child]
+
+
+class CompactNode(Mapping):
+    """Read-only dict view over one node of a CompactAST.
+
+    Exposes the keys of the former dict AST (``type``, ``start_byte``, ``end_byte``,
+    ``start_point``, ``end_point``, ``text`` and, for inner nodes, ``children``) so
+    code written against ``node.get(...)`` keeps working unchanged.
+    """
+
+    __slots__ = ('tree', 'index')
+
+    _KEYS = ('type', 'start_byte', 'end_byte', 'start_point', 'end_point', 'text', 'children')
+
+    def __init__(self, tree: CompactAST, index: int):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def type(self) -> str:
+        return self.tree.type_of(self.index)
+
+    @property
+    def text(self) -> str:
+        return self.tree.text_of(self.index)
+
+    @property
+    def children(self) -> list:
+        tree = self.tree
+        return [CompactNode(tree, child) for child in tree.child_indices(self.index)]
+
+    @property
+    def parent(self):
+        parent = self.tree.parent[self.index]
+        return CompactNode(self.tree, parent) if parent >= 0 else None
+
+    def _has_children(self) -> bool:
+        return self.tree.subtree_end[self.index] > self.index + 1
+
+    def __getitem__(self, key):
+        tree, index = self.tree, self.index
+        if key == 'type':
+            return tree.type_of(index)
+        if key == 'text':
+            return tree.text_of(index)
+        if key == 'children':
+            if not self._has_children():
+                raise KeyError(key)
+            return self.children
+        if key == 'start_byte':
+            return tree.start_byte[index]
+        if key == 'end_byte':
+            return tree.end_byte[index]
+        if key == 'start_point':
+            return (tree.start_row[index], tree.start_col[index])
+        if key == 'end_point':
+            return (tree.end_row[index], tree.end_col[index])
+        raise KeyError(key)
+
+    def __iter__(self):
+        for key in self._KEYS:
+            if key != 'children' or self._has_children():
+                yield key
+
+    def __len__(self):
+        return len(self._KEYS) if self._has_children() else len(self._KEYS) - 1
+
+    def __eq__(self, other):
+        if isinstance(other, CompactNode):
+            return self.tree is other.tree and self.index == other.index
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self.tree), self.index))
+
+    def __repr__(self):
+        return f"CompactNode({self.type!r}, {self['start_point']} - {self['end_point']})"
+
+    def to_dict(self) -> dict:
+        """Expand this subtree into the legacy nested dict format (for debugging dumps)."""
+        result = {key: self[key] for key in self._KEYS[:-1]}
+        if self._has_children():
+            result['children'] = [child.to_dict() for child in self.children]
+        return result
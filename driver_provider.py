@@ -0,0 +1,156 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Only the parent process talks to Neo4j, from a single thread: extraction pool workers
+# are created with connect=False and hand their results back for the parent to write.
+# A stage holds at most two sessions at once (FunctionNodeCreator streams File nodes from
+# one while flushing definitions through another), so the pool does not grow with the
+# worker count; the spares cover connections the server has not released yet.
+CONCURRENT_SESSIONS = 2
+SPARE_CONNECTIONS = 2
+
+
+class DriverProvider:
+    """Single Neo4j driver shared by every pipeline stage.
+
+    The stages used to build a driver each, so every stage paid for new connections
+    and the pool was never sized. The provider creates one driver with explicit pool
+    settings on first use and keeps it (and its warm connections) until close().
+
+    Pool utilisation and acquisition waits are measured by timing the pool's
+    ``acquire``. The pool is a private object of the driver; if a driver version
+    does not expose it, only the configuration is reported.
+    """
+
+    def __init__(self, uri: str = None, user: str = None, password: str = None,
+                 max_connection_pool_size: int = None, max_connection_lifetime: float = 3600,
+                 connection_acquisition_timeout: float = 60.0, fetch_size: int = 1000):
+        """
+        Args:
+            uri, user, password: Connection settings (default: NEO4J_URI, NEO4J_USER and
+                NEO4J_PASSWORD from the environment or .env)
+            max_connection_pool_size: Connections per server (default: sized for the single
+                writing process, see CONCURRENT_SESSIONS)
+            max_connection_lifetime: Seconds after which a pooled connection is replaced
+            connection_acquisition_timeout: Seconds a session waits for a free connection
+            fetch_size: Records pulled per round trip when reading results
+        """
+        if uri is None or user is None or password is None:
+            from dotenv import load_dotenv
+            load_dotenv()
+        self.uri = uri or os.getenv('NEO4J_URI')
+        self.auth = (user or os.getenv('NEO4J_USER'), password or os.getenv('NEO4J_PASSWORD'))
+        self.config = {
+            'max_connection_pool_size': max_connection_pool_size or CONCURRENT_SESSIONS + SPARE_CONNECTIONS,
+            'max_connection_lifetime': max_connection_lifetime,
+            'connection_acquisition_timeout': connection_acquisition_timeout,
+            'fetch_size': fetch_size,
+        }
+
+        self._driver = None
+        self._lock = threading.Lock()
+        self.acquisitions = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.peak_in_use = 0
+
+    @property
+    def driver(self):
+        """The shared driver, created on first use"""
+        if self._driver is None:
+            from neo4j import GraphDatabase
+
+            self._driver = GraphDatabase.driver(self.uri, auth=self.auth, **self.config)
+            self._instrument(self._driver)
+        return self._driver
+
+    def _instrument(self, driver):
+        """Time every connection acquisition of the driver's pool."""
+        pool = getattr(driver, '_pool', None)
+        acquire = getattr(pool, 'acquire', None)
+        if acquire is None:
+            return
+
+        def timed_acquire(*args, **kwargs):
+            start = time.perf_counter()
+            connection = acquire(*args, **kwargs)
+            wait = time.perf_counter() - start
+            in_use = self._in_use(pool)
+            with self._lock:
+                self.acquisitions += 1
+                self.wait_seconds += wait
+                self.max_wait_seconds = max(self.max_wait_seconds, wait)
+                self.peak_in_use = max(self.peak_in_use, in_use)
+            return connection
+
+        pool.acquire = timed_acquire
+
+    @staticmethod
+    def _in_use(pool) -> int:
+        try:
+            return sum(pool.in_use_connection_count(address) for address in list(pool.connections))
+        except Exception:
+            return 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the pool configuration and usage counters."""
+        pool_size = self.config['max_connection_pool_size']
+        return {
+            **self.config,
+            'acquisitions': self.acquisitions,
+            'peak_in_use': self.peak_in_use,
+            'peak_utilisation': self.peak_in_use / pool_size if pool_size else 0.0,
+            'mean_wait_ms': self.wait_seconds / self.acquisitions * 1000 if self.acquisitions else 0.0,
+            'max_wait_ms': self.max_wait_seconds * 1000
+        }
+
+    def report(self):
+        """Print the pool utilisation and acquisition wait times."""
+        stats = self.stats()
+        print(f"Neo4j pool: {stats['acquisitions']} acquisitions, peak {stats['peak_in_use']}/"
+              f"{stats['max_connection_pool_size']} connections in use ({stats['peak_utilisation']:.0%}), "
+              f"wait {stats['mean_wait_ms']:.2f} ms mean / {stats['max_wait_ms']:.2f} ms max")
+
+    def close(self):
+        """Close the shared driver and its connections."""
+        if self._driver is not None:
+            self._driver.close()
+            self._driver = None
+
+
+_provider: Optional[DriverProvider] = None
+
+
+def configure(**options) -> DriverProvider:
+    """
+    Replace the shared provider (see DriverProvider for the options)
+    Returns:
+        The new provider; a previous one is closed
+    """
+    global _provider
+    close_driver()
+    _provider = DriverProvider(**options)
+    return _provider
+
+
+def get_provider() -> DriverProvider:
+    """The shared provider, configured from the environment if configure() was not called"""
+    global _provider
+    if _provider is None:
+        _provider = DriverProvider()
+    return _provider
+
+
+def get_driver():
+    """The driver shared by every stage"""
+    return get_provider().driver
+
+
+def close_driver(report: bool = False):
+    """Close the shared driver, printing the pool report first if asked"""
+    if _provider is not None:
+        if report and _provider._driver is not None:
+            _provider.report()
+        _provider.close()
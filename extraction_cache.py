@@ -0,0 +1,130 @@
+import os
+import json
+import hashlib
+import tempfile
+from typing import Dict, Any, Optional
+from extraction_visitor import EXTRACTOR_VERSION
+
+
+class ExtractionCache:
+    """Persistent on-disk cache of create_file_node results.
+
+    Entries are keyed by a hash of the file content, its path, the language, the
+    stripped path prefix and EXTRACTOR_VERSION, so any change to the file or to the
+    extraction logic produces a miss. The cached payload is the node data without its
+    ``code`` property (the caller already holds the content). The cache is bounded by
+    ``max_bytes``; the least recently used entries are evicted first.
+    """
+
+    def __init__(self, cache_dir: str = '.extraction_cache', max_bytes: int = 512 * 1024 * 1024, scan: bool = True):
+        """
+        Args:
+            cache_dir: Directory holding the cache entries
+            max_bytes: Maximum total size of the entries on disk
+            scan: Measure the entries on disk (evicting above max_bytes); readers in pool
+                workers, which never write, skip it
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.total_bytes = sum(size for _, size, _ in self._entries()) if scan else 0
+        if self.total_bytes > self.max_bytes:
+            self._evict()
+
+    def key(self, file_path: str, content: str, language: str, remove: str = '', backend: str = 'visitor') -> str:
+        """Build the cache key of a file."""
+        digest = hashlib.sha256()
+        for part in (str(EXTRACTOR_VERSION), language, backend, remove, file_path):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        digest.update(content.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + '.json')
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached node data for a key, or None on a miss.
+
+        The lookup is not counted: the caller may still reject the entry, and counts
+        the outcome with count_lookup.
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Refresh the access time used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def count_lookup(self, hit: bool):
+        """Count a lookup once its entry was validated, rejected entries being misses."""
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def put(self, key: str, node_data: Dict[str, Any]):
+        """Store node data (without its code) under a key."""
+        payload = {k: v for k, v in node_data.items() if k != 'code'}
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write atomically so concurrent runs never read a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        size = os.path.getsize(tmp_path)
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(tmp_path, path)
+
+        self.total_bytes += size - previous
+        self.writes += 1
+        if self.total_bytes > self.max_bytes:
+            self._evict()
+
+    def _entries(self):
+        """Yield (path, size, mtime) for every cache entry."""
+        for shard in os.scandir(self.cache_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith('.json'):
+                    stat = entry.stat()
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def _evict(self):
+        """Remove least recently used entries until the cache is back under 90% of its bound."""
+        target = int(self.max_bytes * 0.9)
+        for path, size, _ in sorted(self._entries(), key=lambda entry: entry[2]):
+            if self.total_bytes <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current cache size."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'writes': self.writes,
+            'evictions': self.evictions,
+            'total_bytes': self.total_bytes
+        }
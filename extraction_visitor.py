@@ -0,0 +1,771 @@
+import re
+from collections.abc import Mapping
+from typing import Callable, Dict, List, Any
+from compact_ast import CompactNode
+from call_matcher import ImportedCallMatcher
+
+# Bump whenever extraction output changes so cached results are invalidated
+EXTRACTOR_VERSION = 5
+
+# Node types that define a function-like scope
+FUNCTION_SCOPE_TYPES = (
+    'function_declaration',          # function foo() {}
+    'generator_function_declaration',
+    'method_definition',             # class { foo() {} }
+    'arrow_function',                # const foo = () => {}
+    'function_expression',           # const foo = function() {}
+    'function',
+)
+
+# Anonymous function node types named by the node they are assigned to
+ANONYMOUS_FUNCTION_TYPES = ('arrow_function', 'function_expression', 'function')
+
+# Nodes that give a name to an anonymous function assigned to them
+NAMING_PARENT_TYPES = {
+    'variable_declarator',           # const foo = function() {}
+    'pair',                          # { foo: function() {} }
+    'assignment_expression',         # foo = function() {}
+}
+
+
+def function_name(node):
+    """Name of a function node, or of the declaration an anonymous function is assigned to"""
+    for child in node.get('children', []):
+        if child.get('type') in ('identifier', 'property_identifier', 'member_expression', 'string'):
+            return child.get('text').strip('\'"')
+    return None
+
+
+def named_scope(node):
+    """The node naming a function scope, or None for anonymous callbacks"""
+    if node.get('type') not in ANONYMOUS_FUNCTION_TYPES:
+        return node
+    parent = getattr(node, 'parent', None)
+    if parent is not None and parent.get('type') in NAMING_PARENT_TYPES:
+        return parent
+    return None
+
+
+def walk_ast(ast):
+    """Yield every node of an AST in pre-order without recursion."""
+    if isinstance(ast, CompactNode):
+        # Pre-order indices of a subtree are contiguous
+        tree = ast.tree
+        for index in range(ast.index, tree.subtree_end[ast.index]):
+            yield CompactNode(tree, index)
+        return
+
+    stack = [ast]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, Mapping):
+            continue
+        yield node
+        stack.extend(reversed(node.get('children', [])))
+
+
+class ASTVisitor:
+    """Single-pass AST traversal engine driven by a node-type -> handler dispatch table.
+
+    Subclasses register handlers in ``self.handlers`` (several handlers may share a node
+    type). ``visit`` walks the tree once in pre-order and calls every handler registered
+    for each node's type. Compact trees are walked as a flat index range, without
+    recursion or per-node child lists.
+    """
+
+    def __init__(self):
+        self.handlers: Dict[str, List[Callable]] = {}
+
+    def register(self, node_type: str, handler: Callable):
+        self.handlers.setdefault(node_type, []).append(handler)
+
+    def visit(self, ast):
+        if not ast or not isinstance(ast, Mapping):
+            return self
+
+        for node in self._walk(ast):
+            node_type = node.get('type')
+            for handler in self.handlers.get(node_type, ()):
+                try:
+                    handler(node)
+                except Exception as e:
+                    print(f"Error processing {node_type} node: {e}")
+        return self
+
+    def _walk(self, ast):
+        return walk_ast(ast)
+
+
+class SymbolTableVisitor(ASTVisitor):
+    """Collects the per-file symbol table: definition name -> (kind, start_byte, end_byte).
+
+    Covers function declarations, methods, object pairs holding a function, variable
+    declarators and assignments of function expressions. The first definition of a
+    name wins, matching a pre-order search.
+    """
+
+    FUNCTION_VALUE_TYPES = ('function_expression', 'arrow_function', 'function')
+
+    def __init__(self):
+        super().__init__()
+        self.symbols: Dict[str, tuple] = {}
+
+        self.register('function_declaration', self._define_declaration)
+        self.register('generator_function_declaration', self._define_declaration)
+        self.register('method_definition', self._define_method)
+        self.register('pair', self._define_pair)
+        self.register('variable_declarator', self._define_variable)
+        self.register('assignment_expression', self._define_assignment)
+
+    def _define(self, name, kind: str, node):
+        if name and name not in self.symbols:
+            self.symbols[name] = (kind, node.get('start_byte'), node.get('end_byte'))
+
+    def _define_declaration(self, node):
+        for child in node.get('children', []):
+            if child.get('type') == 'identifier':
+                self._define(child.get('text'), 'function', node)
+                return
+
+    def _define_method(self, node):
+        for child in node.get('children', []):
+            if child.get('type') == 'property_identifier':
+                self._define(child.get('text'), 'method', node)
+                return
+
+    def _define_pair(self, node):
+        children = node.get('children', [])
+        if len(children) >= 2 and children[0].get('type') in ('property_identifier', 'string') \
+                and any(c.get('type') in self.FUNCTION_VALUE_TYPES for c in children[1:]):
+            self._define(children[0].get('text').strip('\'"'), 'pair', node)
+
+    def _define_variable(self, node):
+        children = node.get('children', [])
+        if len(children) >= 2 and children[0].get('type') == 'identifier' \
+                and children[-1].get('type') in self.FUNCTION_VALUE_TYPES:
+            self._define(children[0].get('text'), 'variable', node)
+
+    def _define_assignment(self, node):
+        children = node.get('children', [])
+        if len(children) >= 2 and children[-1].get('type') in self.FUNCTION_VALUE_TYPES:
+            self._define(children[0].get('text'), 'assignment', node)
+
+
+class CallSiteVisitor(ASTVisitor):
+    """Collects call sites together with their enclosing named function scope.
+
+    Scopes are tracked on a stack while walking in pre-order, so the enclosing function
+    of each call is known without walking back up the tree. Anonymous callbacks are
+    attributed to the named function around them.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.sites = []     # (callee, callee_text, scope node or None, call node)
+        self._scopes = []   # (end_byte, scope node)
+
+        for node_type in FUNCTION_SCOPE_TYPES:
+            self.register(node_type, self._enter_scope)
+        self.register('call_expression', self._record_call_site)
+
+    def _enter_scope(self, node):
+        scope = named_scope(node)
+        if scope is not None:
+            self._current_scope(node.get('start_byte'))
+            self._scopes.append((scope.get('end_byte'), scope))
+
+    def _current_scope(self, position: int):
+        while self._scopes and self._scopes[-1][0] <= position:
+            self._scopes.pop()
+        return self._scopes[-1][1] if self._scopes else None
+
+    def _record_call_site(self, node):
+        children = node.get('children', [])
+        if not children:
+            return
+
+        callee_node = children[0]
+        if callee_node.get('type') == 'identifier':
+            callee = callee_node.get('text')
+        elif callee_node.get('type') == 'member_expression':
+            prop = callee_node.get('children', [])[-1]
+            if prop.get('type') != 'property_identifier':
+                return
+            callee = prop.get('text')
+        else:
+            return
+
+        # Keep dotted paths like 'this.db.query'; chained calls fall back to the bare name
+        callee_text = re.sub(r'\s+', '', callee_node.get('text'))
+        if not re.fullmatch(r'[\w$.]+', callee_text):
+            callee_text = callee
+
+        scope = self._current_scope(node.get('start_byte'))
+        self.sites.append((callee, callee_text, scope, node))
+
+    def call_sites_info(self) -> List[list]:
+        """Serializable call sites: [callee, callee_text, function_name, start_byte, end_byte]"""
+        return [
+            [callee, callee_text, function_name(scope) if scope is not None else None,
+             node.get('start_byte'), node.get('end_byte')]
+            for callee, callee_text, scope, node in self.sites
+        ]
+
+
+class JavaScriptExtractionVisitor(CallSiteVisitor, SymbolTableVisitor):
+    """Collects imports, definitions, exports, call sites and symbols of a JavaScript file in one pass.
+
+    Results that depend on the whole file (export classification against the defined
+    names, call sites against the imported names) are resolved after the walk from the
+    collected lists, without touching the tree again.
+    """
+
+    def __init__(self, resolve_path: Callable[[str], str]):
+        """
+        Args:
+            resolve_path: Resolves a relative import specifier of the visited file
+        """
+        super().__init__()
+        self.resolve_path = resolve_path
+
+        # Imports
+        self.raw_imports = []
+        self.imported_paths = []
+        self.undefined_imports = []
+        self.imported_variables = []  # [variable_name, path]
+        self.imported_functions = []  # [function_name, path]
+
+        # Definitions
+        self.names_of_functions_defined = []
+        self.names_of_classes_defined = []
+        self.function_definitions = []
+        self.class_definitions = []
+
+        # Exports, classified once the defined names are known
+        self.export_statements = []
+        self.commonjs_exports = []
+
+        # Call sites
+        self.direct_calls = []        # callee names
+        self.member_calls = []        # (object_name, method_name)
+        self.instantiations = []      # (variable_name, class_name)
+
+        self.register('import_statement', self._handle_import_statement)
+        self.register('await_expression', self._handle_dynamic_import)
+        self.register('expression_statement', self._handle_dynamic_import)
+        self.register('lexical_declaration', self._handle_require)
+
+        self.register('pair', self._handle_pair)
+        self.register('method_definition', self._handle_method_definition)
+        self.register('function_declaration', self._handle_function_declaration)
+        self.register('generator_function_declaration', self._handle_function_declaration)
+        self.register('lexical_declaration', self._handle_lexical_function)
+        self.register('class_declaration', self._handle_class_declaration)
+
+        self.register('export_statement', self.export_statements.append)
+        self.register('expression_statement', self._handle_commonjs_export)
+
+        self.register('call_expression', self._handle_call)
+        self.register('new_expression', self._handle_call)
+        self.register('lexical_declaration', self._handle_instantiation)
+
+    # Imports -----------------------------------------------------------------
+
+    def _add_import_path(self, path: str) -> str:
+        if path.startswith('.'):
+            resolved = self.resolve_path(path)
+            self.imported_paths.append(resolved)
+            return resolved
+        self.undefined_imports.append(path)
+        return path
+
+    def _handle_import_statement(self, node):
+        self.raw_imports.append(node.get('text', ''))
+
+        # Get the source path
+        current_path = None
+        for child in node.get('children', []):
+            if child.get('type') == 'string':
+                path = child.get('text', '').strip("'").strip('"')
+                current_path = self._add_import_path(path)
+
+        # Process import clause
+        for child in node.get('children', []):
+            if child.get('type') == 'import_clause':
+                for clause_child in child.get('children', []):
+                    # Default import
+                    if clause_child.get('type') == 'identifier':
+                        self.imported_variables.append([clause_child.get('text'), current_path])
+                    elif clause_child.get('type') == 'named_imports':
+                        for spec in clause_child.get('children', []):
+                            if spec.get('type') == 'import_specifier':
+                                spec_text = spec.get('text', '')
+                                if ' as ' in spec_text:
+                                    self.imported_functions.append([spec_text.split(' as ')[1].strip(), current_path])
+                                else:
+                                    self.imported_functions.append([spec_text, current_path])
+                    elif clause_child.get('type') == 'namespace_import':
+                        namespace_text = clause_child.get('text')
+                        if ' as ' in namespace_text:
+                            self.imported_variables.append([namespace_text.split(' as ')[1].strip(), current_path])
+
+    def _handle_dynamic_import(self, node):
+        text = node.get('text', '')
+        if 'import(' in text:
+            self.raw_imports.append(text)
+            path_match = re.search(r"import\(['\"]([^'\"]+)['\"]\)", text)
+            if path_match:
+                self._add_import_path(path_match.group(1))
+
+    def _handle_require(self, node):
+        text = node.get('text', '')
+        if not re.match(r'.*const\s+(?:\w+|\{[^}]+\})\s*=\s*require\([\'"].*[\'"]\).*', text):
+            return
+
+        self.raw_imports.append(text)
+
+        current_path = None
+        path_match = re.search(r"require\(['\"]([^'\"]+)['\"]\)", text)
+        if path_match:
+            current_path = self._add_import_path(path_match.group(1))
+
+        if '{' in text:
+            # Destructured require
+            for child in node.get('children', []):
+                if child.get('type') == 'variable_declarator':
+                    for var_child in child.get('children', []):
+                        if var_child.get('type') == 'object_pattern':
+                            for prop in var_child.get('children', []):
+                                if prop.get('type') == 'shorthand_property_identifier_pattern':
+                                    self.imported_functions.append([prop.get('text'), current_path])
+        else:
+            var_match = re.search(r"const\s+(\w+)\s*=\s*require", text)
+            if var_match:
+                self.imported_variables.append([var_match.group(1), current_path])
+
+    # Definitions -------------------------------------------------------------
+
+    @staticmethod
+    def _node_lines(node):
+        start = node.get('start_point', [0, 0])[0] + 1
+        end = node.get('end_point', [0, 0])[0] + 1
+        return start, end
+
+    def _add_function(self, name: str, node, text: str, unique: bool = True):
+        if not name or (unique and name in self.names_of_functions_defined):
+            return
+        self.names_of_functions_defined.append(name)
+        start, end = self._node_lines(node)
+        self.function_definitions.append({
+            'function_name': name,
+            'function_code': text,
+            'start_line': start,
+            'end_line': end
+        })
+
+    def _handle_pair(self, node):
+        # Object methods like: functionName: function(...) or functionName: (...) =>
+        text = node.get('text', '')
+        method_match = re.match(r'^\s*(\w+)\s*:\s*(?:(?:async\s+)?function\s*\(.*\)|(?:\([^)]*\)|[^=]+)\s*=>)', text)
+        if method_match:
+            self._add_function(method_match.group(1), node, text)
+
+    def _handle_method_definition(self, node):
+        for child in node.get('children', []):
+            if child.get('type') == 'property_identifier':
+                self._add_function(child.get('text'), node, node.get('text', ''), unique=False)
+
+    def _handle_function_declaration(self, node):
+        for child in node.get('children', []):
+            if child.get('type') == 'identifier':
+                self._add_function(child.get('text'), node, node.get('text', ''))
+
+    def _handle_lexical_function(self, node):
+        text = node.get('text', '')
+        # Function and arrow function declarations, but not callbacks
+        func_match = re.search(r'(?:const|let|var)\s+(\w+)\s*=\s*(?:(?:async\s+)?function\s*\(|\([^)]*\)\s*=>|[^=]*=>\s*\{)', text)
+        if func_match:
+            self._add_function(func_match.group(1), node, text)
+
+        for child in node.get('children', []):
+            if child.get('type') == 'variable_declarator':
+                func_name = None
+                for var_child in child.get('children', []):
+                    if var_child.get('type') == 'identifier':
+                        func_name = var_child.get('text')
+                    elif var_child.get('type') in ['arrow_function', 'function']:
+                        self._add_function(func_name, node, text)
+
+    def _handle_class_declaration(self, node):
+        start, end = self._node_lines(node)
+        class_info = {
+            'class_name': '',
+            'class_code': node.get('text', ''),
+            'class_start_point': start,
+            'class_end_point': end,
+            'methods': []
+        }
+
+        for child in node.get('children', []):
+            if child.get('type') == 'identifier':
+                class_info['class_name'] = child.get('text')
+                if class_info['class_name'] not in self.names_of_classes_defined:
+                    self.names_of_classes_defined.append(class_info['class_name'])
+
+        for child in node.get('children', []):
+            if child.get('type') == 'class_body':
+                for method in child.get('children', []):
+                    if method.get('type') == 'method_definition':
+                        method_name = ''
+                        for method_child in method.get('children', []):
+                            if method_child.get('type') == 'property_identifier':
+                                method_name = method_child.get('text')
+
+                        if method_name:
+                            method_start, method_end = self._node_lines(method)
+                            class_info['methods'].append({
+                                'method_name': method_name,
+                                'method_code': method.get('text', ''),
+                                'method_start_point': method_start,
+                                'method_end_point': method_end
+                            })
+
+        self.class_definitions.append(class_info)
+
+    # Exports -----------------------------------------------------------------
+
+    def _handle_commonjs_export(self, node):
+        text = node.get('text', '')
+        if 'module.exports' in text:
+            self.commonjs_exports.append(text)
+
+    # Call sites --------------------------------------------------------------
+
+    def _handle_call(self, node):
+        children = node.get('children', [])
+        if node.get('type') == 'new_expression':
+            # new Foo(...) -> children: 'new', constructor, arguments
+            children = children[1:]
+        if not children:
+            return
+
+        callee = children[0]
+        callee_type = callee.get('type')
+        if callee_type == 'identifier':
+            self.direct_calls.append(callee.get('text'))
+        elif callee_type == 'member_expression':
+            parts = callee.get('children', [])
+            if (len(parts) == 3 and parts[0].get('type') == 'identifier'
+                    and parts[2].get('type') == 'property_identifier'):
+                self.member_calls.append((parts[0].get('text'), parts[2].get('text')))
+
+    def _handle_instantiation(self, node):
+        # const service = new DefaultService(...)
+        children = node.get('children', [])
+        if not children or children[0].get('type') != 'const':
+            return
+        for child in children:
+            if child.get('type') != 'variable_declarator':
+                continue
+            parts = child.get('children', [])
+            if len(parts) >= 3 and parts[0].get('type') == 'identifier' and parts[-1].get('type') == 'new_expression':
+                constructor = parts[-1].get('children', [None, None])[1]
+                if constructor is not None and constructor.get('type') == 'identifier':
+                    self.instantiations.append((parts[0].get('text'), constructor.get('text')))
+
+    # Results -----------------------------------------------------------------
+
+    def imports_info(self) -> Dict[str, list]:
+        return {
+            'raw_imports': sorted(set(self.raw_imports)),
+            'imported_paths': sorted(set(self.imported_paths)),
+            'undefined_imports': sorted(set(self.undefined_imports)),
+            'imported_variables': sorted(self.imported_variables, key=lambda x: x[0]),
+            'imported_functions': sorted(self.imported_functions, key=lambda x: x[0])
+        }
+
+    def definitions_info(self) -> Dict[str, Any]:
+        return {
+            'names_of_functions_defined': sorted(self.names_of_functions_defined),
+            'names_of_classes_defined': sorted(self.names_of_classes_defined),
+            'methods_of_classes': [],
+            'function_definitions': sorted(self.function_definitions, key=lambda x: x['function_name']),
+            'class_definitions': sorted(self.class_definitions, key=lambda x: x['class_name'])
+        }
+
+    def exports_info(self, defined_functions: List[str], defined_classes: List[str]) -> Dict[str, list]:
+        exports = {
+            'exported_functions': [],
+            'exported_variables': [],
+            'exported_class': []
+        }
+
+        def classify(name):
+            if name in defined_functions:
+                exports['exported_functions'].append(name)
+            elif name in defined_classes:
+                exports['exported_class'].append(name)
+            else:
+                exports['exported_variables'].append(name)
+
+        # ES6 exports
+        for node in self.export_statements:
+            text = node.get('text', '')
+
+            # Direct exports: export class/function/const
+            export_match = re.search(r'export\s+(class|function|const)\s+(\w+)', text)
+            if export_match:
+                export_type, name = export_match.groups()
+                if export_type == 'class':
+                    exports['exported_class'].append(name)
+                elif export_type == 'function':
+                    exports['exported_functions'].append(name)
+                elif name in defined_functions:
+                    exports['exported_functions'].append(name)
+                else:
+                    exports['exported_variables'].append(name)
+
+            # Named exports: export { name1, name2 }
+            export_list = re.findall(r'export\s*{\s*([\w\s,]+)\s*}', text)
+            if export_list:
+                for name in re.findall(r'\w+', export_list[0]):
+                    classify(name)
+
+        # CommonJS exports
+        for text in self.commonjs_exports:
+            # Direct module.exports = variable_name
+            direct_export = re.search(r'module\.exports\s*=\s*(\w+)(?:\s*;)?', text)
+            if direct_export:
+                classify(direct_export.group(1))
+
+            # Defined functions appearing as object keys, last items or method shorthands
+            for func in defined_functions:
+                if any(pattern.format(func) in text for pattern in ['{}:', '{},', '{}()']):
+                    exports['exported_functions'].append(func)
+
+            # Named exports: module.exports.name = ...
+            named_match = re.search(r'module\.exports\.(\w+)\s*=\s*(class|function)?', text)
+            if named_match:
+                name, export_type = named_match.groups()
+                if export_type == 'class' or name in defined_classes:
+                    exports['exported_class'].append(name)
+                elif export_type == 'function' or name in defined_functions:
+                    exports['exported_functions'].append(name)
+                else:
+                    exports['exported_variables'].append(name)
+
+        for key in exports:
+            exports[key] = sorted(set(exports[key]))
+        return exports
+
+    def function_calls(self, imported_variables: List, imported_functions: List) -> List[Dict[str, str]]:
+        matcher = ImportedCallMatcher(imported_variables, imported_functions, self.instantiations)
+        return matcher.match(self.direct_calls, self.member_calls)
+
+
+# TypeScript declarations -> (definition kind, node type of their name)
+TYPE_DECLARATION_TYPES = {
+    'interface_declaration': ('interface', 'type_identifier'),
+    'type_alias_declaration': ('type', 'type_identifier'),
+    'enum_declaration': ('enum', 'identifier'),
+}
+
+
+class TypeScriptExtractionVisitor(JavaScriptExtractionVisitor):
+    """Collects the metadata of a TypeScript file in one pass.
+
+    Extends the JavaScript visitor with type-only imports (skipped), overload
+    signatures (merged into their implementation), abstract classes, decorators,
+    accessors and abstract methods, and with the interfaces, type aliases and enums
+    defined and exported by the file. Methods are listed with their class and, as
+    for JavaScript, as functions.
+    """
+
+    def __init__(self, resolve_path: Callable[[str], str]):
+        """
+        Args:
+            resolve_path: Resolves a relative import specifier of the visited file
+        """
+        super().__init__(resolve_path)
+        self.methods_of_classes = []
+        self.type_definitions = []    # {'type_name', 'type_kind', 'type_code', 'start_line', 'end_line'}
+        self._overloads = {}          # function name -> pending overload signatures
+
+        self.register('function_signature', self._handle_function_signature)
+        self.register('abstract_class_declaration', self._handle_class_declaration)
+        for node_type in TYPE_DECLARATION_TYPES:
+            self.register(node_type, self._handle_type_declaration)
+
+    # Imports -----------------------------------------------------------------
+
+    def _handle_import_statement(self, node):
+        self.raw_imports.append(node.get('text', ''))
+        children = node.get('children', [])
+
+        current_path = None
+        for child in children:
+            if child.get('type') == 'string':
+                current_path = self._add_import_path(child.get('text', '').strip("'").strip('"'))
+
+        # import type { A } from './a' only imports types
+        type_only = any(child.get('type') == 'type' for child in children)
+
+        for child in children:
+            if child.get('type') != 'import_clause':
+                continue
+            for clause_child in child.get('children', []):
+                if clause_child.get('type') == 'identifier':
+                    self.imported_variables.append([clause_child.get('text'), current_path])
+                elif clause_child.get('type') == 'named_imports' and not type_only:
+                    for spec in clause_child.get('children', []):
+                        if spec.get('type') != 'import_specifier':
+                            continue
+                        names = [c for c in spec.get('children', []) if c.get('type') == 'identifier']
+                        # import { type A } from './a'
+                        if names and not any(c.get('type') == 'type' for c in spec.get('children', [])):
+                            self.imported_functions.append([names[-1].get('text'), current_path])
+                elif clause_child.get('type') == 'namespace_import':
+                    for name in clause_child.get('children', []):
+                        if name.get('type') == 'identifier':
+                            self.imported_variables.append([name.get('text'), current_path])
+
+    # Definitions -------------------------------------------------------------
+
+    def _handle_function_signature(self, node):
+        # function fmt(a: string): string;  (overload without a body)
+        for child in node.get('children', []):
+            if child.get('type') == 'identifier':
+                overload = self._overloads.setdefault(child.get('text'), {'codes': [], 'start_line': None})
+                overload['codes'].append(node.get('text', ''))
+                if overload['start_line'] is None:
+                    overload['start_line'] = self._node_lines(node)[0]
+                return
+
+    def _handle_function_declaration(self, node):
+        for child in node.get('children', []):
+            if child.get('type') != 'identifier':
+                continue
+            name = child.get('text')
+            overload = self._overloads.pop(name, None)
+            if overload is None:
+                self._add_function(name, node, node.get('text', ''))
+                return
+
+            count = len(self.function_definitions)
+            self._add_function(name, node, '\n'.join(overload['codes'] + [node.get('text', '')]))
+            if len(self.function_definitions) > count:
+                self.function_definitions[-1]['start_line'] = overload['start_line']
+            return
+
+    @staticmethod
+    def _export_decorators(node) -> List:
+        """Decorators of an exported class: @Injectable() export class ... keeps them on the
+        export statement, whereas the class node holds those of a class that is not exported"""
+        parent = getattr(node, 'parent', None)
+        if parent is None or parent.get('type') != 'export_statement':
+            return []
+        return [child for child in parent.get('children', []) if child.get('type') == 'decorator']
+
+    def _handle_class_declaration(self, node):
+        children = node.get('children', [])
+        class_name = next((c.get('text', '') for c in children if c.get('type') == 'type_identifier'), '')
+        if not class_name:
+            return
+        if class_name not in self.names_of_classes_defined:
+            self.names_of_classes_defined.append(class_name)
+
+        # A decorated class starts at its first decorator
+        decorators = self._export_decorators(node)
+        start, end = self._node_lines(node)
+        if decorators:
+            start = self._node_lines(decorators[0])[0]
+        class_info = {
+            'class_name': class_name,
+            'class_code': ''.join(decorator.get('text', '') + '\n' for decorator in decorators) + node.get('text', ''),
+            'class_start_point': start,
+            'class_end_point': end,
+            'methods': []
+        }
+
+        for child in children:
+            if child.get('type') != 'class_body':
+                continue
+            decorator_text = ''
+            decorator_line = None
+            for member in child.get('children', []):
+                member_type = member.get('type')
+                if member_type == 'decorator':
+                    # Method decorators precede the method in the class body
+                    decorator_text += member.get('text', '') + '\n    '
+                    if decorator_line is None:
+                        decorator_line = self._node_lines(member)[0]
+                    continue
+
+                if member_type in ('method_definition', 'abstract_method_signature'):
+                    method_name = ''
+                    prefix = ''
+                    for method_child in member.get('children', []):
+                        if method_child.get('type') in ('get', 'set'):
+                            prefix = method_child.get('type') + '_'
+                        elif method_child.get('type') in ('property_identifier', 'private_property_identifier'):
+                            method_name = method_child.get('text', '')
+
+                    if method_name:
+                        method_name = prefix + method_name
+                        self.methods_of_classes.append(method_name)
+                        method_start, method_end = self._node_lines(member)
+                        class_info['methods'].append({
+                            'method_name': method_name,
+                            'method_code': decorator_text + member.get('text', ''),
+                            'method_start_point': decorator_line or method_start,
+                            'method_end_point': method_end
+                        })
+                decorator_text = ''
+                decorator_line = None
+
+        self.class_definitions.append(class_info)
+
+    def _handle_type_declaration(self, node):
+        kind, name_type = TYPE_DECLARATION_TYPES[node.get('type')]
+        for child in node.get('children', []):
+            if child.get('type') == name_type:
+                start, end = self._node_lines(node)
+                self.type_definitions.append({
+                    'type_name': child.get('text'),
+                    'type_kind': kind,
+                    'type_code': node.get('text', ''),
+                    'start_line': start,
+                    'end_line': end
+                })
+                return
+
+    # Results -----------------------------------------------------------------
+
+    def definitions_info(self) -> Dict[str, Any]:
+        info = super().definitions_info()
+        info['methods_of_classes'] = sorted(set(self.methods_of_classes))
+        for kind in ('interface', 'type', 'enum'):
+            info[f'names_of_{kind}s_defined'] = sorted({
+                definition['type_name'] for definition in self.type_definitions if definition['type_kind'] == kind
+            })
+        info['type_definitions'] = sorted(self.type_definitions, key=lambda x: x['type_name'])
+        return info
+
+    def exports_info(self, defined_functions: List[str], defined_classes: List[str]) -> Dict[str, list]:
+        exports = super().exports_info(defined_functions, defined_classes)
+        exported_types = []
+
+        for node in self.export_statements:
+            for child in node.get('children', []):
+                child_type = child.get('type')
+                if child_type in TYPE_DECLARATION_TYPES:
+                    name_type = TYPE_DECLARATION_TYPES[child_type][1]
+                    exported_types.extend(c.get('text') for c in child.get('children', []) if c.get('type') == name_type)
+                elif child_type == 'abstract_class_declaration':
+                    exports['exported_class'].extend(
+                        c.get('text') for c in child.get('children', []) if c.get('type') == 'type_identifier'
+                    )
+
+        exports['exported_class'] = sorted(set(exports['exported_class']))
+        exports['exported_types'] = sorted(set(exported_types))
+        return exports
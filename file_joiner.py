@@ -1,51 +1,88 @@
-import os
-from neo4j import GraphDatabase
-from dotenv import load_dotenv
+import time
+from batch_writer import BatchWriter
+from driver_provider import get_driver
+from path_index import PathIndex
+
+# IMPORTS edges written per transaction, one row per resolved import
+IMPORTS_WRITE_QUERY = """
+UNWIND $rows AS row
+MATCH (source:File {path: row.source_path})
+MATCH (target:File {path: row.target_path})
+MERGE (source)-[:IMPORTS]->(target)
+"""
 
 class FileJoiner:
-    def __init__(self):
-        """Initialize FileJoiner with Neo4j connection"""
-        load_dotenv()
-        self.neo4j_uri = os.getenv('NEO4J_URI')
-        self.neo4j_user = os.getenv('NEO4J_USER')
-        self.neo4j_password = os.getenv('NEO4J_PASSWORD')
-        self.driver = GraphDatabase.driver(
-            self.neo4j_uri, 
-            auth=(self.neo4j_user, self.neo4j_password)
-        )
+    def __init__(self, batch_size: int = 1000, driver=None):
+        """Initialize FileJoiner with Neo4j connection
 
-    def normalize_path(self, path: str) -> str:
-        """Remove .js extension if present"""
-        return path.replace('.js', '')
+        Args:
+            batch_size: IMPORTS edges written per transaction
+            driver: Neo4j driver (default: the driver shared by every stage, see driver_provider)
+        """
+        self.driver = driver or get_driver()
+        self.batch_size = batch_size
 
-    def create_import_relationships(self):
-        """Create relationships between files based on their imports"""
+    def _load_imports(self) -> dict:
+        """Read the path and imported paths of every File node in one query"""
         with self.driver.session() as session:
-            # Get all files with their imported paths
-            query = """
+            result = session.run("""
             MATCH (f:File)
-            WHERE f.imported_paths IS NOT NULL
-            RETURN f.path AS source_path, f.imported_paths AS imported_paths
-            """
-            result = session.run(query)
-            print(result,"result")
-            
-            for record in result:
-                source_path = record['source_path']
-                imported_paths = record['imported_paths']
-                
-                for import_path in imported_paths:
-                    
-                    # Find and create relationship
-                    relationship_query = """
-                    MATCH (source:File {path: $source_path})
-                    MATCH (target:File)
-                    WHERE target.path contains $normalized_path
-                    MERGE (source)-[r:IMPORTS]->(target)
-                    """
-                    session.run(relationship_query, 
-                              source_path=source_path,
-                              normalized_path=import_path)
+            RETURN f.path AS path, f.imported_paths AS imported_paths
+            """)
+            return {record['path']: record['imported_paths'] or [] for record in result}
+
+    def _resolve_imports(self, imports: dict) -> list:
+        """Resolve every import against an in-memory index of the File paths (see path_index)
+        Args:
+            imports: Source path -> imported paths
+        Returns:
+            Distinct (source path, target path) pairs
+        """
+        start = time.perf_counter()
+        index = PathIndex(imports)
+        edges = {}
+        for source_path, imported_paths in imports.items():
+            for import_path in imported_paths:
+                target_path = index.resolve(import_path)
+                if target_path is not None and target_path != source_path:
+                    edges[(source_path, target_path)] = None
+
+        stats = index.stats()
+        print(f"Resolved imports of {stats['files']} files in {time.perf_counter() - start:.2f}s: "
+              f"{stats['exact']} exact, {stats['variant']} by extension or index file, {stats['suffix']} by suffix, "
+              f"{stats['unresolved']} unresolved, {stats['ambiguous']} ambiguous")
+        return list(edges)
+
+    def _write_imports(self, edges: list):
+        """Write IMPORTS edges in UNWIND batches"""
+        writer = BatchWriter(self.driver, IMPORTS_WRITE_QUERY, self.batch_size, label='IMPORTS edges')
+        for source_path, target_path in edges:
+            writer.add({'source_path': source_path, 'target_path': target_path})
+        writer.close()
+        writer.report()
+
+    def create_import_relationships(self):
+        """Create relationships between files based on their imports"""
+        self._write_imports(self._resolve_imports(self._load_imports()))
+
+    def create_import_relationships_for(self, paths: list) -> list:
+        """Rebuild the IMPORTS relationships touching the given files
+        Args:
+            paths: Stored paths of added or modified File nodes
+        Returns:
+            Paths of the other files importing any of the given files
+        """
+        changed = set(paths)
+        # Outgoing edges of the changed files, and incoming edges of files whose imports
+        # resolve to a changed file
+        edges = [
+            (source_path, target_path)
+            for source_path, target_path in self._resolve_imports(self._load_imports())
+            if source_path in changed or target_path in changed
+        ]
+        self._write_imports(edges)
+        return sorted({source_path for source_path, target_path in edges
+                       if target_path in changed and source_path not in changed})
 
     def verify_relationships(self):
         """Print all created relationships"""
@@ -69,9 +106,11 @@ class FileJoiner:
             self.close()
 
     def close(self):
-        """Close Neo4j connection"""
-        self.driver.close()
+        """Nothing to release: the driver stays open for the next stage"""
 
 if __name__ == "__main__":
+    from driver_provider import close_driver
+
     joiner = FileJoiner()
     joiner.process()
+    close_driver(report=True)
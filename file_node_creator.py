@@ -1,12 +1,19 @@
 import os
 import re
 from typing import Dict, List, Any
-from dotenv import load_dotenv
-from neo4j import GraphDatabase
-from global_regex import JS_PATTERNS, PY_PATTERNS
-from ast_extractor import JavaScriptASTExtractor
+from ast_extractor import JavaScriptASTExtractor, TypeScriptASTExtractor
+from extraction_visitor import JavaScriptExtractionVisitor, TypeScriptExtractionVisitor
+from compact_ast import CompactAST
+from query_extractor import JavaScriptQueryExtractor, TypeScriptQueryExtractor, PythonQueryExtractor, has_query, query_path
+from python_extractor import PythonExtractionVisitor
+from parser_pool import parse
+from extraction_cache import ExtractionCache
+from call_index import CallIndex
+from repo_walker import RepoWalker, LANGUAGE_EXTENSIONS
+from batch_writer import BatchWriter
 import json
 import pathlib
+from concurrent.futures import ProcessPoolExecutor
 
 # JavaScript built-in functions and keywords
 BUILT_INS = {
@@ -44,526 +51,312 @@ BUILT_INS = {
     'format', 'endOf', 'isBefore', 'isSame', 
     'isSameOrBefore', 'isValid', 'startOf'
 }
+# Language-specific metadata stored on File nodes next to the common properties
+EXTRA_PROPERTIES = ('names_of_interfaces_defined', 'names_of_types_defined', 'names_of_enums_defined',
+                    'type_definitions', 'exported_types', 'extraction_mode', 'extraction_note')
+
+# Windows read from oversized files in header-only mode: imports sit at the top of a
+# file, CommonJS exports often at the bottom
+HEADER_BYTES = 64 * 1024
+TAIL_BYTES = 16 * 1024
+
+# File nodes written per transaction, one row per file; merged on their path (unique, see
+# graph_schema) so that re-running the pipeline replaces them
+FILE_WRITE_QUERY = """
+UNWIND $rows AS row
+MERGE (f:File {path: row.path})
+SET f = {
+    path: row.path,
+    language: row.language,
+    code: row.code,
+    raw_imports: row.raw_imports,
+    imported_paths: row.imported_paths,
+    undefined_imports: row.undefined_imports,
+    imported_variables: row.imported_variables,
+    imported_functions: row.imported_functions,
+    names_of_functions_defined: row.names_of_functions_defined,
+    names_of_classes_defined: row.names_of_classes_defined,
+    methods_of_classes: row.methods_of_classes,
+    function_calls: row.function_calls,
+    function_definitions: row.function_definitions,
+    class_definitions: row.class_definitions,
+    exported_functions: row.exported_functions,
+    exported_variables: row.exported_variables,
+    exported_class: row.exported_class,
+    barrel_directories: row.barrel_directories
+}
+SET f += row.extra_properties
+"""
+
 KEYWORDS = {'if', 'else', 'for', 'while', 'do', 'switch', 'case', 'break', 'continue', 'return', 'try', 'catch', 'finally', 'throw', 'class', 'extends', 'new', 'this', 'super', 'import', 'export', 'default', 'null', 'undefined', 'true', 'false'}
 
+# Per-process FileNodeCreator used by the parallel workers of process_codebase
+_worker_creator = None
+
+def _init_worker(language: str, remove: str, backend: str = 'visitor', large_file_options: Dict[str, Any] = None,
+                 cache_dir: str = None):
+    """Create the extraction-only FileNodeCreator for a pool worker process."""
+    global _worker_creator
+    # Workers only read the extraction cache; the parent process writes it
+    cache = ExtractionCache(cache_dir, scan=False) if cache_dir else None
+    _worker_creator = FileNodeCreator(language=language, remove=remove, connect=False, dump_ast=False, backend=backend,
+                                      cache=cache, **(large_file_options or {}))
+
+def _create_file_node_worker(file_path: str):
+    """Look a single file up in the extraction cache, and parse and extract it on a miss,
+    inside a pool worker process.
+
+    Returns:
+        Tuple of the node data (None for a skipped file), the skip reason, the cache key
+        (None if the file was not looked up) and whether the node came from the cache
+    """
+    cache_key, node_data, hit = _worker_creator._lookup_or_extract(file_path)
+    if node_data is None:
+        return None, _worker_creator.skipped_files.pop()[1], None, False
+    return node_data, None, cache_key, hit
+
 class FileNodeCreator:
-    def __init__(self, language: str = 'javascript',remove: str = '/app/test/'):
+    def __init__(self, language: str = 'javascript',remove: str = '/app/test/', connect: bool = True, dump_ast: bool = False,
+                 cache: ExtractionCache = None, call_index: CallIndex = None, backend: str = 'visitor',
+                 max_file_size: int = 1024 * 1024, max_line_length: int = 2000, large_file_mode: str = 'header',
+                 batch_size: int = 500):
         """Initialize the FileNodeCreator with specified language.
         
         Args:
             language (str): Programming language of the codebase ('javascript' or 'python')
+            remove (str): Path prefix stripped from resolved import paths
+            connect (bool): Use the shared Neo4j driver (disabled for extraction-only pool workers)
+            dump_ast (bool): Write the last parsed AST to ast.json, for debugging only: every
+                file then gets a full dict expansion
+            cache (ExtractionCache): Optional content-hash cache of extraction results
+            call_index (CallIndex): Optional repository-wide call index updated with every saved file
+            backend (str): Extraction backend, 'visitor' (single-pass AST visitor) or 'query'
+                (compiled tree-sitter queries, see query_extractor.py); ValueError is raised
+                if the language has no query file
+            max_file_size (int): Files larger than this many bytes are not fully extracted
+            max_line_length (int): Files with longer lines (minified bundles) are not fully
+                extracted; generated files (see repo_walker) are treated the same way
+            large_file_mode (str): What to do with such files: 'header' extracts only their
+                imports and exports from the first and last bytes, 'skip' records the reason
+                in skipped_files and does not create a node
+            batch_size (int): File nodes written per Neo4j transaction (see batch_writer)
         """
         self.language = language.lower()
-        self.patterns = JS_PATTERNS if self.language == 'javascript' else PY_PATTERNS
+        if backend == 'query' and not has_query(self.language):
+            raise ValueError(f"The 'query' backend does not support {self.language}: {query_path(self.language)} does not exist")
         self.remove = remove
+        self.dump_ast = dump_ast
+        self.cache = cache
+        self.call_index = call_index
+        self.backend = backend
+        self.large_file_options = {
+            'max_file_size': max_file_size,
+            'max_line_length': max_line_length,
+            'large_file_mode': large_file_mode
+        }
+        self.large_file_mode = large_file_mode
+        self.skipped_files = []  # (file_path, reason)
+        self.import_resolutions = {}  # import specifier -> resolved path, of the file being extracted
+        self.driver = None
+        self.file_writer = None
+
+        # Size, line-length and generated-code checks are shared with the repository walker
+        self.walker = RepoWalker(languages=[self.language], max_file_size=max_file_size,
+                                 max_line_length=max_line_length, skip_generated=False)
 
-        # Load Neo4j credentials from .env
-        load_dotenv()
-        self.neo4j_uri = os.getenv('NEO4J_URI')
-        self.neo4j_user = os.getenv('NEO4J_USER')
-        self.neo4j_password = os.getenv('NEO4J_PASSWORD')
-        self.driver = GraphDatabase.driver(self.neo4j_uri, auth=(self.neo4j_user, self.neo4j_password))
+        if connect:
+            # Extraction-only pool workers never load the Neo4j driver
+            from driver_provider import get_driver
+
+            self.driver = get_driver()
+            self.file_writer = BatchWriter(self.driver, FILE_WRITE_QUERY, batch_size, label='File nodes')
     
     def resolve_relative_path(self,file_path,relative_path):
         current_path = pathlib.Path(file_path).parent
         resolved_path = str((current_path / relative_path).resolve())
         print(resolved_path, "resolved_path")
-        if os.path.isfile(resolved_path+'.js'):
-            print("Entered this")
-            if not resolved_path.endswith('.js'):
-                resolved_path = resolved_path + '.js'
+        for extension in LANGUAGE_EXTENSIONS.get(self.language, ('.js',)):
+            if os.path.isfile(resolved_path + extension):
+                print("Entered this")
+                if not resolved_path.endswith(extension):
+                    resolved_path = resolved_path + extension
+                break
         if(str(resolved_path).startswith(self.remove)):
             return str(resolved_path).replace(self.remove, '')
         return str(resolved_path).replace('\\', '/')
 
+    def resolve_python_module(self, file_path: str, module: str, level: int = 0):
+        """Resolve a Python import to the stored path of its module file.
+
+        Args:
+            file_path (str): Path of the importing file
+            module (str): Dotted module name (None for 'from . import x')
+            level (int): Number of leading dots of a relative import
+
+        Returns:
+            Path of the module (or package __init__.py) with the remove prefix
+            stripped, or None for modules outside the codebase
+        """
+        directory = pathlib.Path(file_path).resolve().parent
+        if level:
+            if level - 2 >= len(directory.parents):
+                return None
+            roots = [directory.parents[level - 2] if level > 1 else directory]
+        else:
+            # Absolute imports resolve from the directory above the top-level package
+            # of the importing file, or from the codebase root
+            while (directory / '__init__.py').is_file():
+                directory = directory.parent
+            roots = [directory, pathlib.Path(self.remove)]
+
+        parts = module.split('.') if module else []
+        for root in roots:
+            base = root.joinpath(*parts)
+            for candidate in (base.with_suffix('.py') if parts else None, base / '__init__.py'):
+                if candidate is not None and candidate.is_file():
+                    resolved_path = str(candidate).replace('\\', '/')
+                    if resolved_path.startswith(self.remove):
+                        return resolved_path.replace(self.remove, '')
+                    return resolved_path
+        return None
+
+    def _resolve_import(self, file_path: str, specifier) -> str:
+        """Resolve the import specifier of a file: a relative path, or (module, level) for Python."""
+        if self.language == 'python':
+            return self.resolve_python_module(file_path, *specifier)
+        return self.resolve_relative_path(file_path, *specifier)
+
+    def _import_resolver(self, file_path: str):
+        """Import resolver handed to the extractors of a file.
+
+        Every resolution is recorded in import_resolutions and cached with the node, so
+        cache hits can check it against the file system (see _cache_lookup).
+        """
+        def resolve(*specifier):
+            resolved = self._resolve_import(file_path, specifier)
+            self.import_resolutions[specifier] = resolved
+            return resolved
+        return resolve
+
+    def _visit(self, ast, file_path: str) -> JavaScriptExtractionVisitor:
+        """Run the single-pass extraction visitor over a file's AST."""
+        visitor_class = TypeScriptExtractionVisitor if self.language == 'typescript' else JavaScriptExtractionVisitor
+        visitor = visitor_class(
+            self._import_resolver(file_path)
+        )
+        return visitor.visit(ast)
+
+    def _query(self, content: str, file_path: str) -> JavaScriptQueryExtractor:
+        """Run the compiled extraction queries over a file's parse tree."""
+        grammar = TypeScriptASTExtractor._language(file_path) if self.language == 'typescript' else self.language
+        tree = parse(content, grammar)
+        if self.dump_ast:
+            with open("ast.json", "w") as f:
+                json.dump(CompactAST.from_tree_sitter(tree.root_node).root.to_dict(), f, indent=4)
+
+        if self.language == 'python':
+            extractor = PythonQueryExtractor(
+                self._import_resolver(file_path),
+                grammar
+            )
+        else:
+            extractor_class = TypeScriptQueryExtractor if self.language == 'typescript' else JavaScriptQueryExtractor
+            extractor = extractor_class(
+                self._import_resolver(file_path),
+                grammar
+            )
+        return extractor.visit(tree)
+
+    def _extract_python(self, content: str, file_path: str) -> PythonExtractionVisitor:
+        """Run the stdlib ast extraction over a Python module."""
+        visitor = PythonExtractionVisitor(
+            self._import_resolver(file_path)
+        )
+        return visitor.extract(content, file_path)
+
     def _extract_imports(self,ast,file_path) -> dict:
-        raw_imports = []
-        imported_paths = []
-        undefined_imports = []
-        imported_variables = []  # Will now store [variable_name, path]
-        imported_functions = []  # Will now store [function_name, path]
-        
-        try:
-            def process_node(node):
-                if not isinstance(node, dict):
-                    return
-                    
-                node_type = node.get('type')
-                text = node.get('text', '')
-                
-                # Regular imports
-                if node_type == 'import_statement':
-                    raw_imports.append(text)
-                    
-                    # Get the source path
-                    current_path = None
-                    for child in node.get('children', []):
-                        if child.get('type') == 'string':
-                            path = child.get('text', '').strip("'").strip('"')
-                            if path.startswith('.'):
-                                current_path = self.resolve_relative_path(file_path,path)
-                                imported_paths.append(current_path)
-                            else:
-                                current_path = path
-                                undefined_imports.append(path)
-                    
-                    # Process import clause
-                    for child in node.get('children', []):
-                        if child.get('type') == 'import_clause':
-                            # Default import
-                            for clause_child in child.get('children', []):
-                                if clause_child.get('type') == 'identifier':
-                                    imported_variables.append([clause_child.get('text'), current_path])
-                                elif clause_child.get('type') == 'named_imports':
-                                    # Handle named imports
-                                    for spec in clause_child.get('children', []):
-                                        if spec.get('type') == 'import_specifier':
-                                            spec_text = spec.get('text', '')
-                                            if ' as ' in spec_text:
-                                                imported_functions.append([spec_text.split(' as ')[1].strip(), current_path])
-                                            else:
-                                                imported_functions.append([spec_text, current_path])
-                                elif clause_child.get('type') == 'namespace_import':
-                                    # Handle namespace import
-                                    namespace_text = clause_child.get('text')
-                                    if ' as ' in namespace_text:
-                                        imported_variables.append([namespace_text.split(' as ')[1].strip(), current_path])
-                
-                # Dynamic imports
-                elif node_type in ['await_expression', 'expression_statement']:
-                    if 'import(' in text:
-                        raw_imports.append(text)
-                        # Extract path from dynamic import
-                        path_match = re.search(r"import\(['\"]([^'\"]+)['\"]\)", text)
-                        if path_match:
-                            path = path_match.group(1)
-                            if path.startswith('.'):
-                                imported_paths.append(self.resolve_relative_path(file_path,path))
-                            else:
-                                undefined_imports.append(path)
-                
-                # Require statements
-                elif node_type == 'lexical_declaration' and re.match(r'.*const\s+(?:\w+|\{[^}]+\})\s*=\s*require\([\'"].*[\'"]\).*', text):
-                    raw_imports.append(text)
-                    
-                    # Get the require path
-                    current_path = None
-                    path_match = re.search(r"require\(['\"]([^'\"]+)['\"]\)", text)
-                    if path_match:
-                        path = path_match.group(1)
-                        if path.startswith('.'):
-                            current_path = self.resolve_relative_path(file_path,path)
-                            imported_paths.append(current_path)
-                        else:
-                            current_path = path
-                            undefined_imports.append(path)
-                    
-                    # Handle destructured require
-                    if '{' in text:
-                        for child in node.get('children', []):
-                            if child.get('type') == 'variable_declarator':
-                                for var_child in child.get('children', []):
-                                    if var_child.get('type') == 'object_pattern':
-                                        for prop in var_child.get('children', []):
-                                            if prop.get('type') == 'shorthand_property_identifier_pattern':
-                                                imported_functions.append([prop.get('text'), current_path])
-                    else:
-                        # Regular require
-                        var_match = re.search(r"const\s+(\w+)\s*=\s*require", text)
-                        if var_match:
-                            imported_variables.append([var_match.group(1), current_path])
-
-                # Process children
-                for child in node.get('children', []):
-                    process_node(child)
-
-            if ast and isinstance(ast, dict):
-                process_node(ast)
-
-            # Remove duplicates and sort
-            return {
-                'raw_imports': sorted(set(raw_imports)),
-                'imported_paths': sorted(set(imported_paths)),
-                'undefined_imports': sorted(set(undefined_imports)),
-                'imported_variables': sorted(imported_variables, key=lambda x: x[0]),  # Sort by variable name
-                'imported_functions': sorted(imported_functions, key=lambda x: x[0])   # Sort by function name
-            }
-            
-        except Exception as e:
-            print(f"Error processing imports: {e}")
-            return {
-                'raw_imports': [],
-                'imported_paths': [],
-                'undefined_imports': [],
-                'imported_variables': [],
-                'imported_functions': []
-            }
+        return self._visit(ast, file_path).imports_info()
 
     def _extract_functions_and_classes(self, ast) -> Dict[str, Any]:
         """Extract function and class information using AST."""
-        info = {
-            'names_of_functions_defined': [],
-            'names_of_classes_defined': [],
-            'methods_of_classes': [],
-            'function_definitions': [],
-            'class_definitions': []
-        }
-        
-        try:
-            def get_node_lines(node):
-                start = node.get('start_point', [0, 0])[0] + 1
-                end = node.get('end_point', [0, 0])[0] + 1
-                return start, end
-
-            def add_function_definition(name, code, node):
-                start, end = get_node_lines(node)
-                info['function_definitions'].append({
-                    'function_name': name,
-                    'function_code': code,
-                    'start_line': start,
-                    'end_line': end
-                })
-            
-            def process_node(node):
-                if not isinstance(node, dict):
-                    return
-                    
-                node_type = node.get('type')
-                text = node.get('text', '')
-                
-                # Object method definitions using regex
-                if node_type == 'pair':
-                    # Match patterns like: functionName: function(...) or functionName: (...) =>
-                    method_match = re.match(r'^\s*(\w+)\s*:\s*(?:(?:async\s+)?function\s*\(.*\)|(?:\([^)]*\)|[^=]+)\s*=>)', text)
-                    if method_match:
-                        method_name = method_match.group(1)
-                        if method_name and method_name not in info['names_of_functions_defined']:
-                            info['names_of_functions_defined'].append(method_name)
-                            add_function_definition(method_name, text, node)
-                
-                elif node_type == 'method_definition':
-                    for child in node.get('children', []):
-                        if child.get('type') == 'property_identifier':
-                            method_name = child.get('text')
-                            if method_name:
-                                info['names_of_functions_defined'].append(method_name)
-                                add_function_definition(method_name, text, node)
-                
-                # Function declarations (including generator functions)
-
-                elif node_type == 'function_declaration':
-                    for child in node.get('children', []):
-                        if child.get('type') == 'identifier':
-                            func_name = child.get('text')
-                            if func_name and func_name not in info['names_of_functions_defined']:
-                                info['names_of_functions_defined'].append(func_name)
-                                add_function_definition(func_name, text, node)
-                
-                # Generator functions
-                elif node_type == 'generator_function_declaration':
-                    for child in node.get('children', []):
-                        if child.get('type') == 'identifier':
-                            func_name = child.get('text')
-                            if func_name and func_name not in info['names_of_functions_defined']:
-                                info['names_of_functions_defined'].append(func_name)
-                                add_function_definition(func_name, text, node)
-                
-                # Arrow functions and variable declarations
-                elif node_type == 'lexical_declaration':
-                    print(text, "text", "lexical_declaration type")
-                    # Modified regex to catch both function and arrow function declarations, but not callbacks
-                    func_match = re.search(r'(?:const|let|var)\s+(\w+)\s*=\s*(?:(?:async\s+)?function\s*\(|\([^)]*\)\s*=>|[^=]*=>\s*\{)', text)
-                    print(func_match, "func_match", "lexical_declaration type")
-                    if func_match:
-                        func_name = func_match.group(1)
-                        if func_name and func_name not in info['names_of_functions_defined']:
-                            info['names_of_functions_defined'].append(func_name)
-                            add_function_definition(func_name, text, node)
-                    
-                    # Keep the existing AST traversal as backup
-                    for child in node.get('children', []):
-                        if child.get('type') == 'variable_declarator':
-                            func_name = None
-                            for var_child in child.get('children', []):
-                                if var_child.get('type') == 'identifier':
-                                    func_name = var_child.get('text')
-                                elif var_child.get('type') in ['arrow_function', 'function']:
-                                    if func_name and func_name not in info['names_of_functions_defined']:
-                                        info['names_of_functions_defined'].append(func_name)
-                                        add_function_definition(func_name, text, node)
-                
-                # Classes and their methods
-                elif node_type == 'class_declaration':
-                    class_info = {
-                        'class_name': '',
-                        'class_code': text,
-                        'class_start_point': get_node_lines(node)[0],
-                        'class_end_point': get_node_lines(node)[1],
-                        'methods': []
-                    }
-                    
-                    # Get class name
-                    for child in node.get('children', []):
-                        if child.get('type') == 'identifier':
-                            class_info['class_name'] = child.get('text')
-                            if class_info['class_name'] not in info['names_of_classes_defined']:
-                                info['names_of_classes_defined'].append(class_info['class_name'])
-                    
-                    # Get methods
-                    for child in node.get('children', []):
-                        if child.get('type') == 'class_body':
-                            for method in child.get('children', []):
-                                if method.get('type') == 'method_definition':
-                                    method_name = ''
-                                    for method_child in method.get('children', []):
-                                        if method_child.get('type') == 'property_identifier':
-                                            method_name = method_child.get('text')
-                                            
-                                    if method_name:
-                                        class_info['methods'].append({
-                                            'method_name': method_name,
-                                            'method_code': method.get('text', ''),
-                                            'method_start_point': get_node_lines(method)[0],
-                                            'method_end_point': get_node_lines(method)[1]
-                                        })
-                
-                    info['class_definitions'].append(class_info)
-                # Process children recursively
-                for child in node.get('children', []):
-                    process_node(child)
-            
-            if ast and isinstance(ast, dict):
-                process_node(ast)
-            
-            # Sort all lists for consistency
-            for key in info:
-                if isinstance(info[key], list):
-                    if key == 'methods_of_classes':
-                        for class_info in info['methods_of_classes']:
-                            class_info['methods'].sort()
-                    elif key == 'function_definitions':
-                        info[key].sort(key=lambda x: x['function_name'])
-                    elif key == 'class_definitions':
-                        info[key].sort(key=lambda x: x['class_name'])
-                    else:
-                        info[key].sort()
-            
-            return info
-            
-        except Exception as e:
-            print(f"Error processing functions and classes: {e}")
-            return {
-                'names_of_functions_defined': [],
-                'names_of_classes_defined': [],
-                'methods_of_classes': [],
-                'function_definitions': [],
-                'class_definitions': []
-            }
+        return self._visit(ast, '').definitions_info()
 
     def _extract_exports(self, ast, defined_functions, defined_classes) -> Dict[str, list]:
-        exports = {
-            'exported_functions': [],
-            'exported_variables': [],
-            'exported_class': []
-        }
-        
-        try:
-            def process_node(node):
-                if not isinstance(node, dict):
-                    return
-                    
-                node_type = node.get('type')
-                text = node.get('text', '')
-                
-                # ES6 exports
-                if node_type == 'export_statement':
-                    # Direct exports: export class/function/const
-                    export_match = re.search(r'export\s+(class|function|const)\s+(\w+)', text)
-                    if export_match:
-                        export_type, name = export_match.groups()
-                        if export_type == 'class':
-                            exports['exported_class'].append(name)
-                        elif export_type == 'function':
-                            exports['exported_functions'].append(name)
-                        elif export_type == 'const':
-                            if name in defined_functions:
-                                exports['exported_functions'].append(name)
-                            else:
-                                exports['exported_variables'].append(name)
-                
-                    # Named exports: export { name1, name2 }
-                    export_list = re.findall(r'export\s*{\s*([\w\s,]+)\s*}', text)
-                    if export_list:
-                        names = re.findall(r'\w+', export_list[0])
-                        for name in names:
-                            if name in defined_functions:
-                                exports['exported_functions'].append(name)
-                            elif name in defined_classes:
-                                exports['exported_class'].append(name)
-                            else:
-                                exports['exported_variables'].append(name)
-                
-                # CommonJS exports
-                elif node_type == 'expression_statement':
-                    # Direct module.exports = variable_name
-                    direct_export = re.search(r'module\.exports\s*=\s*(\w+)(?:\s*;)?', text)
-                    if direct_export:
-                        name = direct_export.group(1)
-                        if name in defined_functions:
-                            exports['exported_functions'].append(name)
-                        elif name in defined_classes:
-                            exports['exported_class'].append(name)
-                        else:
-                            exports['exported_variables'].append(name)
-                    
-                    # For any text containing module.exports
-                    if 'module.exports' in text:
-                        # Check for all defined functions in the text
-                        for func in defined_functions:
-                            # Look for any occurrence of the function name that looks like an export
-                            # This could be: func: function(){}, func(){}, func: func, etc.
-                            if any(pattern.format(func) in text for pattern in [
-                                '{}:', # object key
-                                '{},', # last item in object
-                                '{}()', # method shorthand
-                            ]):
-                                exports['exported_functions'].append(func)
-                    
-                    # Named exports: module.exports.name = ...
-                    named_match = re.search(r'module\.exports\.(\w+)\s*=\s*(class|function)?', text)
-                    if named_match:
-                        name, export_type = named_match.groups()
-                        if export_type == 'class' or name in defined_classes:
-                            exports['exported_class'].append(name)
-                        elif export_type == 'function' or name in defined_functions:
-                            exports['exported_functions'].append(name)
-                        else:
-                            exports['exported_variables'].append(name)
-                
-                # Process children recursively
-                for child in node.get('children', []):
-                    process_node(child)
-            
-            if ast and isinstance(ast, dict):
-                process_node(ast)
-            
-            # Remove duplicates and sort
-            for key in exports:
-                exports[key] = sorted(set(exports[key]))
-            
-            return exports
-            
-        except Exception as e:
-            print(f"Error processing exports: {e}")
-            return {
-                'exported_functions': [],
-                'exported_variables': [],
-                'exported_class': []
-            }
+        return self._visit(ast, '').exports_info(defined_functions, defined_classes)
 
     def _extract_function_calls_with_path(self, ast, imported_variables, imported_functions) -> List[Dict[str, str]]:
-        function_calls = []
-        seen_calls = set()  # Add this to track seen calls
-        text = ast.get('text', '')
-        
-        try:
-            # First find all instances where imported classes are instantiated
-            variable_mappings = {}  # Will store 'service' -> 'DefaultService' mappings
-            potential_class_names = set()
-            potential_class_names.update(var[0] for var in imported_variables)
-            potential_class_names.update(func[0] for func in imported_functions)
-            
-            imported_class_names = '|'.join(potential_class_names)
-            if imported_class_names:
-                instance_pattern = rf'const\s+(\w+)\s*=\s*new\s+({imported_class_names})'
-                
-                # Find all instances
-                for match in re.finditer(instance_pattern, text):
-                    var_name = match.group(1)    # e.g., 'service'
-                    class_name = match.group(2)  # e.g., 'DefaultService'
-                    variable_mappings[var_name] = class_name
-
-            # Now create patterns for function calls using both original imports and instantiated variables
-            all_var_names = set()
-            
-            # Add original imported variables
-            all_var_names.update(var[0] for var in imported_variables)
-            
-            # Add instantiated variable names
-            all_var_names.update(variable_mappings.keys())
-            
-            # Create patterns
-            imported_vars = '|'.join(all_var_names)
-            imported_funcs = '|'.join([func[0] for func in imported_functions])
-            
-            # When adding a function call, check if we've seen it:
-            def add_function_call(func_call, path):
-                call_key = f"{func_call}:{path}"
-                if call_key not in seen_calls:
-                    function_calls.append({
-                        'function_call': func_call,
-                        'path': path
-                    })
-                    seen_calls.add(call_key)
-
-            # Find direct function calls
-            if imported_funcs:
-                direct_pattern = rf'({imported_funcs})\('
-                for match in re.finditer(direct_pattern, text):
-                    func_name = match.group(1)
-                    for name, path in imported_functions:
-                        if name == func_name:
-                            add_function_call(func_name, path)
-            
-            # Find method calls on both imported and instantiated variables
-            if imported_vars:
-                method_pattern = rf'({imported_vars})\.(\w+)\('
-                for match in re.finditer(method_pattern, text):
-                    var_name = match.group(1)
-                    method_name = match.group(2)
-                    
-                    # If it's an instantiated variable, look up its class
-                    if var_name in variable_mappings:
-                        class_name = variable_mappings[var_name]
-                        # Find the path for the class
-                        for name, path in imported_variables:
-                            if name == class_name:
-                                add_function_call(f"{var_name}.{method_name}", path)
-                    else:
-                        # Direct imported variable
-                        for name, path in imported_variables:
-                            if name == var_name:
-                                add_function_call(f"{var_name}.{method_name}", path)
-            
-            return function_calls
-            
-        except Exception as e:
-            print(f"Error processing function calls: {e}")
-            return []
+        return self._visit(ast, '').function_calls(imported_variables, imported_functions)
 
     def create_file_node(self, file_path: str) -> Dict[str, Any]:
         """Create a node representation for a file with all required metadata.
         
+        Imports, definitions, exports and call sites are collected in a single
+        traversal of the AST (see extraction_visitor.JavaScriptExtractionVisitor), or
+        by the compiled tree-sitter queries with the 'query' backend. The 'visitor'
+        backend extracts Python modules with the stdlib ast module (see python_extractor.py).
+        
+        Files above the size or line-length thresholds never get a full parse (see
+        large_file_mode).
+        
         Args:
             file_path (str): Path to the file
             
         Returns:
-            Dict containing all metadata for the file
+            Dict containing all metadata for the file, or None if it was skipped
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        cache_key, node_data, hit = self._lookup_or_extract(file_path)
+        if cache_key:
+            self.cache.count_lookup(hit)
+            if not hit:
+                self.cache.put(cache_key, node_data)
+        return node_data
+
+    def _lookup_or_extract(self, file_path: str):
+        """Cached node of a file, or its extracted node on a miss (see create_file_node).
+
+        Returns:
+            Tuple of the cache key (None without a cache and for header-only or skipped
+            files), the node data and whether it came from the cache
+        """
+        size = os.path.getsize(file_path)
+        reason = self.walker.generated_reason(file_path, os.path.basename(file_path), size)
+        if reason:
+            print(f"Large or generated file {file_path}: {reason}")
+            if self.large_file_mode == 'skip':
+                self.skipped_files.append((file_path, reason))
+                return None, None, False
+            return None, self._create_header_node(file_path, size, reason), False
+
+        cache_key, node_data, content = self._cache_lookup(file_path)
+        if node_data is not None:
+            return cache_key, node_data, True
+
+        if content is None:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        self.import_resolutions = {}
         
-        extractor = JavaScriptASTExtractor("")
-        ast = extractor.process_js_file(file_path)
-        with open("ast.json", "w") as f:
-            json.dump(ast, f, indent=4)
+        if self.backend == 'query':
+            visitor = self._query(content, file_path)
+        elif self.language == 'python':
+            visitor = self._extract_python(content, file_path)
+        else:
+            if self.language == 'typescript':
+                ast = TypeScriptASTExtractor("").process_ts_file(file_path, content)
+            else:
+                ast = JavaScriptASTExtractor("").process_js_file(file_path, content)
+            if self.dump_ast:
+                with open("ast.json", "w") as f:
+                    json.dump(ast.to_dict() if ast else ast, f, indent=4)
+
+            visitor = self._visit(ast, file_path)
+
         # Extract imports
-        import_info = self._extract_imports(ast,file_path)
+        import_info = visitor.imports_info()
         print(import_info, "import_info")
         
         # Extract function calls with path info
-        function_calls_info = self._extract_function_calls_with_path(
-            ast,
+        function_calls_info = visitor.function_calls(
             import_info['imported_variables'],
             import_info['imported_functions']
         )
@@ -572,13 +365,13 @@ class FileNodeCreator:
         print("--------------------------------")
         
         # Extract functions and classes
-        code_info = self._extract_functions_and_classes(ast)
+        code_info = visitor.definitions_info()
         print("--------------------------------")
         print(code_info, "code_info")
         print("--------------------------------")
 
         # Extract exports
-        exports_info = self._extract_exports(ast,code_info['names_of_functions_defined'],code_info['names_of_classes_defined'])
+        exports_info = visitor.exports_info(code_info['names_of_functions_defined'],code_info['names_of_classes_defined'])
         print("--------------------------------")
         print(exports_info, "exports_info")
         print("--------------------------------")
@@ -596,73 +389,250 @@ class FileNodeCreator:
             **code_info,
             **exports_info,
             'barrel_directories': barrel_directories,
-            'function_calls': function_calls_info
+            'function_calls': function_calls_info,
+            'call_sites': visitor.call_sites_info(),
+            'import_resolutions': [[list(specifier), resolved] for specifier, resolved in self.import_resolutions.items()]
         }
-        
-        return node_data
+
+        return cache_key, node_data, False
+
+    def _create_header_node(self, file_path: str, size: int, reason: str) -> Dict[str, Any]:
+        """Header-only node of an oversized file: imports and exports, no definitions.
+
+        Only the first HEADER_BYTES and last TAIL_BYTES of the file are read and parsed,
+        so time and memory stay bounded whatever the file size. The code is not stored.
+        """
+        with open(file_path, 'rb') as f:
+            header = f.read(HEADER_BYTES)
+            tail = b''
+            if size > HEADER_BYTES:
+                f.seek(max(HEADER_BYTES, size - TAIL_BYTES))
+                tail = f.read()
+        header = header.decode('utf-8', errors='ignore')
+        tail = tail.decode('utf-8', errors='ignore')
+
+        if self.language == 'python':
+            # Keep the complete top-level statements of the header
+            cut = [match.start() for match in re.finditer(r'\n(?=\S)', header)]
+            if size > HEADER_BYTES and cut:
+                header = header[:cut[-1]]
+            visitor = self._extract_python(header, file_path)
+        else:
+            visitor = (TypeScriptExtractionVisitor if self.language == 'typescript' else JavaScriptExtractionVisitor)(
+                self._import_resolver(file_path)
+            )
+            for window in (header, tail):
+                if window:
+                    visitor.visit(CompactAST.from_tree_sitter(parse(window, self.language).root_node).root)
+
+        import_info = visitor.imports_info()
+        return {
+            'language': self.language,
+            'code': '',
+            **import_info,
+            'names_of_functions_defined': [],
+            'names_of_classes_defined': [],
+            'methods_of_classes': [],
+            'function_definitions': [],
+            'class_definitions': [],
+            **visitor.exports_info([], []),
+            'barrel_directories': self._identify_barrels(import_info['imported_paths']),
+            'function_calls': [],
+            'call_sites': [],
+            'extraction_mode': 'header',
+            'extraction_note': reason
+        }
+
+    def _cache_lookup(self, file_path: str):
+        """Look a file up in the extraction cache.
+
+        Import specifiers are resolved against the file system, which may have changed
+        since the file was cached: they are resolved again on every hit, and an entry
+        whose imports now resolve differently is treated as a miss.
+
+        Returns:
+            Tuple of the cache key (None without a cache), the cached node data with
+            its code restored (None on a miss) and the content of the file (None if it
+            was not read), so a miss does not read the file again
+        """
+        if self.cache is None or os.path.getsize(file_path) > self.walker.max_file_size:
+            # Oversized files are never fully read nor cached
+            return None, None, None
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        cache_key = self.cache.key(file_path, content, self.language, self.remove, self.backend)
+        cached = self.cache.get(cache_key)
+        if cached is None:
+            return cache_key, None, content
+
+        for specifier, resolved in cached['import_resolutions']:
+            if self._resolve_import(file_path, specifier) != resolved:
+                print(f"Imports of {file_path} resolve differently since it was cached")
+                return cache_key, None, content
+
+        # Barrel directories depend on the file system rather than the file content
+        cached['barrel_directories'] = self._identify_barrels(cached['imported_paths'])
+        return cache_key, {**cached, 'code': content}, content
 
     def save_to_neo4j(self, node_data: Dict[str, Any], file_path: str, remove: str):
-        """Save the file node to Neo4j.
-        
+        """Queue the file node for the next batched write to Neo4j.
+
+        Nodes are written by file_writer in transactions of batch_size files; call
+        flush() (or close()) to write the remaining ones.
+
         Args:
             node_data (Dict): Node metadata
             file_path (str): Path to the file
             remove (str): Path prefix to remove
         """
-        with self.driver.session() as session:
-            # Remove prefix from file_path
-            file_path = file_path.replace(remove, '')
-            
-            node_data['imported_variables'] = json.dumps(node_data['imported_variables'])
-            node_data['imported_functions'] = json.dumps(node_data['imported_functions'])
-            node_data['methods_of_classes'] = json.dumps(node_data['methods_of_classes'])
-            node_data['function_calls'] = json.dumps(node_data['function_calls'])
-            node_data['function_definitions'] = json.dumps(node_data['function_definitions'])
-            node_data['class_definitions'] = json.dumps(node_data['class_definitions'])
-            
-            # Create node with all metadata
-            cypher_query = """
-            CREATE (f:File {
-                path: $file_path,
-                language: $language,
-                code: $code,
-                raw_imports: $raw_imports,
-                imported_paths: $imported_paths,
-                undefined_imports: $undefined_imports,
-                imported_variables: $imported_variables,
-                imported_functions: $imported_functions,
-                names_of_functions_defined: $names_of_functions_defined,
-                names_of_classes_defined: $names_of_classes_defined,
-                methods_of_classes: $methods_of_classes,
-                function_calls: $function_calls,
-                function_definitions: $function_definitions,
-                class_definitions: $class_definitions,
-                exported_functions: $exported_functions,
-                exported_variables: $exported_variables,
-                exported_class: $exported_class,
-                barrel_directories: $barrel_directories
-            })
-            """
-            # print(file_path, "file_path")
-            session.run(cypher_query, file_path=file_path, **node_data)
-
-    def process_codebase(self, root_dir: str,remove: str):
+        # Remove prefix from file_path
+        file_path = file_path.replace(remove, '')
+        node_data.pop('import_resolutions', None)
+
+        node_data['imported_variables'] = json.dumps(node_data['imported_variables'])
+        node_data['imported_functions'] = json.dumps(node_data['imported_functions'])
+        node_data['methods_of_classes'] = json.dumps(node_data['methods_of_classes'])
+        node_data['function_calls'] = json.dumps(node_data['function_calls'])
+        node_data['function_definitions'] = json.dumps(node_data['function_definitions'])
+        node_data['class_definitions'] = json.dumps(node_data['class_definitions'])
+        extra_properties = {key: node_data.pop(key) for key in EXTRA_PROPERTIES if key in node_data}
+        if 'type_definitions' in extra_properties:
+            extra_properties['type_definitions'] = json.dumps(extra_properties['type_definitions'])
+
+        self.file_writer.add({**node_data, 'path': file_path, 'extra_properties': extra_properties})
+
+    def flush(self):
+        """Write the queued file nodes and print the write throughput."""
+        if self.file_writer is not None:
+            self.file_writer.flush()
+            self.file_writer.report()
+
+    def _collect_files(self, root_dir: str) -> List[str]:
+        """Collect the source files of the codebase in walk order (see repo_walker.RepoWalker)."""
+        # Large and generated files are handled by create_file_node (see large_file_mode)
+        walker = RepoWalker(languages=[self.language], skip_generated=False)
+        file_paths = walker.collect(root_dir).get(self.language, [])
+        walker.report()
+        return file_paths
+
+    def process_codebase(self, root_dir: str,remove: str, workers: int = 1):
         """Process entire codebase and create nodes for all files.
         
         Args:
             root_dir (str): Root directory of the codebase
+            remove (str): Path prefix to remove from stored file paths
+            workers (int): Number of worker processes used for parsing and extraction.
+                With more than one worker, files are parsed in a process pool and this
+                process stays the single Neo4j writer, saving results in walk order.
+        """
+        file_paths = self._collect_files(root_dir)
+        self._prune_call_index(file_paths, remove, [self.language])
+        self.process_files(file_paths, remove, workers)
+
+    def process_repository(self, root_dir: str, remove: str, workers: int = 1):
+        """Process every JavaScript, TypeScript and Python file of a repository.
+
+        The repository is walked once; each language's files are then extracted by a
+        FileNodeCreator of that language sharing this one's driver, cache and call index.
+
+        Args:
+            root_dir (str): Root directory of the repository
+            remove (str): Path prefix to remove from stored file paths
+            workers (int): Number of worker processes used for parsing and extraction
+        """
+        walker = RepoWalker(skip_generated=False)
+        files_by_language = walker.collect(root_dir)
+        walker.report()
+        self._prune_call_index([path for paths in files_by_language.values() for path in paths], remove,
+                               list(LANGUAGE_EXTENSIONS))
+
+        for language, file_paths in files_by_language.items():
+            print(f"Processing {len(file_paths)} {language} files")
+            self._for_language(language).process_files(file_paths, remove, workers)
+
+    def _prune_call_index(self, file_paths: List[str], remove: str, languages: List[str]):
+        """Drop the indexed files of a full run's languages that the run did not walk."""
+        if self.call_index is not None:
+            extensions = tuple(extension for language in languages for extension in LANGUAGE_EXTENSIONS[language])
+            self.call_index.prune([file_path.replace(remove, '') for file_path in file_paths], extensions)
+
+    def _for_language(self, language: str) -> 'FileNodeCreator':
+        """This creator, or one for another language sharing its connection and settings."""
+        if language == self.language:
+            return self
+        creator = FileNodeCreator(language=language, remove=self.remove, connect=False, dump_ast=self.dump_ast,
+                                  cache=self.cache, call_index=self.call_index, backend=self.backend,
+                                  **self.large_file_options)
+        creator.driver = self.driver
+        creator.file_writer = self.file_writer
+        return creator
+
+    def process_files(self, file_paths: List[str], remove: str, workers: int = 1):
+        """Create and save nodes for the given files (see process_codebase).
+        
+        Args:
+            file_paths (List[str]): Files to process, saved in this order
+            remove (str): Path prefix to remove from stored file paths
+            workers (int): Number of worker processes used for parsing and extraction
+        """
+        if workers <= 1 or len(file_paths) <= 1:
+            for file_path in file_paths:
+                print(f"Processing file: {file_path}")
+                node_data = self.create_file_node(file_path)
+                if node_data is not None:
+                    self._save_file_node(node_data, file_path, remove)
+        else:
+            self._process_parallel(file_paths, remove, workers)
+        self.flush()
+
+        for file_path, reason in self.skipped_files:
+            print(f"Skipped {file_path}: {reason}")
+            if self.call_index is not None:
+                self.call_index.remove_file(file_path.replace(remove, ''))
+
+        if self.cache is not None:
+            print(f"Extraction cache: {self.cache.stats()}")
+        if self.call_index is not None:
+            self.call_index.save()
+
+    def _save_file_node(self, node_data: Dict[str, Any], file_path: str, remove: str):
+        """Save a file node and index its call sites."""
+        call_sites = node_data.pop('call_sites', [])
+        if self.call_index is not None:
+            self.call_index.update_file(file_path.replace(remove, ''), call_sites)
+        self.save_to_neo4j(node_data, file_path, remove)
+
+    def _process_parallel(self, file_paths: List[str], remove: str, workers: int):
+        """Extract files in a process pool and save the results from this process in order.
+
+        Workers read and hash the files for the cache lookups too, so nothing is read
+        serially before the pool starts; this process only writes the cache.
         """
-        for root, _, files in os.walk(root_dir):
-            for file in files:
-                if self.language == 'javascript' and file.endswith('.js'):
-                    file_path = os.path.join(root, file)
-                    print(f"Processing file: {file_path}")
-                    node_data = self.create_file_node(file_path)
-                    self.save_to_neo4j(node_data, file_path, remove)
+        # Large chunks amortize the pickling round trip; keep a few per worker for balance
+        chunksize = max(1, min(64, len(file_paths) // (workers * 4)))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self.language, self.remove, self.backend, self.large_file_options,
+                      self.cache.cache_dir if self.cache is not None else None)
+        ) as executor:
+            results = executor.map(_create_file_node_worker, file_paths, chunksize=chunksize)
+            for file_path, (node_data, skipped_reason, cache_key, hit) in zip(file_paths, results):
+                if node_data is None:
+                    self.skipped_files.append((file_path, skipped_reason))
+                    continue
+                if cache_key:
+                    self.cache.count_lookup(hit)
+                    if not hit:
+                        self.cache.put(cache_key, node_data)
+                print(f"Processing file: {file_path}")
+                self._save_file_node(node_data, file_path, remove)
 
     def close(self):
-        """Close the Neo4j connection."""
-        self.driver.close()
+        """Write the queued file nodes; the shared driver stays open for the next stage."""
+        if self.file_writer is not None:
+            self.file_writer.close()
 
     def _identify_barrels(self, imported_paths: List[str]) -> List[str]:
         """Identify directories that are being imported (which must contain barrel files).
@@ -696,4 +666,5 @@ if __name__ == "__main__":
     print(node_data, "node_data")
     input("Press Enter to continue...")
     creator.save_to_neo4j(node_data, test_file, remove)
+    creator.close()
 
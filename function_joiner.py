@@ -1,12 +1,50 @@
-import re
 import json
-from langchain.chat_models import ChatOpenAI
-from langchain.schema import HumanMessage
-from neo4j import GraphDatabase
+from call_matcher import extract_calls
+from batch_writer import BatchWriter
+from target_file_cache import TargetFileCache
+
+# Sources are looked up by key, targets by file and name (see graph_schema)
+CALL_SOURCE_MATCHES = {
+    'function': "MATCH (source:Function {key: row.source_key})",
+    'method': "MATCH (source:Method {key: row.source_key})",
+}
+
+CALL_TARGET_MATCHES = {
+    'function': "MATCH (target:Function {file_path: row.target_path, name: row.target_name})",
+    'method': """MATCH (target:Method {file_path: row.target_path, name: row.target_name})
+WHERE target.class_name = row.target_class_name""",
+}
+
+# One fixed statement per (source kind, target kind)
+CALLS_WRITE_QUERIES = {
+    (source_kind, target_kind): f"""
+UNWIND $rows AS row
+{source_match}
+{target_match}
+MERGE (source)-[:CALLS]->(target)
+"""
+    for source_kind, source_match in CALL_SOURCE_MATCHES.items()
+    for target_kind, target_match in CALL_TARGET_MATCHES.items()
+}
 
 class FunctionCallAnalyzer:
-    def __init__(self, driver, openai_api_key):
+    def __init__(self, driver, openai_api_key, batch_size: int = 500, target_cache_size: int = 4096):
+        """
+        Args:
+            driver: Neo4j driver (owned by the caller)
+            openai_api_key: API key of the LLM used to resolve external calls
+            batch_size: CALLS edges of one (source kind, target kind) written per transaction
+            target_cache_size: Call target files whose metadata is kept in memory
+        """
+        # langchain is only loaded by the stage that talks to the LLM
+        from langchain.chat_models import ChatOpenAI
+
         self.driver = driver
+        self.call_writers = {
+            kinds: BatchWriter(driver, query, batch_size, label=f'{kinds[0]} -> {kinds[1]} CALLS edges')
+            for kinds, query in CALLS_WRITE_QUERIES.items()
+        }
+        self.target_files = TargetFileCache(driver, target_cache_size)
         base_url = "http://host.docker.internal:1234/v1"
         self.llm = ChatOpenAI(
             api_key="not-needed", 
@@ -16,39 +54,13 @@ class FunctionCallAnalyzer:
         )
     
     def _extract_function_calls(self, code):
-        """Extract function calls using regex patterns"""
-        if not isinstance(code, (str, bytes)):
-            # print(f"Warning: code is not string or bytes, it is: {type(code)}")
-            # print(f"Code value: {code}")
+        """Extract function calls with a single token pass (see call_matcher)"""
+        if isinstance(code, bytes):
+            code = code.decode('utf-8', errors='replace')
+        if not isinstance(code, str):
             return []
-        
-        # First, get the function name being defined (to exclude it)
-        function_def_pattern = r'^(?:function\s+)?(\w+)\s*\([^)]*\)\s*{'
-        function_name = None
-        function_match = re.search(function_def_pattern, code.strip())
-        if function_match:
-            function_name = function_match.group(1)
-        
-        # print(f"\nAnalyzing function: {function_name}")  # Debug log
-        
-        patterns = [
-            r'(?<!function\s)(?<!class\s)(\w+\.\w+)\s*\([^)]*\)',  # module.method(), instance.method()
-            r'(?<!function\s)(?<!class\s)(?<!\.)\b(\w+)\s*\([^)]*\)'  # standalone function calls
-        ]
-        
-        calls = set()
-        for pattern in patterns:
-            matches = re.finditer(pattern, code)
-            for match in matches:
-                call_name = match.group(1)
-                # print(f"Found function call: {call_name}")  # Debug log
-                # Don't include the function name itself
-                if call_name != function_name:
-                    calls.add(call_name)
-                    # print(f"Added to calls: {call_name}")  # Debug log
-        
-        # print(f"Final calls for {function_name}: {list(calls)}\n")  # Debug log
-        return list(calls)
+
+        return extract_calls(code)
 
     def _match_with_known_calls(self, extracted_calls, file_node, source_type="function"):
         """Match extracted calls with same-file targets first, then external calls"""
@@ -103,6 +115,8 @@ class FunctionCallAnalyzer:
 
     def _analyze_with_llm(self, source_data, target_data, call_info):
         """Use LLM to determine exact target function/method"""
+        from langchain.schema import HumanMessage
+
         prompt = {
             "source_imports": source_data["raw_imports"],
             "source_imported_functions": source_data["imported_functions"],
@@ -223,50 +237,27 @@ class FunctionCallAnalyzer:
             }
 
     def _create_call_relationship(self, source_info, target_info):
-        """Create CALLS relationship between any combination of Function/Method nodes"""
-        with self.driver.session() as session:
-            if source_info["type"] == "function":
-                source_match = """
-                MATCH (source:Function {name: $source_name, file_path: $source_path})
-                """
-            else:
-                source_match = """
-                MATCH (sourceClass:Class {name: $source_class_name})
-                -[:CONTAINS_METHOD]->(source:Method {name: $source_name})
-                WHERE sourceClass.file_path = $source_path
-                """
-            
-            if target_info["type"] == "function":
-                target_match = """
-                MATCH (target:Function {name: $target_name})
-                WHERE target.file_path = $target_path
-                """
-            else:
-                target_match = """
-                MATCH (targetClass:Class {name: $target_class_name})
-                -[:CONTAINS_METHOD]->(target:Method {name: $target_name})
-                WHERE targetClass.file_path = $target_path
-                """
-
-            cypher = f"""
-            {source_match}
-            {target_match}
-            MERGE (source)-[:CALLS]->(target)
-            """
-            
-            params = {
-                "source_name": source_info["name"],
-                "source_path": source_info["file_path"],
-                "source_class_name": source_info.get("class_name"),
-                "target_name": target_info["name"],
-                "target_class_name": target_info.get("class_name"),
-                "target_path": target_info.get("target_path")
-            }
-            
-            # print("Debug - Cypher Query:", cypher)
-            # print("Debug - Query Params:", params)
-            
-            session.run(cypher, params)
+        """Queue a CALLS relationship between any combination of Function/Method nodes"""
+        source_kind = "function" if source_info["type"] == "function" else "method"
+        target_kind = "function" if target_info["type"] == "function" else "method"
+        self.call_writers[(source_kind, target_kind)].add({
+            "source_key": source_info["key"],
+            "target_name": target_info["name"],
+            "target_class_name": target_info.get("class_name"),
+            "target_path": target_info.get("target_path")
+        })
+
+    def flush(self):
+        """Write the queued CALLS relationships and print the write throughput"""
+        for writer in self.call_writers.values():
+            writer.flush()
+            if writer.written:
+                writer.report()
+        print(f"Target file cache: {self.target_files.stats()}")
+
+    def close(self):
+        """Write the queued CALLS relationships (the driver is closed by its owner)"""
+        self.flush()
 
     def process_method_calls(self, method_node, class_node, file_node):
         """Process all calls within a method and create relationships"""
@@ -287,9 +278,11 @@ class FunctionCallAnalyzer:
             file_node, 
             source_type="method"
         )
+        self._prefetch_targets(matched_calls)
         
         source_info = {
             "type": "method",
+            "key": method_node["key"],
             "name": method_node["name"],
             "class_name": class_node["class_name"],
             "file_path": file_node["path"]
@@ -326,12 +319,14 @@ class FunctionCallAnalyzer:
         
         # Match with same-file functions first, then known external calls
         matched_calls = self._match_with_known_calls(extracted_calls, file_node)
+        self._prefetch_targets(matched_calls)
         # print('--------------------------------')
         # print(f"Debug - matched_calls: {matched_calls}")
         # print('--------------------------------')
         
         source_info = {
             "type": "function",
+            "key": function_node["key"],
             "name": function_node["name"],
             "file_path": file_node["path"]
         }
@@ -368,25 +363,36 @@ class FunctionCallAnalyzer:
                     target_info["target_path"] = call["path"]  # Add target path here!
                     self._create_call_relationship(source_info, target_info)
 
+    def _prefetch_targets(self, matched_calls):
+        """Fetch the uncached target files of external calls with one query"""
+        self.target_files.prefetch(call["path"] for call in matched_calls if not call.get("is_same_file"))
+
     def _get_target_file_node(self, path):
-        """get target node with file path"""
+        """get target file metadata with file path (see target_file_cache)"""
+        return self.target_files.get(path)
+
+    def process_files(self, paths):
+        """Process the calls of every function defined in the files with the given paths"""
         with self.driver.session() as session:
-            # Try exact path first
-            result = session.run(
-                "MATCH (f:File {path: $path}) RETURN f",
-                path=path
-            )
-            record = result.single()
-
-            return record["f"] if record else None
-
-def test_analyzer(neo4j_uri, neo4j_user, neo4j_password, openai_api_key):
-    """Process all functions and methods in the graph"""
-    driver = GraphDatabase.driver(
-        neo4j_uri, 
-        auth=(neo4j_user, neo4j_password)
-    )
-    
+            function_result = list(session.run("""
+            MATCH (func:Function)<-[:CONTAINS_FUNCTION]-(file:File)
+            WHERE file.path IN $paths
+            RETURN func, file
+            """, paths=paths))
+
+        for record in function_result:
+            self.process_function_calls(record["func"], record["file"])
+        self.flush()
+
+def test_analyzer(openai_api_key, driver=None):
+    """Process all functions and methods in the graph
+    Args:
+        openai_api_key: API key of the LLM used to resolve external calls
+        driver: Neo4j driver (default: the driver shared by every stage, see driver_provider)
+    """
+    from driver_provider import get_driver
+
+    driver = driver or get_driver()
     analyzer = FunctionCallAnalyzer(driver, openai_api_key)
     
     with driver.session() as session:
@@ -417,14 +423,13 @@ def test_analyzer(neo4j_uri, neo4j_user, neo4j_password, openai_api_key):
         #     # print(f"Processing method: {method_node['name']} in class {class_node['name']} in {file_node['path']}")
         #     analyzer.process_method_calls(method_node, class_node, file_node)
     
-    driver.close()
+    analyzer.close()
 
 if __name__ == "__main__":
     import os
-    
-    NEO4J_URI = "bolt://host.docker.internal:7687"
-    NEO4J_USER = "neo4j"
-    NEO4J_PASSWORD = "Shubh@123"
+    from driver_provider import close_driver
+
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     
-    test_analyzer(NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD, OPENAI_API_KEY)
+    test_analyzer(OPENAI_API_KEY)
+    close_driver(report=True)
@@ -1,19 +1,68 @@
-from neo4j import GraphDatabase
 from ast_helper import ASTHelper
-import os
-from dotenv import load_dotenv
+from graph_schema import definition_key
+from driver_provider import get_driver
+import time
 import json
 
+# Definitions of a group of files, written in one transaction with one statement per kind.
+# Nodes are merged on their key (see graph_schema.definition_key), never on their code.
+FUNCTION_WRITE_QUERY = """
+UNWIND $rows AS row
+MATCH (f:File {path: row.file_path})
+MERGE (func:Function {key: row.key})
+SET func.name = row.name,
+    func.code = row.code,
+    func.file_path = row.file_path,
+    func.start_line = row.start_line
+MERGE (f)-[:CONTAINS_FUNCTION]->(func)
+"""
+
+CLASS_WRITE_QUERY = """
+UNWIND $rows AS row
+MATCH (f:File {path: row.file_path})
+MERGE (c:Class {key: row.key})
+SET c.name = row.name,
+    c.code = row.code,
+    c.file_path = row.file_path,
+    c.start_line = row.start_line
+MERGE (f)-[:CONTAINS_CLASS]->(c)
+"""
+
+# Runs after CLASS_WRITE_QUERY in the same transaction, so the classes exist
+METHOD_WRITE_QUERY = """
+UNWIND $rows AS row
+MATCH (c:Class {key: row.class_key})
+MERGE (m:Method {key: row.key})
+SET m.name = row.name,
+    m.code = row.code,
+    m.file_path = row.file_path,
+    m.class_name = row.class_name,
+    m.start_line = row.start_line
+MERGE (c)-[:CONTAINS_METHOD]->(m)
+"""
+
 class FunctionNodeCreator:
-    def __init__(self):
-        """Initialize the FunctionNodeCreator with Neo4j connection."""
-        # Load Neo4j credentials from .env
-        load_dotenv()
-        self.neo4j_uri = os.getenv('NEO4J_URI')
-        self.neo4j_user = os.getenv('NEO4J_USER')
-        self.neo4j_password = os.getenv('NEO4J_PASSWORD')
-        self.driver = GraphDatabase.driver(self.neo4j_uri, auth=(self.neo4j_user, self.neo4j_password))
+    def __init__(self, files_per_transaction: int = 20, driver=None):
+        """Initialize the FunctionNodeCreator with Neo4j connection.
+
+        Args:
+            files_per_transaction (int): Files whose Function, Class and Method nodes
+                are written together in one transaction
+            driver: Neo4j driver (default: the driver shared by every stage, see driver_provider)
+        """
+        self.driver = driver or get_driver()
         self.ast_helper = ASTHelper()
+        self.files_per_transaction = files_per_transaction
+
+        # Rows of the files not written yet
+        self.pending = {'functions': [], 'classes': [], 'methods': []}
+        self.pending_files = 0
+
+        # Write counters
+        self.files_written = 0
+        self.definitions_written = 0
+        self.transactions = 0
+        self.write_seconds = 0.0
 
     def process_file_nodes(self):
         """Process all File nodes in the database and create Function nodes."""
@@ -24,106 +73,103 @@ class FunctionNodeCreator:
             for record in files:
                 file_node = record['f']
                 self._process_single_file(file_node)
+        self.flush()
+
+    def process_file_paths(self, paths: list):
+        """Create Function, Class and Method nodes for the File nodes with the given paths."""
+        with self.driver.session() as session:
+            files = session.run("MATCH (f:File) WHERE f.path IN $paths RETURN f", paths=paths)
+            
+            for record in list(files):
+                self._process_single_file(record['f'])
+        self.flush()
 
     def _process_single_file(self, file_node):
-        """Process a single file node and create Function, Class, and Method nodes."""
+        """Queue the Function, Class and Method nodes of a file node."""
         file_path = file_node['path']
         
         # Process standalone functions
         function_definitions = json.loads(file_node['function_definitions'])
         for func_def in function_definitions:
-            self._create_function_node(
-                file_path=file_path,
-                function_name=func_def['function_name'],
-                function_code=func_def['function_code']
-            )
+            start_line = func_def.get('start_line')
+            self.pending['functions'].append({
+                'key': definition_key(file_path, func_def['function_name'], start_line),
+                'file_path': file_path,
+                'name': func_def['function_name'],
+                'code': func_def['function_code'],
+                'start_line': start_line
+            })
         
         # Process classes and their methods
         class_definitions = json.loads(file_node['class_definitions'])
         for class_def in class_definitions:
-            # Create class node
-            class_node = self._create_class_node(
-                file_path=file_path,
-                class_name=class_def['class_name'],
-                class_code=class_def['class_code']
-            )
-            
-            # Create method nodes for each method in the class
-            for method in class_def['methods']:
-                self._create_method_node(
-                    file_path=file_path,
-                    method_name=method['method_name'],
-                    method_code=method['method_code'],
-                    class_name=class_def['class_name']
-                )
-
-    def _create_function_node(self, file_path: str, function_name: str, function_code: str):
-        """Create a Function node and relationship to its containing file."""
-        with self.driver.session() as session:
-            cypher_query = """
-            MATCH (f:File {path: $file_path})
-            MERGE (func:Function {
-                name: $function_name,
-                code: $function_code,
-                file_path: $file_path
+            class_name = class_def['class_name']
+            class_key = definition_key(file_path, class_name, class_def.get('class_start_point'))
+            self.pending['classes'].append({
+                'key': class_key,
+                'file_path': file_path,
+                'name': class_name,
+                'code': class_def['class_code'],
+                'start_line': class_def.get('class_start_point')
             })
-            MERGE (f)-[:CONTAINS_FUNCTION]->(func)
-            """
             
-            session.run(
-                cypher_query,
-                file_path=file_path,
-                function_name=function_name,
-                function_code=function_code
-            )
-
-    def _create_class_node(self, file_path: str, class_name: str, class_code: str):
-        """Create a Class node and relationship to its containing file."""
-        with self.driver.session() as session:
-            cypher_query = """
-            MATCH (f:File {path: $file_path})
-            MERGE (c:Class {
-                name: $class_name,
-                code: $class_code,
-                file_path: $file_path
-            })
-            MERGE (f)-[:CONTAINS_CLASS]->(c)
-            """
-            
-            session.run(
-                cypher_query,
-                file_path=file_path,
-                class_name=class_name,
-                class_code=class_code
-            )
-
-    def _create_method_node(self, file_path: str, method_name: str, method_code: str, class_name: str):
-        """Create a Method node and relationship to its containing class."""
+            # Method nodes for each method in the class
+            for method in class_def['methods']:
+                start_line = method.get('method_start_point')
+                self.pending['methods'].append({
+                    'key': definition_key(file_path, f"{class_name}.{method['method_name']}", start_line),
+                    'class_key': class_key,
+                    'file_path': file_path,
+                    'name': method['method_name'],
+                    'code': method['method_code'],
+                    'class_name': class_name,
+                    'start_line': start_line
+                })
+
+        self.pending_files += 1
+        if self.pending_files >= self.files_per_transaction:
+            self._write_pending()
+
+    def _write_pending(self):
+        """Write the queued definitions and their CONTAINS_* edges in one transaction."""
+        if not self.pending_files:
+            return
+        pending, files = self.pending, self.pending_files
+        self.pending = {'functions': [], 'classes': [], 'methods': []}
+        self.pending_files = 0
+
+        start = time.perf_counter()
         with self.driver.session() as session:
-            cypher_query = """
-            MATCH (c:Class {name: $class_name, file_path: $file_path})
-            MERGE (m:Method {
-                name: $method_name,
-                code: $method_code,
-                file_path: $file_path
-            })
-            MERGE (c)-[:CONTAINS_METHOD]->(m)
-            """
-            
-            session.run(
-                cypher_query,
-                file_path=file_path,
-                method_name=method_name,
-                method_code=method_code,
-                class_name=class_name
-            )
+            session.execute_write(self._write_definitions, pending)
+        self.write_seconds += time.perf_counter() - start
+        self.transactions += 1
+        self.files_written += files
+        self.definitions_written += sum(len(rows) for rows in pending.values())
+
+    @staticmethod
+    def _write_definitions(tx, pending):
+        for query, rows in ((FUNCTION_WRITE_QUERY, pending['functions']),
+                            (CLASS_WRITE_QUERY, pending['classes']),
+                            (METHOD_WRITE_QUERY, pending['methods'])):
+            if rows:
+                tx.run(query, rows=rows).consume()
+
+    def flush(self):
+        """Write the queued definitions and print the write throughput."""
+        self._write_pending()
+        per_file_ms = self.write_seconds / self.files_written * 1000 if self.files_written else 0.0
+        print(f"Wrote {self.definitions_written} definitions of {self.files_written} files "
+              f"in {self.transactions} transactions in {self.write_seconds:.2f}s ({per_file_ms:.1f} ms per file)")
 
     def close(self):
-        """Close the Neo4j connection."""
-        self.driver.close()
+        """Write the queued definitions; the driver stays open for the next stage."""
+        self._write_pending()
 
 if __name__ == "__main__":
     # Create and test the FunctionNodeCreator
+    from driver_provider import close_driver
+
     creator = FunctionNodeCreator()
     creator.process_file_nodes()
     creator.close()
+    close_driver(report=True)
@@ -0,0 +1,66 @@
+from typing import List
+
+# Node labels of the definitions contained in File nodes
+DEFINITION_LABELS = ('Function', 'Class', 'Method')
+
+
+def _schema_statements() -> List[str]:
+    statements = [
+        "CREATE CONSTRAINT file_path IF NOT EXISTS FOR (f:File) REQUIRE f.path IS UNIQUE"
+    ]
+    for label in DEFINITION_LABELS:
+        name = label.lower()
+        statements += [
+            # Identity of the node (see definition_key), used by MERGE and by CALLS sources
+            f"CREATE CONSTRAINT {name}_key IF NOT EXISTS FOR (n:{label}) REQUIRE n.key IS UNIQUE",
+            # Call targets, resolved by file and name
+            f"CREATE INDEX {name}_file_name IF NOT EXISTS FOR (n:{label}) ON (n.file_path, n.name)",
+            # Re-indexing deletes every definition of a file
+            f"CREATE INDEX {name}_file IF NOT EXISTS FOR (n:{label}) ON (n.file_path)",
+        ]
+    return statements
+
+
+SCHEMA_STATEMENTS = _schema_statements()
+
+
+def definition_key(file_path: str, qualified_name: str, start_line) -> str:
+    """
+    Identity of a Function, Class or Method node
+    Args:
+        file_path: Stored path of the file defining it
+        qualified_name: 'name' for functions and classes, 'Class.method' for methods
+        start_line: First line of the definition (1-based)
+    Returns:
+        'path#qualified_name@line', unique per definition and far shorter than its code
+    """
+    return f'{file_path}#{qualified_name}@{start_line}'
+
+
+def ensure_schema(driver):
+    """
+    Create the constraints and indexes the pipeline looks nodes up with
+    Args:
+        driver: Neo4j driver
+    Returns:
+        Number of statements that failed (e.g. a constraint over existing duplicates)
+    """
+    failed = 0
+    with driver.session() as session:
+        for statement in SCHEMA_STATEMENTS:
+            try:
+                session.run(statement).consume()
+            except Exception as e:
+                failed += 1
+                print(f"Schema statement failed: {statement}: {e}")
+        # New indexes are populated in the background
+        session.run("CALL db.awaitIndexes()").consume()
+    print(f"Schema ready: {len(SCHEMA_STATEMENTS) - failed}/{len(SCHEMA_STATEMENTS)} constraints and indexes")
+    return failed
+
+
+if __name__ == "__main__":
+    from driver_provider import get_driver, close_driver
+
+    ensure_schema(get_driver())
+    close_driver()
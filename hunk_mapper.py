@@ -0,0 +1,244 @@
+import os
+import re
+import logging
+from typing import Callable, Dict, List, Optional
+from ast_helper import ASTHelper
+from extraction_visitor import FUNCTION_SCOPE_TYPES, function_name, named_scope
+from python_extractor import PythonExtractionVisitor
+from repo_walker import EXTENSION_LANGUAGES
+
+logger = logging.getLogger(__name__)
+
+HUNK_HEADER = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+def parse_hunk(hunk: str) -> Optional[Dict]:
+    """
+    Parse a single hunk into its header and changed line range
+    Args:
+        hunk: Hunk text starting with its @@ header
+    Returns:
+        Dictionary with the header, the 1-based new-file start/count and the first and
+        last changed lines of the new file, or None if the header is missing
+    """
+    lines = hunk.split('\n')
+    while lines and not lines[0].startswith('@@'):
+        lines.pop(0)
+    if not lines:
+        return None
+
+    header = HUNK_HEADER.match(lines[0])
+    if not header:
+        return None
+
+    new_start = int(header.group(3))
+    new_count = int(header.group(4)) if header.group(4) is not None else 1
+    changed = []
+    line_number = new_start
+    for line in lines[1:]:
+        if line.startswith('+'):
+            changed.append(line_number)
+            line_number += 1
+        elif line.startswith('-'):
+            # A deletion is anchored on the line that now follows it
+            changed.append(line_number)
+        elif line.startswith('\\'):
+            continue
+        else:
+            line_number += 1
+
+    if not changed:
+        changed = [new_start, max(new_start, new_start + new_count - 1)]
+
+    return {
+        'header': lines[0],
+        'new_start': new_start,
+        'new_count': new_count,
+        'start_line': min(changed),
+        'end_line': max(changed)
+    }
+
+
+def parse_unified_diff(diff: str) -> List[Dict]:
+    """
+    Split a multi-file unified diff into files and hunks
+    Args:
+        diff: Unified diff text (e.g. git diff output)
+    Returns:
+        List of {'old_path', 'new_path', 'hunks'} dictionaries, hunks as raw text
+    """
+    files = []
+    current = None
+    hunk = None
+    remaining_old = remaining_new = 0
+
+    for line in diff.split('\n'):
+        # Inside a hunk body the header counts tell where it ends
+        if remaining_old > 0 or remaining_new > 0:
+            hunk.append(line)
+            if line.startswith('+'):
+                remaining_new -= 1
+            elif line.startswith('-'):
+                remaining_old -= 1
+            elif not line.startswith('\\'):
+                remaining_old -= 1
+                remaining_new -= 1
+            continue
+
+        if line.startswith('\\') and hunk is not None:
+            hunk.append(line)
+        elif line.startswith('diff --git'):
+            current = {'old_path': None, 'new_path': None, 'hunks': []}
+            files.append(current)
+            hunk = None
+        elif line.startswith('--- '):
+            if current is None or current['hunks']:
+                current = {'old_path': None, 'new_path': None, 'hunks': []}
+                files.append(current)
+            current['old_path'] = _diff_path(line[4:])
+            hunk = None
+        elif line.startswith('+++ ') and current is not None:
+            current['new_path'] = _diff_path(line[4:])
+        else:
+            header = HUNK_HEADER.match(line)
+            if header and current is not None:
+                hunk = [line]
+                current['hunks'].append(hunk)
+                remaining_old = int(header.group(2)) if header.group(2) is not None else 1
+                remaining_new = int(header.group(4)) if header.group(4) is not None else 1
+
+    for file_diff in files:
+        file_diff['hunks'] = ['\n'.join(lines) for lines in file_diff['hunks']]
+    return [f for f in files if f['hunks']]
+
+
+def _diff_path(path: str) -> Optional[str]:
+    path = path.split('\t')[0].strip()
+    if path == '/dev/null':
+        return None
+    if path.startswith(('a/', 'b/')):
+        return path[2:]
+    return path
+
+
+class HunkFunctionMapper:
+    """Map every hunk of a unified diff to its enclosing function or method.
+
+    Each file touched by the diff is parsed once, with the grammar of its extension (see
+    repo_walker.EXTENSION_LANGUAGES). Hunks are located by the line numbers in their
+    headers and resolved through the cached function line index and the parent links
+    of the compact AST, instead of searching node text. Python modules are extracted
+    with the stdlib ast module (see python_extractor.py) and hunks are resolved against
+    their function definitions.
+    """
+
+    def __init__(self, ast_helper: ASTHelper = None, language: str = None):
+        """
+        Args:
+            ast_helper: Helper whose cached indexes are used
+            language: Language of every file of the diff; by default it is chosen per
+                file from its extension, and files of other languages are not parsed
+        """
+        self.ast_helper = ast_helper or ASTHelper()
+        self.language = language
+
+    def map_diff(self, diff: str, repo_path: str = '.', read_source: Callable[[str], str] = None) -> List[Dict]:
+        """
+        Map all hunks of a diff to their enclosing functions in one call
+        Args:
+            diff: Unified diff across any number of files
+            repo_path: Root the diff paths are relative to (post-image read from disk)
+            read_source: Optional callable returning the new content of a diff path
+        Returns:
+            One result per hunk with the file, hunk header, changed line range (1-based),
+            the enclosing function node (its function definition for Python) and its
+            name (None outside any function or if the file could not be parsed)
+        """
+        if read_source is None:
+            def read_source(path):
+                with open(os.path.join(repo_path, path), 'r', encoding='utf-8') as f:
+                    return f.read()
+
+        results = []
+        for file_diff in parse_unified_diff(diff):
+            path = file_diff['new_path']
+            language = self.language or EXTENSION_LANGUAGES.get(os.path.splitext(path or '')[1])
+            ast = None
+            definitions = []
+            if path is not None and language is not None:
+                try:
+                    source = read_source(path)
+                    if language == 'python':
+                        definitions = PythonExtractionVisitor(lambda module, level: None).extract(
+                            source, path).function_definitions
+                    else:
+                        ast = self.ast_helper.get_ast(source, 'tsx' if path.endswith('.tsx') else language)
+                except Exception as e:
+                    logger.error(f"Failed to parse {path}: {e}")
+
+            for hunk in file_diff['hunks']:
+                if language == 'python':
+                    result = self.map_python_hunk(definitions, hunk)
+                else:
+                    result = self.map_hunk(ast, hunk)
+                result['file'] = path or file_diff['old_path']
+                results.append(result)
+
+        return results
+
+    def map_hunk(self, ast, hunk: str) -> Dict:
+        """
+        Map one hunk to its enclosing function in an already parsed file
+        Args:
+            ast: AST of the new file content (None for deleted files)
+            hunk: Hunk text starting with its @@ header
+        Returns:
+            Result dictionary as described in map_diff
+        """
+        parsed = parse_hunk(hunk) or {'header': None, 'start_line': None, 'end_line': None}
+        function_node = None
+        if ast and parsed['start_line'] is not None:
+            function_node = self.enclosing_function(ast, parsed['start_line'] - 1, parsed['end_line'] - 1)
+
+        return {
+            'hunk': parsed['header'],
+            'start_line': parsed['start_line'],
+            'end_line': parsed['end_line'],
+            'function': function_node,
+            'function_name': function_name(function_node) if function_node else None
+        }
+
+    def map_python_hunk(self, definitions: List[Dict], hunk: str) -> Dict:
+        """
+        Map one hunk to its innermost enclosing function in an extracted Python module
+        Args:
+            definitions: function_definitions of the new module (see python_extractor.py)
+            hunk: Hunk text starting with its @@ header
+        Returns:
+            Result dictionary as described in map_diff
+        """
+        parsed = parse_hunk(hunk) or {'header': None, 'start_line': None, 'end_line': None}
+        definition = None
+        if parsed['start_line'] is not None:
+            covering = [d for d in definitions
+                        if d['start_line'] <= parsed['start_line'] and d['end_line'] >= parsed['end_line']]
+            definition = min(covering, key=lambda d: d['end_line'] - d['start_line'], default=None)
+
+        return {
+            'hunk': parsed['header'],
+            'start_line': parsed['start_line'],
+            'end_line': parsed['end_line'],
+            'function': definition,
+            'function_name': definition['function_name'] if definition else None
+        }
+
+    def enclosing_function(self, ast, first_row: int, last_row: int):
+        """Innermost named function scope covering the 0-based rows first_row..last_row"""
+        node = self.ast_helper.function_index(ast, FUNCTION_SCOPE_TYPES).find(first_row)
+
+        # Widen through parent links until the whole changed range is covered
+        while node is not None:
+            covers = node.get('start_point')[0] <= first_row and node.get('end_point')[0] >= last_row
+            if covers and node.get('type') in FUNCTION_SCOPE_TYPES and named_scope(node) is not None:
+                return named_scope(node)
+            node = getattr(node, 'parent', None)
+        return None
@@ -0,0 +1,103 @@
+import os
+import sys
+import subprocess
+from typing import Dict, List
+
+# Entry points and stage modules checked by default
+DEFAULT_MODULES = [
+    'main',
+    'incremental_indexer',
+    'file_node_creator',
+    'file_joiner',
+    'function_node_creator',
+    'function_joiner',
+    'ast_extractor',
+    'ast_helper',
+    'extraction_visitor',
+    'query_extractor',
+]
+
+
+def import_time(module: str, top: int = 3) -> Dict:
+    """
+    Measure the cold import time of a module in a fresh interpreter
+    Args:
+        module: Module name, importable from this directory
+        top: Number of heaviest direct dependencies to report
+    Returns:
+        Dictionary with the module, its cumulative import time in ms (None if the
+        import failed), its heaviest direct imports and the error, if any
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True
+    )
+
+    total_ms = None
+    dependencies = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        ms = int(cumulative) / 1000
+        # Children are listed before their parent, so the direct imports of the
+        # module are the depth-1 lines since the previous top-level import
+        if depth == 0:
+            if name.strip() == module:
+                total_ms = ms
+                break
+            dependencies = []
+        elif depth == 1:
+            dependencies.append((name.strip(), ms))
+
+    error = None
+    if result.returncode != 0:
+        total_ms = None
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import failed'
+
+    return {
+        'module': module,
+        'ms': total_ms,
+        'dependencies': sorted(dependencies, key=lambda dep: -dep[1])[:top],
+        'error': error
+    }
+
+
+def report(modules: List[str] = None, budget_ms: float = None) -> List[Dict]:
+    """
+    Print the per-module import time report
+    Args:
+        modules: Modules to measure (default: DEFAULT_MODULES)
+        budget_ms: Optional per-module budget; modules above it are flagged
+    Returns:
+        The measurements, each with an 'over_budget' flag
+    """
+    results = []
+    print(f"{'module':<24} {'ms':>9}  heaviest imports")
+    for module in modules or DEFAULT_MODULES:
+        timing = import_time(module)
+        timing['over_budget'] = budget_ms is not None and timing['ms'] is not None and timing['ms'] > budget_ms
+        results.append(timing)
+
+        if timing['error']:
+            print(f"{module:<24} {'error':>9}  {timing['error']}")
+            continue
+        heaviest = ', '.join(f"{name} {ms:.1f}" for name, ms in timing['dependencies'])
+        flag = '  OVER BUDGET' if timing['over_budget'] else ''
+        print(f"{module:<24} {timing['ms']:>9.1f}  {heaviest}{flag}")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Report the cold import time of each module')
+    parser.add_argument('modules', nargs='*', help='Modules to measure (default: entry points and stages)')
+    parser.add_argument('--budget-ms', type=float, help='Fail if a module takes longer than this to import')
+    args = parser.parse_args()
+
+    results = report(args.modules, args.budget_ms)
+    if any(timing['over_budget'] for timing in results):
+        sys.exit(1)
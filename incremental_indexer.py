@@ -0,0 +1,198 @@
+import os
+import subprocess
+from typing import Dict, List
+from extraction_cache import ExtractionCache
+from call_index import CallIndex
+from repo_walker import EXTENSION_LANGUAGES
+from graph_schema import DEFINITION_LABELS, ensure_schema
+
+
+class IncrementalIndexer:
+    """Re-index only the files changed between two git revisions.
+
+    The working tree must be checked out at the head revision, since changed files
+    are re-extracted from disk. The pipeline stages run only on the changed files:
+    their File/Function/Class/Method nodes are replaced, IMPORTS edges touching them
+    are rebuilt, and CALLS edges are re-analyzed for the changed files and for the
+    files importing them.
+    """
+
+    def __init__(self, repo_path: str, remove: str = '/app/test/', languages: List[str] = None,
+                 cache: ExtractionCache = None, call_index: CallIndex = None, openai_api_key: str = None):
+        """
+        Args:
+            repo_path: Root of the git repository being indexed
+            remove: Path prefix removed from stored file paths (same as FileNodeCreator)
+            languages: Languages re-indexed (default: every language of repo_walker.LANGUAGE_EXTENSIONS)
+            cache: Optional extraction cache shared with full runs
+            call_index: Optional call index updated for the changed files
+            openai_api_key: API key passed to the FunctionCallAnalyzer
+        """
+        self.repo_path = os.path.abspath(repo_path)
+        self.remove = remove
+        self.extensions = {
+            extension: language for extension, language in EXTENSION_LANGUAGES.items()
+            if languages is None or language in languages
+        }
+        self.cache = cache
+        self.call_index = call_index
+        self.openai_api_key = openai_api_key
+
+    def changed_files(self, base_rev: str, head_rev: str = 'HEAD') -> Dict[str, List[str]]:
+        """
+        Classify the source files changed between two revisions
+        Args:
+            base_rev: Revision the graph was last indexed at
+            head_rev: Revision to index
+        Returns:
+            Dictionary with absolute 'added', 'modified' and 'deleted' file paths
+        """
+        output = subprocess.run(
+            ['git', 'diff', '--name-status', '-M', base_rev, head_rev],
+            cwd=self.repo_path, capture_output=True, text=True, check=True
+        ).stdout
+
+        changes = {'added': [], 'modified': [], 'deleted': []}
+        for line in output.splitlines():
+            parts = line.split('\t')
+            status = parts[0][:1]
+            if status == 'R':
+                # Renames are a delete of the old path plus an add of the new one
+                self._add_change(changes, 'deleted', parts[1])
+                self._add_change(changes, 'added', parts[2])
+            elif status in ('A', 'C'):
+                self._add_change(changes, 'added', parts[-1])
+            elif status == 'D':
+                self._add_change(changes, 'deleted', parts[1])
+            elif status in ('M', 'T'):
+                self._add_change(changes, 'modified', parts[1])
+        return changes
+
+    def _add_change(self, changes: Dict[str, List[str]], kind: str, relative_path: str):
+        if os.path.splitext(relative_path)[1] in self.extensions:
+            changes[kind].append(os.path.join(self.repo_path, relative_path))
+
+    def group_by_language(self, file_paths: List[str]) -> Dict[str, List[str]]:
+        """Changed files grouped by language, like RepoWalker.collect"""
+        files = {}
+        for file_path in file_paths:
+            files.setdefault(self.extensions[os.path.splitext(file_path)[1]], []).append(file_path)
+        return files
+
+    def stored_path(self, file_path: str) -> str:
+        """Path under which FileNodeCreator stores a file"""
+        return file_path.replace(self.remove, '')
+
+    def _delete_file_nodes(self, session, paths: List[str]):
+        """Delete File nodes and the definitions they contain"""
+        # One statement per label, so each is a file_path index seek
+        for label in DEFINITION_LABELS:
+            session.run(f"""
+            MATCH (n:{label})
+            WHERE n.file_path IN $paths
+            DETACH DELETE n
+            """, paths=paths)
+        session.run("""
+        MATCH (f:File)
+        WHERE f.path IN $paths
+        DETACH DELETE f
+        """, paths=paths)
+
+    def index(self, base_rev: str, head_rev: str = 'HEAD', workers: int = 1) -> Dict[str, List[str]]:
+        """
+        Apply the changes between two revisions to the graph
+        Args:
+            base_rev: Revision the graph was last indexed at
+            head_rev: Revision checked out in the working tree
+            workers: Worker processes used for re-extraction
+        Returns:
+            The classified changes
+        """
+        changes = self.changed_files(base_rev, head_rev)
+        updated = changes['added'] + changes['modified']
+        stale_paths = [self.stored_path(p) for p in changes['modified'] + changes['deleted']]
+        updated_paths = [self.stored_path(p) for p in updated]
+        print(f"Incremental index {base_rev}..{head_rev}: "
+              f"{len(changes['added'])} added, {len(changes['modified'])} modified, {len(changes['deleted'])} deleted")
+
+        if not updated and not stale_paths:
+            return changes
+
+        # Stage modules are only loaded when there is something to re-index
+        from driver_provider import get_driver, close_driver
+        from file_node_creator import FileNodeCreator
+        from file_joiner import FileJoiner
+        from function_node_creator import FunctionNodeCreator
+        from function_joiner import FunctionCallAnalyzer
+
+        if self.call_index is not None:
+            for path in changes['deleted']:
+                self.call_index.remove_file(self.stored_path(path))
+
+        try:
+            files_by_language = self.group_by_language(updated)
+            file_creator = FileNodeCreator(language=next(iter(files_by_language), 'javascript'), remove=self.remove,
+                                           cache=self.cache, call_index=self.call_index)
+            try:
+                ensure_schema(file_creator.driver)
+                with file_creator.driver.session() as session:
+                    # Importers of removed files lose their CALLS edges with the deleted nodes
+                    dependents = [record['path'] for record in session.run("""
+                    MATCH (source:File)-[:IMPORTS]->(target:File)
+                    WHERE target.path IN $paths
+                    RETURN DISTINCT source.path AS path
+                    """, paths=stale_paths)]
+                    self._delete_file_nodes(session, stale_paths)
+
+                # Step 1: File nodes, each language by its own creator as in process_repository
+                for language, file_paths in files_by_language.items():
+                    file_creator._for_language(language).process_files(file_paths, self.remove, workers)
+            finally:
+                file_creator.close()
+
+            # Step 2: IMPORTS relationships in both directions
+            file_joiner = FileJoiner()
+            try:
+                dependents.extend(file_joiner.create_import_relationships_for(updated_paths))
+            finally:
+                file_joiner.close()
+
+            # Step 3: Function, Class and Method nodes
+            function_creator = FunctionNodeCreator()
+            try:
+                function_creator.process_file_paths(updated_paths)
+            finally:
+                function_creator.close()
+
+            # Step 4: CALLS relationships from changed files and their importers
+            affected_paths = sorted((set(dependents) - set(stale_paths)) | set(updated_paths))
+            analyzer = FunctionCallAnalyzer(get_driver(), self.openai_api_key)
+            analyzer.process_files(affected_paths)
+        finally:
+            # Every stage used the same driver
+            close_driver(report=True)
+
+        return changes
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Incrementally re-index files changed between two git revisions')
+    parser.add_argument('repo_path', help='Path to the git repository')
+    parser.add_argument('base_rev', help='Revision the graph was last indexed at')
+    parser.add_argument('head_rev', nargs='?', default='HEAD', help='Revision checked out in the working tree')
+    parser.add_argument('--remove', default='/app/test/', help='Path prefix removed from stored file paths')
+    parser.add_argument('--languages', nargs='+', help='Languages re-indexed (default: all)')
+    parser.add_argument('--workers', type=int, default=1, help='Worker processes used for re-extraction')
+    args = parser.parse_args()
+
+    indexer = IncrementalIndexer(
+        args.repo_path,
+        remove=args.remove,
+        languages=args.languages,
+        cache=ExtractionCache(),
+        call_index=CallIndex('call_index.json'),
+        openai_api_key=os.getenv("OPENAI_API_KEY")
+    )
+    indexer.index(args.base_rev, args.head_rev, workers=args.workers)
@@ -0,0 +1,60 @@
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional
+from extraction_visitor import walk_ast
+
+
+class FunctionIntervalIndex:
+    """Line-range index answering "innermost function containing line L" in O(log n).
+
+    Function line ranges nest (or at worst touch on a shared line), so they are
+    flattened once into sorted, non-overlapping segments, each owned by the innermost
+    function covering it. A lookup is then a single binary search over segment starts.
+    Lines are 0-based, like the ``start_point`` rows of the AST.
+    """
+
+    def __init__(self, ast, node_types: Iterable[str]):
+        """
+        Args:
+            ast: AST root (CompactNode or dict)
+            node_types: Node types treated as functions
+        """
+        node_types = set(node_types)
+        self.starts: List[int] = []
+        self.owners: List[Optional[dict]] = []
+
+        # Pre-order yields intervals sorted by start line, outer before inner
+        stack = []
+        for node in walk_ast(ast):
+            if node.get('type') not in node_types:
+                continue
+            start = node.get('start_point', [0])[0]
+            end = node.get('end_point', [0])[0]
+            self._close_before(stack, start)
+            stack.append((end, node))
+            self._emit(start, node)
+        self._close_before(stack, float('inf'))
+
+    def _emit(self, line: int, owner):
+        if self.starts and self.starts[-1] == line:
+            self.owners[-1] = owner
+        else:
+            self.starts.append(line)
+            self.owners.append(owner)
+
+    def _close_before(self, stack: list, line):
+        """Close every open interval ending before ``line``."""
+        while stack and stack[-1][0] < line:
+            end, _ = stack.pop()
+            # Drop enclosing entries that already ended under the one just closed
+            while stack and stack[-1][0] <= end:
+                stack.pop()
+            self._emit(end + 1, stack[-1][1] if stack else None)
+
+    def find(self, line: int):
+        """Innermost function node containing a line, or None"""
+        position = bisect_right(self.starts, line) - 1
+        return self.owners[position] if position >= 0 else None
+
+    def find_many(self, lines: Iterable[int]) -> Dict[int, Optional[dict]]:
+        """Innermost function node for each of many lines"""
+        return {line: self.find(line) for line in lines}
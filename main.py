@@ -1,32 +1,48 @@
 import os
-from file_node_creator import FileNodeCreator
-from file_joiner import FileJoiner
-from function_node_creator import FunctionNodeCreator
-from function_joiner import FunctionCallAnalyzer
+
+# Each stage module (and its heavy dependencies: tree-sitter, neo4j, langchain)
+# is imported only when that stage runs. See import_report.py.
 
 def main():
     try:
         # Step 1: Create File nodes with metadata
         print("Step 1: Creating File nodes...")
-        file_creator = FileNodeCreator(language='javascript')
+        from file_node_creator import FileNodeCreator
+        from extraction_cache import ExtractionCache
+        from call_index import CallIndex
+
+        # Unchanged files are served from the extraction cache of previous runs
+        file_creator = FileNodeCreator(
+            language='javascript',
+            cache=ExtractionCache(),
+            call_index=CallIndex('call_index.json')
+        )
         test_project_path = '/app/test/server'
         
         if not os.path.exists(test_project_path):
             print(f"Error: Test project directory not found at {test_project_path}")
             return
+
+        # Constraints and indexes every stage looks nodes up with
+        from graph_schema import ensure_schema
+        ensure_schema(file_creator.driver)
             
-        file_creator.process_codebase(test_project_path)
+        file_creator.process_repository(test_project_path, file_creator.remove)
         file_creator.close()
         print("Successfully created File nodes!")
 
         # Step 2: Create IMPORTS relationships between files
         print("\nStep 2: Creating import relationships...")
+        from file_joiner import FileJoiner
+
         file_joiner = FileJoiner()
         file_joiner.process()
         print("Successfully created import relationships!")
 
         # Step 3: Create Function nodes and relationships
         print("\nStep 3: Creating Function nodes...")
+        from function_node_creator import FunctionNodeCreator
+
         function_creator = FunctionNodeCreator()
         function_creator.process_file_nodes()
         function_creator.close()
@@ -34,22 +50,19 @@ def main():
 
         # Step 4: Create CALLS relationships between functions
         print("\nStep 4: Creating function call relationships...")
-        NEO4J_URI = "bolt://host.docker.internal:7687"
-        NEO4J_USER = "neo4j"
-        NEO4J_PASSWORD = "Shubh@123"
+        from function_joiner import test_analyzer
+
         OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
         
-        function_analyzer = FunctionCallAnalyzer(
-            neo4j_uri=NEO4J_URI,
-            neo4j_user=NEO4J_USER,
-            neo4j_password=NEO4J_PASSWORD,
-            openai_api_key=OPENAI_API_KEY
-        )
-        function_analyzer.process_all_functions()
+        test_analyzer(OPENAI_API_KEY)
         print("Successfully created function call relationships!")
 
     except Exception as e:
         print(f"Error in processing: {str(e)}")
+    finally:
+        # Every stage shares one driver, kept warm until the pipeline ends
+        from driver_provider import close_driver
+        close_driver(report=True)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,182 @@
+import os
+import glob
+import hashlib
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# tree_sitter itself is imported on first use, so runs served from the
+# extraction cache never load it
+
+# Directory holding the prebuilt grammar bundle
+BUNDLE_DIR = os.getenv('TREE_SITTER_BUNDLE_DIR', 'build')
+
+# Grammars compiled into the bundle from local sources. code_ast (which imports
+# requests and GitPython, and may clone a grammar at runtime) is only a fallback
+# when neither the sources nor a prebuilt bundle provide a grammar
+GRAMMAR_SOURCES = {
+    'javascript': 'tree-sitter-javascript',
+    'python': 'tree-sitter-python',
+    'typescript': 'tree-sitter-typescript/typescript',
+    'tsx': 'tree-sitter-typescript/tsx',
+}
+
+_languages = {}
+_languages_lock = threading.Lock()
+_local = threading.local()
+_bundle_path = None
+
+
+def bundle_path() -> str:
+    """
+    Versioned path of the grammar bundle
+    Returns:
+        Path under BUNDLE_DIR named after a digest of the contents of the grammar
+        sources, so a bundle is only rebuilt when a source file changes (not when a
+        checkout or a fresh clone touches their mtimes). The digest is computed once
+        per process
+    """
+    global _bundle_path
+    if _bundle_path is not None:
+        return _bundle_path
+
+    digest = hashlib.sha256()
+    for name, source_dir in sorted(_available_sources().items()):
+        digest.update(name.encode('utf-8'))
+        src_dir = os.path.join(source_dir, 'src')
+        for path in sorted(glob.glob(os.path.join(src_dir, '**', '*.[ch]*'), recursive=True)):
+            digest.update(os.path.relpath(path, src_dir).encode('utf-8') + b'\0')
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+            digest.update(b'\0')
+    _bundle_path = os.path.join(BUNDLE_DIR, f'languages-{digest.hexdigest()[:16]}.so')
+    return _bundle_path
+
+
+def _available_sources():
+    return {name: source_dir for name, source_dir in GRAMMAR_SOURCES.items() if os.path.isdir(source_dir)}
+
+
+def _ensure_bundle() -> str:
+    path = bundle_path()
+    if os.path.isfile(path):
+        return path
+
+    sources = list(_available_sources().values())
+    if not sources:
+        # Deployments may ship the prebuilt bundle without the grammar sources
+        prebuilt = sorted(glob.glob(os.path.join(BUNDLE_DIR, 'languages-*.so')), key=os.path.getmtime)
+        if prebuilt:
+            return prebuilt[-1]
+        raise FileNotFoundError(f"No grammar sources or prebuilt bundle found for {sorted(GRAMMAR_SOURCES)}")
+
+    from tree_sitter import Language
+
+    logger.info(f"Building grammar bundle {path}")
+    os.makedirs(BUNDLE_DIR, exist_ok=True)
+    # Build under a temporary name so concurrent workers never load a partial bundle
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    Language.build_library(tmp_path, sources)
+    os.replace(tmp_path, path)
+
+    for stale in glob.glob(os.path.join(BUNDLE_DIR, 'languages-*.so')):
+        if stale != path:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+    return path
+
+
+def _load_fallback(language: str):
+    """
+    Load a grammar missing from the bundle through code_ast
+    Args:
+        language: tree-sitter language name
+    Returns:
+        The Language. code_ast clones and compiles tree-sitter-<language>, but the
+        typescript and tsx grammars are subdirectories of tree-sitter-typescript: they
+        are compiled from there, in code_ast's cache directory
+    """
+    from code_ast import parsers
+
+    repository, _, subdirectory = GRAMMAR_SOURCES.get(language, '').partition('/')
+    if not subdirectory or parsers.get_language is not None:
+        # Without a subdirectory, or with tree_sitter_languages installed (which
+        # ships every grammar), code_ast finds the grammar itself
+        return parsers.load_language(language)
+
+    from tree_sitter import Language
+
+    cache_path = parsers._path_to_local()
+    compiled_path = os.path.join(cache_path, f'{language}-lang.so')
+    if not os.path.isfile(compiled_path):
+        repository_path = os.path.join(cache_path, repository)
+        if not os.path.isdir(repository_path):
+            from git import Repo
+            Repo.clone_from(f'https://github.com/tree-sitter/{repository}', repository_path)
+        Language.build_library(compiled_path, [os.path.join(repository_path, subdirectory)])
+    return Language(compiled_path, language)
+
+
+def get_language(language: str):
+    """
+    Load a grammar on first use
+    Args:
+        language: tree-sitter language name (e.g. 'javascript', 'typescript')
+    Returns:
+        The Language, loaded once per process
+    """
+    loaded = _languages.get(language)
+    if loaded is not None:
+        return loaded
+
+    with _languages_lock:
+        if language not in _languages:
+            try:
+                from tree_sitter import Language
+                _languages[language] = Language(_ensure_bundle(), language)
+            except (FileNotFoundError, AttributeError) as e:
+                # Missing from the bundle (AttributeError: no tree_sitter_<language> symbol)
+                logger.warning(f"Grammar {language} not in the bundle ({e}), loading it through code_ast")
+                _languages[language] = _load_fallback(language)
+        return _languages[language]
+
+
+def get_parser(language: str):
+    """
+    Get the parser of a language for the calling thread
+    Args:
+        language: tree-sitter language name
+    Returns:
+        A Parser reused by every call from the same thread (and process)
+    """
+    parsers = getattr(_local, 'parsers', None)
+    if parsers is None:
+        parsers = _local.parsers = {}
+
+    parser = parsers.get(language)
+    if parser is None:
+        from tree_sitter import Parser
+        parser = Parser()
+        parser.set_language(get_language(language))
+        parsers[language] = parser
+    return parser
+
+
+def parse(source: str, language: str, syntax_error: str = 'ignore'):
+    """
+    Parse source code with the pooled parser of the calling thread
+    Args:
+        source: Source code
+        language: tree-sitter language name
+        syntax_error: 'raise' raises SyntaxError on ERROR nodes like code_ast.ast, 'ignore' keeps the tree
+    Returns:
+        The tree-sitter Tree
+    """
+    tree = get_parser(language).parse(source.encode('utf-8'))
+    if syntax_error != 'ignore' and tree.root_node.has_error:
+        from code_ast import check_tree_for_errors
+        check_tree_for_errors(tree, mode=syntax_error)
+    return tree
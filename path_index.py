@@ -0,0 +1,115 @@
+from typing import Dict, Iterable, Iterator, List, Optional
+from repo_walker import EXTENSION_LANGUAGES
+
+# Extensions tried after an import path that names no stored file
+EXTENSIONS = tuple(EXTENSION_LANGUAGES)
+
+# Files a directory import resolves to
+INDEX_FILES = tuple('index' + extension for extension in EXTENSIONS if extension != '.py') + ('__init__.py',)
+
+# TypeScript sources are imported with the extension of their compiled output
+COMPILED_EXTENSIONS = {'.js': ('.ts', '.tsx'), '.mjs': ('.mts',), '.cjs': ('.cts',)}
+
+# Key of the suffix trie nodes (otherwise keyed by path segment) holding up to two
+# stored paths ending with the node's suffix
+_PATHS = 0
+
+
+class PathIndex:
+    """In-memory index resolving import paths to the stored paths of File nodes.
+
+    An import path is tried as is, then with each source extension, as a directory
+    with an index file, and with a TypeScript extension in place of a '.js' one;
+    each variant is a set lookup. Other imports fall back to a trie over the reversed
+    path segments: a variant matches a stored path it is a segment-aligned suffix of,
+    and only if the match is unique. An import matching no stored path stays
+    unresolved rather than being linked to an unrelated file.
+    """
+
+    def __init__(self, paths: Iterable[str]):
+        """
+        Args:
+            paths: Stored paths of every File node
+        """
+        self.paths = set()
+        self.trie: Dict = {}
+        for path in paths:
+            self.add(path)
+
+        self.resolved = {'exact': 0, 'variant': 0, 'suffix': 0}
+        self.unresolved = 0
+        self.ambiguous = 0
+
+    def add(self, path: str):
+        """Index a stored path"""
+        self.paths.add(path)
+        node = self.trie
+        for segment in reversed(path.split('/')):
+            node = node.setdefault(segment, {})
+            under = node.setdefault(_PATHS, [])
+            if len(under) < 2:
+                under.append(path)
+
+    def variants(self, import_path: str) -> Iterator[str]:
+        """Candidate stored paths of an import path, most specific first"""
+        yield import_path
+        stem, dot, extension = import_path.rpartition('.')
+        if dot and '/' not in extension:
+            for compiled in COMPILED_EXTENSIONS.get('.' + extension, ()):
+                yield stem + compiled
+        for extension in EXTENSIONS:
+            yield import_path + extension
+        for index_file in INDEX_FILES:
+            yield f'{import_path}/{index_file}'
+
+    def resolve(self, import_path: str) -> Optional[str]:
+        """
+        Resolve an import path
+        Args:
+            import_path: Entry of a File node's imported_paths
+        Returns:
+            The stored path of the imported file, or None if no file (or more than one
+            file, for suffix matches) matches
+        """
+        import_path = import_path.replace('\\', '/').rstrip('/')
+        if import_path in self.paths:
+            self.resolved['exact'] += 1
+            return import_path
+
+        variants = list(self.variants(import_path))
+        for variant in variants[1:]:
+            if variant in self.paths:
+                self.resolved['variant'] += 1
+                return variant
+
+        ambiguous = False
+        for variant in variants:
+            matches = self._suffix_matches(variant)
+            if len(matches) == 1:
+                self.resolved['suffix'] += 1
+                return matches[0]
+            ambiguous = ambiguous or len(matches) > 1
+
+        if ambiguous:
+            self.ambiguous += 1
+        else:
+            self.unresolved += 1
+        return None
+
+    def _suffix_matches(self, path: str) -> List[str]:
+        """Stored paths ending with ``path`` (at most two)"""
+        node = self.trie
+        for segment in reversed(path.strip('/').split('/')):
+            node = node.get(segment)
+            if node is None:
+                return []
+        return node[_PATHS]
+
+    def stats(self) -> Dict[str, int]:
+        """Return the resolution counters."""
+        return {
+            'files': len(self.paths),
+            **self.resolved,
+            'unresolved': self.unresolved,
+            'ambiguous': self.ambiguous
+        }
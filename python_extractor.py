@@ -0,0 +1,349 @@
+import ast
+from typing import Callable, Dict, List, Any, Optional
+from call_matcher import ImportedCallMatcher
+
+FUNCTION_DEF_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef)
+SCOPE_TYPES = FUNCTION_DEF_TYPES + (ast.ClassDef,)
+
+# Fields holding only context/operator singletons, never walked
+SKIPPED_FIELDS = {'ctx', 'op', 'ops'}
+
+# Marks the end of a class or function body on the walk stack
+_LEAVE = object()
+
+
+def dotted_name(node) -> Optional[str]:
+    """'self.db.query' for a Name/Attribute chain, None for any other expression"""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+
+def source_segment(lines: List[str], start_line: int, col_offset: int, end_line: int) -> str:
+    """Source text of a statement starting at (start_line, col_offset), to the end of its last line"""
+    segment = lines[start_line - 1:end_line]
+    if not segment:
+        return ''
+    segment[0] = segment[0][col_offset:] if segment[0][:col_offset].isspace() else segment[0].lstrip()
+    return '\n'.join(segment)
+
+
+class PythonExtractionVisitor:
+    """Collects imports, definitions, exports and call sites of a Python module.
+
+    Built on the stdlib ``ast`` module, it fills the same lists as the JavaScript
+    extraction visitor, so create_file_node emits the same schema for both languages.
+    Like ASTVisitor, the tree is walked once in pre-order without recursion, with a
+    node type -> handler dispatch table instead of ``ast.NodeVisitor``'s recursive
+    per-node method lookup. Modules are resolved to files by the caller; modules that
+    do not resolve to a file of the codebase (stdlib, third-party packages) are kept
+    as undefined imports.
+    """
+
+    def __init__(self, resolve_module: Callable[[Optional[str], int], Optional[str]]):
+        """
+        Args:
+            resolve_module: Resolves (module name, relative import level) to the stored
+                path of the module's file, or None if it is not part of the codebase
+        """
+        self.resolve_module = resolve_module
+
+        # Imports
+        self.raw_imports = []
+        self.imported_paths = []
+        self.undefined_imports = []
+        self.imported_variables = []  # [variable_name, path]
+        self.imported_functions = []  # [function_name, path]
+
+        # Definitions
+        self.names_of_functions_defined = []
+        self.names_of_classes_defined = []
+        self.function_definitions = []
+        self.class_definitions = []
+
+        # Exports: __all__ if the module defines it, else its public top-level names
+        self.dunder_all = None
+        self.module_names = []
+
+        # Call sites
+        self.direct_calls = []        # callee names
+        self.member_calls = []        # (object_name, method_name)
+        self.instantiations = []      # (variable_name, class_name)
+        self.sites = []               # [callee, callee_text, function_name, start_byte, end_byte]
+
+        self._lines = []
+        self._line_bytes = []
+        self._owners = []             # enclosing ClassDef / FunctionDef nodes
+        self._scopes = []             # enclosing function names
+
+        self.handlers = {
+            ast.Module: self._handle_module,
+            ast.Import: self._handle_import,
+            ast.ImportFrom: self._handle_import_from,
+            ast.FunctionDef: self._handle_function,
+            ast.AsyncFunctionDef: self._handle_function,
+            ast.ClassDef: self._handle_class,
+            ast.Assign: self._handle_assign,
+            ast.Call: self._handle_call,
+        }
+
+    def extract(self, source: str, filename: str = '<unknown>'):
+        """
+        Parse a module and collect its metadata
+        Args:
+            source: Module source code
+            filename: Path used in syntax error messages
+        Returns:
+            self, with the collected lists filled (left empty if the module does not parse)
+        """
+        try:
+            tree = ast.parse(source, filename=filename)
+        except (SyntaxError, ValueError) as e:
+            print(f"Error parsing {filename}: {e}")
+            return self
+
+        self._lines = source.split('\n')
+        # ast column offsets are UTF-8 byte offsets within the line
+        self._line_bytes = [0]
+        for line in self._lines:
+            self._line_bytes.append(self._line_bytes[-1] + len(line.encode('utf-8')) + 1)
+
+        self._walk(tree)
+        return self
+
+    def _walk(self, tree):
+        handlers = self.handlers
+        stack = [tree]
+        while stack:
+            node = stack.pop()
+            if node is _LEAVE:
+                if isinstance(self._owners.pop(), FUNCTION_DEF_TYPES):
+                    self._scopes.pop()
+                continue
+
+            handler = handlers.get(type(node))
+            if handler is not None:
+                try:
+                    handler(node)
+                except Exception as e:
+                    print(f"Error processing {type(node).__name__} node: {e}")
+
+            if isinstance(node, SCOPE_TYPES):
+                self._owners.append(node)
+                if isinstance(node, FUNCTION_DEF_TYPES):
+                    self._scopes.append(node.name)
+                stack.append(_LEAVE)
+
+            # Push children reversed so they are popped in source order
+            children = []
+            for field in node._fields:
+                if field in SKIPPED_FIELDS:
+                    continue
+                value = getattr(node, field, None)
+                if isinstance(value, list):
+                    children.extend(item for item in value if isinstance(item, ast.AST))
+                elif isinstance(value, ast.AST):
+                    children.append(value)
+            children.reverse()
+            stack.extend(children)
+
+    # Source positions --------------------------------------------------------
+
+    def _segment(self, node) -> str:
+        """Source text of a statement, from its first decorator to its last line"""
+        decorators = getattr(node, 'decorator_list', None)
+        first = decorators[0] if decorators else node
+        return source_segment(self._lines, first.lineno, first.col_offset, node.end_lineno)
+
+    @staticmethod
+    def _node_lines(node):
+        decorators = getattr(node, 'decorator_list', None)
+        return (decorators[0] if decorators else node).lineno, node.end_lineno
+
+    def _byte_span(self, node):
+        return (self._line_bytes[node.lineno - 1] + node.col_offset,
+                self._line_bytes[node.end_lineno - 1] + node.end_col_offset)
+
+    # Module ------------------------------------------------------------------
+
+    def _handle_module(self, node):
+        for statement in node.body:
+            if isinstance(statement, SCOPE_TYPES):
+                self.module_names.append(statement.name)
+            elif isinstance(statement, (ast.Assign, ast.AnnAssign)):
+                targets = statement.targets if isinstance(statement, ast.Assign) else [statement.target]
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        if target.id == '__all__' and isinstance(statement.value, (ast.List, ast.Tuple)):
+                            self.dunder_all = [
+                                element.value for element in statement.value.elts
+                                if isinstance(element, ast.Constant) and isinstance(element.value, str)
+                            ]
+                        else:
+                            self.module_names.append(target.id)
+
+    # Imports -----------------------------------------------------------------
+
+    def _add_import_path(self, module: Optional[str], level: int) -> str:
+        resolved = self.resolve_module(module, level)
+        if resolved is not None:
+            self.imported_paths.append(resolved)
+            return resolved
+        specifier = '.' * level + (module or '')
+        self.undefined_imports.append(specifier)
+        return specifier
+
+    def _handle_import(self, node):
+        self.raw_imports.append(self._segment(node))
+        for alias in node.names:
+            current_path = self._add_import_path(alias.name, 0)
+            self.imported_variables.append([alias.asname or alias.name, current_path])
+
+    def _handle_import_from(self, node):
+        self.raw_imports.append(self._segment(node))
+        current_path = self._add_import_path(node.module, node.level)
+
+        for alias in node.names:
+            if alias.name == '*':
+                continue
+            name = alias.asname or alias.name
+            # from package import submodule
+            submodule = f'{node.module}.{alias.name}' if node.module else alias.name
+            submodule_path = self.resolve_module(submodule, node.level)
+            if submodule_path is not None:
+                self.imported_paths.append(submodule_path)
+                self.imported_variables.append([name, submodule_path])
+            else:
+                self.imported_functions.append([name, current_path])
+
+    # Definitions -------------------------------------------------------------
+
+    def _add_function(self, name: str, node, unique: bool = True):
+        if not name or (unique and name in self.names_of_functions_defined):
+            return
+        self.names_of_functions_defined.append(name)
+        start, end = self._node_lines(node)
+        self.function_definitions.append({
+            'function_name': name,
+            'function_code': self._segment(node),
+            'start_line': start,
+            'end_line': end
+        })
+
+    def _handle_function(self, node):
+        is_method = bool(self._owners) and isinstance(self._owners[-1], ast.ClassDef)
+        # Methods are also listed as functions, as for JavaScript method definitions
+        self._add_function(node.name, node, unique=not is_method)
+
+    def _handle_class(self, node):
+        if node.name not in self.names_of_classes_defined:
+            self.names_of_classes_defined.append(node.name)
+
+        start, end = self._node_lines(node)
+        class_info = {
+            'class_name': node.name,
+            'class_code': self._segment(node),
+            'class_start_point': start,
+            'class_end_point': end,
+            'methods': []
+        }
+        for method in node.body:
+            if isinstance(method, FUNCTION_DEF_TYPES):
+                method_start, method_end = self._node_lines(method)
+                class_info['methods'].append({
+                    'method_name': method.name,
+                    'method_code': self._segment(method),
+                    'method_start_point': method_start,
+                    'method_end_point': method_end
+                })
+        self.class_definitions.append(class_info)
+
+    def _handle_assign(self, node):
+        if len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            name = node.targets[0].id
+            if isinstance(node.value, ast.Lambda):
+                # handler = lambda event: ...
+                self._add_function(name, node)
+            elif isinstance(node.value, ast.Call) and isinstance(node.value.func, ast.Name):
+                # service = DefaultService(...)
+                self.instantiations.append((name, node.value.func.id))
+
+    # Call sites --------------------------------------------------------------
+
+    def _handle_call(self, node):
+        func = node.func
+        callee = None
+        if isinstance(func, ast.Name):
+            callee = func.id
+            self.direct_calls.append(callee)
+        elif isinstance(func, ast.Attribute):
+            callee = func.attr
+            if isinstance(func.value, ast.Name):
+                self.member_calls.append((func.value.id, func.attr))
+
+        if callee is not None:
+            start_byte, end_byte = self._byte_span(node)
+            self.sites.append([
+                callee,
+                dotted_name(func) or callee,
+                self._scopes[-1] if self._scopes else None,
+                start_byte,
+                end_byte
+            ])
+
+    # Results -----------------------------------------------------------------
+
+    def imports_info(self) -> Dict[str, list]:
+        return {
+            'raw_imports': sorted(set(self.raw_imports)),
+            'imported_paths': sorted(set(self.imported_paths)),
+            'undefined_imports': sorted(set(self.undefined_imports)),
+            'imported_variables': sorted(self.imported_variables, key=lambda x: x[0]),
+            'imported_functions': sorted(self.imported_functions, key=lambda x: x[0])
+        }
+
+    def definitions_info(self) -> Dict[str, Any]:
+        return {
+            'names_of_functions_defined': sorted(self.names_of_functions_defined),
+            'names_of_classes_defined': sorted(self.names_of_classes_defined),
+            'methods_of_classes': [],
+            'function_definitions': sorted(self.function_definitions, key=lambda x: x['function_name']),
+            'class_definitions': sorted(self.class_definitions, key=lambda x: x['class_name'])
+        }
+
+    def exports_info(self, defined_functions: List[str], defined_classes: List[str]) -> Dict[str, list]:
+        exports = {
+            'exported_functions': [],
+            'exported_variables': [],
+            'exported_class': []
+        }
+
+        if self.dunder_all is not None:
+            names = self.dunder_all
+        else:
+            names = [name for name in self.module_names if not name.startswith('_')]
+
+        for name in names:
+            if name in defined_functions:
+                exports['exported_functions'].append(name)
+            elif name in defined_classes:
+                exports['exported_class'].append(name)
+            else:
+                exports['exported_variables'].append(name)
+
+        for key in exports:
+            exports[key] = sorted(set(exports[key]))
+        return exports
+
+    def function_calls(self, imported_variables: List, imported_functions: List) -> List[Dict[str, str]]:
+        matcher = ImportedCallMatcher(imported_variables, imported_functions, self.instantiations)
+        return matcher.match(self.direct_calls, self.member_calls)
+
+    def call_sites_info(self) -> List[list]:
+        """Serializable call sites: [callee, callee_text, function_name, start_byte, end_byte]"""
+        return [list(site) for site in self.sites]
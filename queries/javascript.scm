@@ -0,0 +1,148 @@
+; Extraction queries for JavaScript, covering the constructs of JS_PATTERNS in global_regex.py.
+;
+; Capture names are <create_file_node group>.<kind>. Each capture marks the node the
+; matching field is read from (see query_extractor.JavaScriptQueryExtractor). Captures
+; starting with an underscore only feed predicates.
+
+; Imports ----------------------------------------------------------------------
+
+; import D, { a, b as c } from './m' / import * as ns from 'x' / import './side'
+(import_statement
+  source: (string)) @import.statement
+
+; export { a } from './m' / export * from './m'
+(export_statement
+  source: (string) @import.export_from)
+
+; import('./m')
+(call_expression
+  function: (import)) @import.dynamic
+
+; const x = require('./m') / const { a, b } = require('./m')
+(lexical_declaration
+  kind: "const"
+  (variable_declarator
+    name: [(identifier) (object_pattern)]
+    value: (call_expression
+      function: (identifier) @_require
+      arguments: (arguments . (string))))
+  (#eq? @_require "require")) @import.require
+
+; Functions --------------------------------------------------------------------
+
+; function foo() {} / async function foo() {} / function* foo() {}
+(function_declaration) @function.declaration
+(generator_function_declaration) @function.declaration
+
+; class { foo() {} } / { foo() {} }
+(method_definition
+  name: (property_identifier)) @function.method
+
+; { foo: function () {} } / { foo: () => {} }
+(pair
+  key: (property_identifier)
+  value: [(function) (arrow_function)]) @function.pair
+
+; const foo = () => {} / let foo = async function () {} / var foo = function* () {}
+(lexical_declaration
+  (variable_declarator
+    name: (identifier)
+    value: [(function) (arrow_function) (generator_function)])) @function.variable
+(variable_declaration
+  (variable_declarator
+    name: (identifier)
+    value: [(function) (arrow_function) (generator_function)])) @function.variable
+
+; Classes ----------------------------------------------------------------------
+
+; class Foo extends Bar {}
+(class_declaration
+  name: (identifier)) @class.declaration
+
+; const Foo = class {}
+(variable_declarator
+  name: (identifier)
+  value: (class)) @class.expression
+
+; Exports ----------------------------------------------------------------------
+
+; export function foo() {} / export class Foo {} / export const foo = ...
+(export_statement
+  declaration: [(function_declaration name: (identifier) @export.function)
+                (generator_function_declaration name: (identifier) @export.function)
+                (class_declaration name: (identifier) @export.class)
+                (lexical_declaration (variable_declarator name: (identifier) @export.variable))
+                (variable_declaration (variable_declarator name: (identifier) @export.variable))])
+
+; export default foo / export { foo, bar as baz }
+(export_statement
+  value: (identifier) @export.name)
+(export_specifier
+  name: (identifier) @export.name)
+
+; module.exports = foo
+(assignment_expression
+  left: (member_expression
+    object: (identifier) @_module
+    property: (property_identifier) @_exports)
+  right: (identifier) @export.name
+  (#eq? @_module "module")
+  (#eq? @_exports "exports"))
+
+; module.exports = { foo, bar: baz, qux() {} }
+(assignment_expression
+  left: (member_expression
+    object: (identifier) @_module
+    property: (property_identifier) @_exports)
+  right: (object
+    [(shorthand_property_identifier) @export.member
+     (pair key: (property_identifier) @export.member)
+     (method_definition name: (property_identifier) @export.member)])
+  (#eq? @_module "module")
+  (#eq? @_exports "exports"))
+
+; module.exports.foo = ...
+(assignment_expression
+  left: (member_expression
+    object: (member_expression
+      object: (identifier) @_module
+      property: (property_identifier) @_exports)
+    property: (property_identifier))
+  (#eq? @_module "module")
+  (#eq? @_exports "exports")) @export.commonjs
+
+; Calls ------------------------------------------------------------------------
+
+; foo() / new Foo()
+(call_expression
+  function: (identifier) @call.direct)
+(new_expression
+  constructor: (identifier) @call.direct)
+
+; obj.method() / new ns.Foo()
+(call_expression
+  function: (member_expression
+    object: (identifier)
+    property: (property_identifier)) @call.member)
+(new_expression
+  constructor: (member_expression
+    object: (identifier)
+    property: (property_identifier)) @call.member)
+
+; const service = new Service()
+(lexical_declaration
+  kind: "const"
+  (variable_declarator
+    name: (identifier)
+    value: (new_expression
+      constructor: (identifier))) @call.instantiation)
+
+; Call sites with their enclosing function scope
+(call_expression
+  function: [(identifier) (member_expression property: (property_identifier))]) @call.site
+
+[(function_declaration)
+ (generator_function_declaration)
+ (method_definition)
+ (arrow_function)
+ (function)] @call.scope
@@ -0,0 +1,58 @@
+; Extraction queries for Python, covering the constructs of PY_PATTERNS in global_regex.py.
+;
+; Capture names are <create_file_node group>.<kind>. Each capture marks the node the
+; matching field is read from (see query_extractor.PythonQueryExtractor).
+
+; Imports ----------------------------------------------------------------------
+
+; import a.b as c, d
+(import_statement) @import.statement
+
+; from .m import a as b, c / from m import * / from __future__ import annotations
+(import_from_statement) @import.from
+(future_import_statement) @import.from
+
+; Functions --------------------------------------------------------------------
+
+; def foo(): ... / async def foo(): ... / @decorated def foo(): ... / methods
+(function_definition) @function.definition
+
+; handler = lambda event: ...
+(expression_statement
+  (assignment
+    left: (identifier)
+    right: (lambda)) @function.lambda)
+
+; Classes ----------------------------------------------------------------------
+
+; class Foo(Base): ... / @dataclass class Foo: ...
+(class_definition) @class.definition
+
+; Exports ----------------------------------------------------------------------
+
+; Top-level definitions and assignments, __all__ included
+(module
+  [(function_definition) (class_definition)] @export.definition)
+(module
+  (decorated_definition
+    definition: (_) @export.definition))
+(module
+  (expression_statement
+    (assignment) @export.assignment))
+
+; Calls ------------------------------------------------------------------------
+
+; service = Service()
+(expression_statement
+  (assignment
+    left: (identifier)
+    right: (call
+      function: (identifier))) @call.instantiation)
+
+; foo() / obj.method() / self.db.query(), with their enclosing function scope
+; (decorators included); the callee may be parenthesized
+(call) @call.site
+
+(decorated_definition
+  definition: (function_definition)) @call.scope
+(function_definition) @call.scope
@@ -0,0 +1,171 @@
+; Extraction queries for TypeScript and TSX, covering the constructs of JS_PATTERNS in
+; global_regex.py, its 'typescript' section included (interfaces, type aliases, enums)
+; as well as decorated classes.
+;
+; Capture names are <create_file_node group>.<kind>. Each capture marks the node the
+; matching field is read from (see query_extractor.TypeScriptQueryExtractor). Captures
+; starting with an underscore only feed predicates. The file is compiled against both
+; the typescript and the tsx grammar.
+
+; Imports ----------------------------------------------------------------------
+
+; import D, { a, type B } from './m' / import type { A } from './m' / import './side'
+(import_statement
+  source: (string)) @import.statement
+
+; export { a } from './m' / export * from './m'
+(export_statement
+  source: (string) @import.export_from)
+
+; import('./m')
+(call_expression
+  function: (import)) @import.dynamic
+
+; const x = require('./m') / const { a, b } = require('./m')
+(lexical_declaration
+  kind: "const"
+  (variable_declarator
+    name: [(identifier) (object_pattern)]
+    value: (call_expression
+      function: (identifier) @_require
+      arguments: (arguments . (string))))
+  (#eq? @_require "require")) @import.require
+
+; Functions --------------------------------------------------------------------
+
+; function fmt(a: string): string;  (overload, merged into the implementation)
+(function_signature
+  name: (identifier)) @function.signature
+
+; function foo() {} / async function foo() {} / function* foo() {}
+(function_declaration) @function.declaration
+(generator_function_declaration) @function.declaration
+
+; { foo: function () {} } / { foo: () => {} }
+(pair
+  key: (property_identifier)
+  value: [(function) (arrow_function)]) @function.pair
+
+; const foo = () => {} / let foo = async function () {} / var foo = function* () {}
+(lexical_declaration
+  (variable_declarator
+    name: (identifier)
+    value: [(function) (arrow_function) (generator_function)])) @function.variable
+(variable_declaration
+  (variable_declarator
+    name: (identifier)
+    value: [(function) (arrow_function) (generator_function)])) @function.variable
+
+; class { foo() {} } / { foo() {} }
+(method_definition
+  name: (property_identifier)) @function.method
+
+; Classes ----------------------------------------------------------------------
+
+; @Injectable() class Foo extends Bar implements Baz {} / abstract class Foo {}
+(class_declaration
+  name: (type_identifier)) @class.declaration
+(abstract_class_declaration
+  name: (type_identifier)) @class.declaration
+
+; const Foo = class {}
+(variable_declarator
+  name: (identifier)
+  value: (class)) @class.expression
+
+; Types ------------------------------------------------------------------------
+
+; interface Foo {} / type Foo = ... / enum Foo {}
+(interface_declaration
+  name: (type_identifier)) @type.definition
+(type_alias_declaration
+  name: (type_identifier)) @type.definition
+(enum_declaration
+  name: (identifier)) @type.definition
+
+; Exports ----------------------------------------------------------------------
+
+; export function foo() {} / export class Foo {} / export const foo = ... / export interface Foo {}
+(export_statement
+  declaration: [(function_declaration name: (identifier) @export.function)
+                (generator_function_declaration name: (identifier) @export.function)
+                (class_declaration name: (type_identifier) @export.class)
+                (abstract_class_declaration name: (type_identifier) @export.class)
+                (lexical_declaration (variable_declarator name: (identifier) @export.variable))
+                (variable_declaration (variable_declarator name: (identifier) @export.variable))
+                (interface_declaration name: (type_identifier) @export.type)
+                (type_alias_declaration name: (type_identifier) @export.type)
+                (enum_declaration name: (identifier) @export.type)])
+
+; export default foo / export { foo, bar as baz }
+(export_statement
+  value: (identifier) @export.name)
+(export_specifier
+  name: (identifier) @export.name)
+
+; module.exports = foo
+(assignment_expression
+  left: (member_expression
+    object: (identifier) @_module
+    property: (property_identifier) @_exports)
+  right: (identifier) @export.name
+  (#eq? @_module "module")
+  (#eq? @_exports "exports"))
+
+; module.exports = { foo, bar: baz, qux() {} }
+(assignment_expression
+  left: (member_expression
+    object: (identifier) @_module
+    property: (property_identifier) @_exports)
+  right: (object
+    [(shorthand_property_identifier) @export.member
+     (pair key: (property_identifier) @export.member)
+     (method_definition name: (property_identifier) @export.member)])
+  (#eq? @_module "module")
+  (#eq? @_exports "exports"))
+
+; module.exports.foo = ...
+(assignment_expression
+  left: (member_expression
+    object: (member_expression
+      object: (identifier) @_module
+      property: (property_identifier) @_exports)
+    property: (property_identifier))
+  (#eq? @_module "module")
+  (#eq? @_exports "exports")) @export.commonjs
+
+; Calls ------------------------------------------------------------------------
+
+; foo() / new Foo()
+(call_expression
+  function: (identifier) @call.direct)
+(new_expression
+  constructor: (identifier) @call.direct)
+
+; obj.method() / new ns.Foo()
+(call_expression
+  function: (member_expression
+    object: (identifier)
+    property: (property_identifier)) @call.member)
+(new_expression
+  constructor: (member_expression
+    object: (identifier)
+    property: (property_identifier)) @call.member)
+
+; const service = new Service()
+(lexical_declaration
+  kind: "const"
+  (variable_declarator
+    name: (identifier)
+    value: (new_expression
+      constructor: (identifier))) @call.instantiation)
+
+; Call sites with their enclosing function scope
+(call_expression
+  function: [(identifier) (member_expression property: (property_identifier))]) @call.site
+
+[(function_declaration)
+ (generator_function_declaration)
+ (method_definition)
+ (arrow_function)
+ (function)] @call.scope
@@ -0,0 +1,735 @@
+import ast
+import os
+import re
+from typing import Callable, Dict, List, Optional
+from parser_pool import get_language
+from extraction_visitor import (JavaScriptExtractionVisitor, TypeScriptExtractionVisitor, ANONYMOUS_FUNCTION_TYPES,
+                                 NAMING_PARENT_TYPES, TYPE_DECLARATION_TYPES)
+from python_extractor import PythonExtractionVisitor, source_segment
+
+# Directory holding one <language>.scm query file per language
+QUERY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'queries')
+
+# Per-process compiled queries, keyed by language
+_queries = {}
+
+FUNCTION_VALUE_TYPES = ('function', 'arrow_function', 'generator_function')
+
+
+def query_path(language: str) -> str:
+    """Path of the query file of a language"""
+    return os.path.join(QUERY_DIR, f'{language}.scm')
+
+
+def has_query(language: str) -> bool:
+    """Whether the 'query' backend supports a language"""
+    return os.path.isfile(query_path(language))
+
+
+def get_query(language: str, grammar: str = None):
+    """
+    Compiled extraction query of a language, compiled once per process
+    Args:
+        language: Language of the query file (queries/<language>.scm)
+        grammar: Grammar to compile it against (default: the language), e.g. 'tsx'
+    """
+    grammar = grammar or language
+    if (language, grammar) not in _queries:
+        with open(query_path(language), 'r', encoding='utf-8') as f:
+            _queries[language, grammar] = get_language(grammar).query(f.read())
+    return _queries[language, grammar]
+
+
+def _text(node) -> str:
+    return node.text.decode('utf-8', errors='replace') if node is not None else ''
+
+
+def _field_text(node, field: str) -> str:
+    return _text(node.child_by_field_name(field))
+
+
+def _lines(node):
+    return node.start_point[0] + 1, node.end_point[0] + 1
+
+
+def _scope_name(node):
+    """Name of a tree-sitter function node, or None for anonymous callbacks"""
+    if node.type in ANONYMOUS_FUNCTION_TYPES:
+        node = node.parent
+        if node is None or node.type not in NAMING_PARENT_TYPES:
+            return None
+    for child in node.children:
+        if child.type in ('identifier', 'property_identifier', 'member_expression', 'string'):
+            return _text(child).strip('\'"')
+    return None
+
+
+class JavaScriptQueryExtractor(JavaScriptExtractionVisitor):
+    """Extraction backend running the compiled queries of queries/javascript.scm.
+
+    Matching is done by tree-sitter in C over the raw parse tree, so no compact AST is
+    built and no node text is matched with regexes. Every capture is dispatched to the
+    handler of its name, which fills the same lists as the single-pass visitor; results
+    are then assembled by the visitor's ``*_info`` methods, giving the same
+    ``create_file_node`` schema.
+    """
+
+    QUERY_LANGUAGE = 'javascript'
+
+    def __init__(self, resolve_path: Callable[[str], str], grammar: str = None):
+        """
+        Args:
+            resolve_path: Resolves a relative import specifier of the extracted file
+            grammar: Grammar the file was parsed with (default: QUERY_LANGUAGE)
+        """
+        super().__init__(resolve_path)
+        self.query = get_query(self.QUERY_LANGUAGE, grammar)
+        self._node_lines = _lines
+
+        # Exports, classified once the defined names are known
+        self.exported_functions = []
+        self.exported_classes = []
+        self.exported_declarations = []   # export const/let/var names
+        self.exported_names = []          # names classified against the definitions
+        self.exported_members = []        # module.exports object keys, kept if defined functions
+        self.commonjs_named_exports = []  # (name, value node type)
+
+        self._scopes = []                 # (end_byte, scope name)
+
+        self.capture_handlers = {
+            'import.statement': self._capture_import_statement,
+            'import.export_from': self._capture_export_from,
+            'import.dynamic': self._capture_dynamic_import,
+            'import.require': self._capture_require,
+            'function.declaration': self._capture_function,
+            'function.method': self._capture_method,
+            'function.pair': self._capture_pair,
+            'function.variable': self._capture_function_variable,
+            'class.declaration': self._capture_class,
+            'class.expression': self._capture_class,
+            'export.function': lambda node: self.exported_functions.append(_text(node)),
+            'export.class': lambda node: self.exported_classes.append(_text(node)),
+            'export.variable': lambda node: self.exported_declarations.append(_text(node)),
+            'export.name': lambda node: self.exported_names.append(_text(node)),
+            'export.member': lambda node: self.exported_members.append(_text(node)),
+            'export.commonjs': self._capture_commonjs_export,
+            'call.direct': lambda node: self.direct_calls.append(_text(node)),
+            'call.member': self._capture_member_call,
+            'call.instantiation': self._capture_instantiation,
+            'call.site': self._capture_call_site,
+            'call.scope': self._capture_scope,
+        }
+
+    def visit(self, root):
+        """
+        Run the extraction query over a parse tree
+        Args:
+            root: tree-sitter root node (or tree) of the file
+        Returns:
+            self, with the collected lists filled
+        """
+        if root is None:
+            return self
+        if hasattr(root, 'root_node'):
+            root = root.root_node
+
+        # Captures come back in document order, which the scope stack relies on
+        for node, name in self.query.captures(root):
+            handler = self.capture_handlers.get(name)
+            if handler is None:
+                continue
+            try:
+                handler(node)
+            except Exception as e:
+                print(f"Error processing {name} capture: {e}")
+        return self
+
+    # Imports -----------------------------------------------------------------
+
+    def _capture_import_statement(self, node):
+        self.raw_imports.append(_text(node))
+        current_path = self._add_import_path(_field_text(node, 'source').strip('\'"'))
+
+        for clause in node.named_children:
+            if clause.type != 'import_clause':
+                continue
+            for child in clause.named_children:
+                if child.type == 'identifier':
+                    self.imported_variables.append([_text(child), current_path])
+                elif child.type == 'namespace_import':
+                    for name in child.named_children:
+                        self.imported_variables.append([_text(name), current_path])
+                elif child.type == 'named_imports':
+                    for spec in child.named_children:
+                        if spec.type == 'import_specifier':
+                            name = spec.child_by_field_name('alias') or spec.child_by_field_name('name')
+                            self.imported_functions.append([_text(name), current_path])
+
+    def _capture_export_from(self, node):
+        self.raw_imports.append(_text(node.parent))
+        self._add_import_path(_text(node).strip('\'"'))
+
+    def _capture_dynamic_import(self, node):
+        statement = node.parent if node.parent is not None and node.parent.type == 'await_expression' else node
+        self.raw_imports.append(_text(statement))
+
+        arguments = node.child_by_field_name('arguments')
+        if arguments is not None and arguments.named_child_count and arguments.named_children[0].type == 'string':
+            self._add_import_path(_text(arguments.named_children[0]).strip('\'"'))
+
+    def _capture_require(self, node):
+        self.raw_imports.append(_text(node))
+
+        for declarator in node.named_children:
+            if declarator.type != 'variable_declarator':
+                continue
+            value = declarator.child_by_field_name('value')
+            if value is None or value.type != 'call_expression' or _field_text(value, 'function') != 'require':
+                continue
+            arguments = value.child_by_field_name('arguments')
+            if not arguments.named_child_count or arguments.named_children[0].type != 'string':
+                continue
+            current_path = self._add_import_path(_text(arguments.named_children[0]).strip('\'"'))
+
+            name = declarator.child_by_field_name('name')
+            if name.type == 'identifier':
+                self.imported_variables.append([_text(name), current_path])
+            else:
+                # Destructured require
+                for prop in name.named_children:
+                    if prop.type == 'shorthand_property_identifier_pattern':
+                        self.imported_functions.append([_text(prop), current_path])
+
+    # Definitions -------------------------------------------------------------
+
+    def _capture_function(self, node):
+        self._add_function(_field_text(node, 'name'), node, _text(node))
+
+    def _capture_method(self, node):
+        self._add_function(_field_text(node, 'name'), node, _text(node), unique=False)
+
+    def _capture_pair(self, node):
+        self._add_function(_field_text(node, 'key'), node, _text(node))
+
+    def _capture_function_variable(self, node):
+        text = _text(node)
+        for declarator in node.named_children:
+            if declarator.type == 'variable_declarator':
+                value = declarator.child_by_field_name('value')
+                if value is not None and value.type in FUNCTION_VALUE_TYPES:
+                    self._add_function(_field_text(declarator, 'name'), node, text)
+
+    def _capture_class(self, node):
+        class_name = _field_text(node, 'name')
+        if class_name not in self.names_of_classes_defined:
+            self.names_of_classes_defined.append(class_name)
+
+        start, end = _lines(node)
+        class_info = {
+            'class_name': class_name,
+            'class_code': _text(node),
+            'class_start_point': start,
+            'class_end_point': end,
+            'methods': []
+        }
+
+        body_owner = node.child_by_field_name('value') if node.type == 'variable_declarator' else node
+        body = body_owner.child_by_field_name('body')
+        for method in (body.named_children if body is not None else []):
+            if method.type == 'method_definition':
+                method_start, method_end = _lines(method)
+                class_info['methods'].append({
+                    'method_name': _field_text(method, 'name'),
+                    'method_code': _text(method),
+                    'method_start_point': method_start,
+                    'method_end_point': method_end
+                })
+
+        self.class_definitions.append(class_info)
+
+    # Exports -----------------------------------------------------------------
+
+    def _capture_commonjs_export(self, node):
+        name = _field_text(node.child_by_field_name('left'), 'property')
+        self.commonjs_named_exports.append((name, node.child_by_field_name('right').type))
+
+    # Call sites --------------------------------------------------------------
+
+    def _capture_member_call(self, node):
+        self.member_calls.append((_field_text(node, 'object'), _field_text(node, 'property')))
+
+    def _capture_instantiation(self, node):
+        constructor = node.child_by_field_name('value').child_by_field_name('constructor')
+        self.instantiations.append((_field_text(node, 'name'), _text(constructor)))
+
+    def _capture_scope(self, node):
+        name = _scope_name(node)
+        if name is not None:
+            self._current_scope(node.start_byte)
+            scope = node.parent if node.type in ANONYMOUS_FUNCTION_TYPES else node
+            self._scopes.append((scope.end_byte, name))
+
+    def _capture_call_site(self, node):
+        callee_node = node.child_by_field_name('function')
+        if callee_node.type == 'identifier':
+            callee = _text(callee_node)
+        else:
+            callee = _field_text(callee_node, 'property')
+
+        # Keep dotted paths like 'this.db.query'; chained calls fall back to the bare name
+        callee_text = ''.join(_text(callee_node).split())
+        if not re.fullmatch(r'[\w$.]+', callee_text):
+            callee_text = callee
+
+        self.sites.append((callee, callee_text, self._current_scope(node.start_byte), node))
+
+    # Results -----------------------------------------------------------------
+
+    def exports_info(self, defined_functions: List[str], defined_classes: List[str]) -> Dict[str, list]:
+        exports = {
+            'exported_functions': list(self.exported_functions),
+            'exported_variables': [],
+            'exported_class': list(self.exported_classes)
+        }
+
+        def classify(name):
+            if name in defined_functions:
+                exports['exported_functions'].append(name)
+            elif name in defined_classes:
+                exports['exported_class'].append(name)
+            else:
+                exports['exported_variables'].append(name)
+
+        for name in self.exported_declarations:
+            if name in defined_functions:
+                exports['exported_functions'].append(name)
+            else:
+                exports['exported_variables'].append(name)
+
+        for name in self.exported_names:
+            classify(name)
+
+        exports['exported_functions'].extend(name for name in self.exported_members if name in defined_functions)
+
+        for name, value_type in self.commonjs_named_exports:
+            if value_type == 'class' or name in defined_classes:
+                exports['exported_class'].append(name)
+            elif value_type in FUNCTION_VALUE_TYPES or name in defined_functions:
+                exports['exported_functions'].append(name)
+            else:
+                exports['exported_variables'].append(name)
+
+        for key in exports:
+            exports[key] = sorted(set(exports[key]))
+        return exports
+
+    def call_sites_info(self) -> List[list]:
+        """Serializable call sites: [callee, callee_text, function_name, start_byte, end_byte]"""
+        # Outer calls of a chain first, as in a pre-order walk
+        sites = sorted(self.sites, key=lambda site: (site[3].start_byte, -site[3].end_byte))
+        return [
+            [callee, callee_text, scope, node.start_byte, node.end_byte]
+            for callee, callee_text, scope, node in sites
+        ]
+
+
+class TypeScriptQueryExtractor(JavaScriptQueryExtractor, TypeScriptExtractionVisitor):
+    """Extraction backend running the compiled queries of queries/typescript.scm.
+
+    Gives the same results as TypeScriptExtractionVisitor: type-only imports are
+    skipped, overload signatures are merged into their implementation, methods are
+    listed with their (possibly abstract, decorated) class and as functions, and the
+    interfaces, type aliases and enums defined and exported by the file are collected.
+    """
+
+    QUERY_LANGUAGE = 'typescript'
+
+    def __init__(self, resolve_path: Callable[[str], str], grammar: str = None):
+        """
+        Args:
+            resolve_path: Resolves a relative import specifier of the extracted file
+            grammar: 'typescript', or 'tsx' for .tsx files
+        """
+        super().__init__(resolve_path, grammar)
+        self.exported_types = []
+
+        self.capture_handlers.update({
+            'function.signature': self._capture_function_signature,
+            'type.definition': self._capture_type_definition,
+            'export.type': lambda node: self.exported_types.append(_text(node)),
+        })
+
+    # Imports -----------------------------------------------------------------
+
+    def _capture_import_statement(self, node):
+        self.raw_imports.append(_text(node))
+        current_path = self._add_import_path(_field_text(node, 'source').strip('\'"'))
+
+        # import type { A } from './a' only imports types
+        type_only = any(child.type == 'type' for child in node.children)
+
+        for clause in node.named_children:
+            if clause.type != 'import_clause':
+                continue
+            for child in clause.named_children:
+                if child.type == 'identifier':
+                    self.imported_variables.append([_text(child), current_path])
+                elif child.type == 'namespace_import':
+                    for name in child.named_children:
+                        self.imported_variables.append([_text(name), current_path])
+                elif child.type == 'named_imports' and not type_only:
+                    for spec in child.named_children:
+                        # import { type A } from './a'
+                        if spec.type == 'import_specifier' and not any(c.type == 'type' for c in spec.children):
+                            name = spec.child_by_field_name('alias') or spec.child_by_field_name('name')
+                            self.imported_functions.append([_text(name), current_path])
+
+    # Definitions -------------------------------------------------------------
+
+    def _capture_function_signature(self, node):
+        overload = self._overloads.setdefault(_field_text(node, 'name'), {'codes': [], 'start_line': None})
+        overload['codes'].append(_text(node))
+        if overload['start_line'] is None:
+            overload['start_line'] = _lines(node)[0]
+
+    def _capture_function(self, node):
+        name = _field_text(node, 'name')
+        overload = self._overloads.pop(name, None)
+        if overload is None:
+            self._add_function(name, node, _text(node))
+            return
+
+        count = len(self.function_definitions)
+        self._add_function(name, node, '\n'.join(overload['codes'] + [_text(node)]))
+        if len(self.function_definitions) > count:
+            self.function_definitions[-1]['start_line'] = overload['start_line']
+
+    @staticmethod
+    def _export_decorators(node) -> List:
+        """Decorators of an exported class, kept on its export statement (see TypeScriptExtractionVisitor)"""
+        if node.parent is None or node.parent.type != 'export_statement':
+            return []
+        return [child for child in node.parent.children if child.type == 'decorator']
+
+    def _capture_class(self, node):
+        class_name = _field_text(node, 'name')
+        if class_name not in self.names_of_classes_defined:
+            self.names_of_classes_defined.append(class_name)
+
+        # A decorated class starts at its first decorator
+        decorators = self._export_decorators(node)
+        start, end = _lines(decorators[0] if decorators else node)[0], _lines(node)[1]
+        class_info = {
+            'class_name': class_name,
+            'class_code': ''.join(_text(decorator) + '\n' for decorator in decorators) + _text(node),
+            'class_start_point': start,
+            'class_end_point': end,
+            'methods': []
+        }
+
+        body_owner = node.child_by_field_name('value') if node.type == 'variable_declarator' else node
+        body = body_owner.child_by_field_name('body')
+        decorator_text = ''
+        decorator_line = None
+        for member in (body.named_children if body is not None else []):
+            if member.type == 'decorator':
+                # Method decorators precede the method in the class body
+                decorator_text += _text(member) + '\n    '
+                if decorator_line is None:
+                    decorator_line = _lines(member)[0]
+                continue
+
+            if member.type in ('method_definition', 'abstract_method_signature'):
+                name = member.child_by_field_name('name')
+                if name is not None and name.type in ('property_identifier', 'private_property_identifier'):
+                    prefix = next((child.type + '_' for child in member.children if child.type in ('get', 'set')), '')
+                    method_name = prefix + _text(name)
+                    self.methods_of_classes.append(method_name)
+                    method_start, method_end = _lines(member)
+                    class_info['methods'].append({
+                        'method_name': method_name,
+                        'method_code': decorator_text + _text(member),
+                        'method_start_point': decorator_line or method_start,
+                        'method_end_point': method_end
+                    })
+            decorator_text = ''
+            decorator_line = None
+
+        self.class_definitions.append(class_info)
+
+    def _capture_type_definition(self, node):
+        start, end = _lines(node)
+        self.type_definitions.append({
+            'type_name': _field_text(node, 'name'),
+            'type_kind': TYPE_DECLARATION_TYPES[node.type][0],
+            'type_code': _text(node),
+            'start_line': start,
+            'end_line': end
+        })
+
+    # Results -----------------------------------------------------------------
+
+    def exports_info(self, defined_functions: List[str], defined_classes: List[str]) -> Dict[str, list]:
+        exports = super().exports_info(defined_functions, defined_classes)
+        exports['exported_types'] = sorted(set(self.exported_types))
+        return exports
+
+
+# Python nodes holding a list of __all__ names
+PYTHON_SEQUENCE_TYPES = ('list', 'tuple', 'expression_list')
+
+
+def _dotted_text(node) -> str:
+    """'a.b' for a dotted_name node, whatever the spacing around the dots"""
+    return '.'.join(_text(part) for part in node.named_children) if node.type == 'dotted_name' else _text(node)
+
+
+def _unparenthesized(node):
+    """The expression inside redundant parentheses, as ast sees it"""
+    while node is not None and node.type == 'parenthesized_expression' and node.named_child_count == 1:
+        node = node.named_children[0]
+    return node
+
+
+def _python_dotted_name(node) -> Optional[str]:
+    """'self.db.query' for an identifier/attribute chain, None for any other expression"""
+    parts = []
+    while node.type == 'attribute':
+        parts.append(_field_text(node, 'attribute'))
+        node = _unparenthesized(node.child_by_field_name('object'))
+    if node.type != 'identifier':
+        return None
+    parts.append(_text(node))
+    return '.'.join(reversed(parts))
+
+
+def _last_line(node) -> int:
+    """Last line of a statement, ignoring the comments trailing its block"""
+    while node.named_child_count:
+        children = [child for child in node.children if child.type != 'comment']
+        if not children:
+            break
+        node = children[-1]
+    return node.end_point[0] + 1
+
+
+class PythonQueryExtractor(PythonExtractionVisitor):
+    """Extraction backend running the compiled queries of queries/python.scm.
+
+    Gives the same results as PythonExtractionVisitor, whose lists it fills from the
+    captures: definitions start at their first decorator and end at their last
+    statement, modules with syntax errors are left empty, and call sites are listed in
+    source order.
+    """
+
+    def __init__(self, resolve_module: Callable[[Optional[str], int], Optional[str]], grammar: str = None):
+        """
+        Args:
+            resolve_module: Resolves (module name, relative import level) to the stored
+                path of the module's file, or None if it is not part of the codebase
+            grammar: Grammar the module was parsed with (default: python)
+        """
+        super().__init__(resolve_module)
+        self.query = get_query('python', grammar)
+        self._scopes = []             # (end_byte, function name)
+
+        self.capture_handlers = {
+            'import.statement': self._capture_import,
+            'import.from': self._capture_import_from,
+            'function.definition': self._capture_function,
+            'function.lambda': self._capture_lambda,
+            'class.definition': self._capture_class,
+            'export.definition': lambda node: self.module_names.append(_field_text(node, 'name')),
+            'export.assignment': self._capture_module_assignment,
+            'call.instantiation': self._capture_instantiation,
+            'call.site': self._capture_call_site,
+            'call.scope': self._capture_scope,
+        }
+
+    def visit(self, tree):
+        """
+        Run the extraction query over the parse tree of a module
+        Args:
+            tree: tree-sitter tree of the module
+        Returns:
+            self, with the collected lists filled (left empty if the module does not parse)
+        """
+        if tree is None:
+            return self
+        root = tree.root_node
+        if root.has_error:
+            print("Error parsing module: syntax error")
+            return self
+
+        self._lines = tree.text.decode('utf-8', errors='replace').split('\n')
+
+        # Captures come back in document order, which the scope stack relies on
+        for node, name in self.query.captures(root):
+            handler = self.capture_handlers.get(name)
+            if handler is None:
+                continue
+            try:
+                handler(node)
+            except Exception as e:
+                print(f"Error processing {name} capture: {e}")
+        return self
+
+    # Source positions --------------------------------------------------------
+
+    @staticmethod
+    def _first(node):
+        """The decorated_definition of a decorated function or class, else the node"""
+        parent = node.parent
+        return parent if parent is not None and parent.type == 'decorated_definition' else node
+
+    def _segment(self, node) -> str:
+        first = self._first(node)
+        return source_segment(self._lines, first.start_point[0] + 1, first.start_point[1], _last_line(node))
+
+    def _node_lines(self, node):
+        return self._first(node).start_point[0] + 1, _last_line(node)
+
+    # Imports -----------------------------------------------------------------
+
+    def _capture_import(self, node):
+        self.raw_imports.append(self._segment(node))
+        for alias in node.children_by_field_name('name'):
+            name = alias.child_by_field_name('name') if alias.type == 'aliased_import' else alias
+            module = _dotted_text(name)
+            current_path = self._add_import_path(module, 0)
+            asname = alias.child_by_field_name('alias') if alias.type == 'aliased_import' else None
+            self.imported_variables.append([_text(asname) if asname is not None else module, current_path])
+
+    def _capture_import_from(self, node):
+        self.raw_imports.append(self._segment(node))
+        # from __future__ import x has no module_name field
+        module, level = '__future__', 0
+        module_name = node.child_by_field_name('module_name')
+        if module_name is not None and module_name.type == 'relative_import':
+            level = sum(_text(child).count('.') for child in module_name.children if child.type == 'import_prefix')
+            dotted = [child for child in module_name.named_children if child.type == 'dotted_name']
+            module = _dotted_text(dotted[0]) if dotted else None
+        elif module_name is not None:
+            module = _dotted_text(module_name)
+        current_path = self._add_import_path(module, level)
+
+        for alias in node.children_by_field_name('name'):
+            imported = _dotted_text(alias.child_by_field_name('name') if alias.type == 'aliased_import' else alias)
+            asname = alias.child_by_field_name('alias') if alias.type == 'aliased_import' else None
+            name = _text(asname) if asname is not None else imported
+            # from package import submodule
+            submodule = f'{module}.{imported}' if module else imported
+            submodule_path = self.resolve_module(submodule, level)
+            if submodule_path is not None:
+                self.imported_paths.append(submodule_path)
+                self.imported_variables.append([name, submodule_path])
+            else:
+                self.imported_functions.append([name, current_path])
+
+    # Definitions -------------------------------------------------------------
+
+    def _capture_function(self, node):
+        owner = node.parent
+        while owner is not None and owner.type not in ('function_definition', 'class_definition'):
+            owner = owner.parent
+        # Methods are also listed as functions, as for JavaScript method definitions
+        self._add_function(_field_text(node, 'name'), node,
+                           unique=owner is None or owner.type != 'class_definition')
+
+    def _capture_lambda(self, node):
+        if node.child_by_field_name('type') is None:
+            self._add_function(_field_text(node, 'left'), node)
+
+    def _capture_class(self, node):
+        class_name = _field_text(node, 'name')
+        if class_name not in self.names_of_classes_defined:
+            self.names_of_classes_defined.append(class_name)
+
+        start, end = self._node_lines(node)
+        class_info = {
+            'class_name': class_name,
+            'class_code': self._segment(node),
+            'class_start_point': start,
+            'class_end_point': end,
+            'methods': []
+        }
+        for statement in node.child_by_field_name('body').named_children:
+            method = statement.child_by_field_name('definition') if statement.type == 'decorated_definition' else statement
+            if method is not None and method.type == 'function_definition':
+                method_start, method_end = self._node_lines(method)
+                class_info['methods'].append({
+                    'method_name': _field_text(method, 'name'),
+                    'method_code': self._segment(method),
+                    'method_start_point': method_start,
+                    'method_end_point': method_end
+                })
+        self.class_definitions.append(class_info)
+
+    # Exports -----------------------------------------------------------------
+
+    def _capture_module_assignment(self, node):
+        # a = b = value lists both targets; an annotated assignment has no value chain
+        targets = []
+        value = node
+        while value is not None and value.type == 'assignment':
+            targets.append(value.child_by_field_name('left'))
+            value = value.child_by_field_name('right')
+
+        for target in map(_unparenthesized, targets):
+            if target.type != 'identifier':
+                continue
+            if _text(target) == '__all__' and value is not None and value.type in PYTHON_SEQUENCE_TYPES:
+                self.dunder_all = []
+                for element in value.named_children:
+                    if element.type not in ('string', 'concatenated_string'):
+                        continue
+                    try:
+                        name = ast.literal_eval(_text(element))
+                    except (SyntaxError, ValueError):
+                        continue
+                    if isinstance(name, str):
+                        self.dunder_all.append(name)
+            else:
+                self.module_names.append(_text(target))
+
+    # Call sites --------------------------------------------------------------
+
+    def _capture_instantiation(self, node):
+        if node.child_by_field_name('type') is None:
+            constructor = node.child_by_field_name('right').child_by_field_name('function')
+            self.instantiations.append((_field_text(node, 'left'), _text(constructor)))
+
+    def _current_scope(self, position: int):
+        while self._scopes and self._scopes[-1][0] <= position:
+            self._scopes.pop()
+        return self._scopes[-1][1] if self._scopes else None
+
+    def _capture_scope(self, node):
+        if node.type == 'function_definition' and node.parent is not None \
+                and node.parent.type == 'decorated_definition':
+            # Entered with its decorators, which belong to the function's scope
+            return
+        function = node.child_by_field_name('definition') if node.type == 'decorated_definition' else node
+        self._current_scope(node.start_byte)
+        self._scopes.append((node.end_byte, _field_text(function, 'name')))
+
+    def _capture_call_site(self, node):
+        function = _unparenthesized(node.child_by_field_name('function'))
+        if function.type == 'identifier':
+            callee = _text(function)
+            self.direct_calls.append(callee)
+        elif function.type == 'attribute':
+            callee = _field_text(function, 'attribute')
+            owner = _unparenthesized(function.child_by_field_name('object'))
+            if owner.type == 'identifier':
+                self.member_calls.append((_text(owner), callee))
+        else:
+            return
+
+        self.sites.append([
+            callee,
+            _python_dotted_name(function) or callee,
+            self._current_scope(node.start_byte),
+            node.start_byte,
+            node.end_byte
+        ])
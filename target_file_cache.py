@@ -0,0 +1,81 @@
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+# File properties read from call targets by FunctionCallAnalyzer; 'code' and the
+# import metadata are never fetched
+TARGET_FILE_FIELDS = ('path', 'names_of_functions_defined', 'class_definitions',
+                      'exported_functions', 'exported_class')
+
+TARGET_FILE_QUERY = """
+MATCH (f:File)
+WHERE f.path IN $paths
+RETURN f {%s} AS f
+""" % ', '.join('.' + field for field in TARGET_FILE_FIELDS)
+
+
+class TargetFileCache:
+    """Bounded LRU cache of the File metadata FunctionCallAnalyzer reads from call targets.
+
+    Only TARGET_FILE_FIELDS are projected, so the code of popular utility files is
+    never transferred. Paths without a File node are cached too, so they are not
+    looked up again. Misses of a batch of calls are fetched with one query; the
+    lookups of files fetched for the current batch count as neither hits nor misses.
+    """
+
+    def __init__(self, driver, max_entries: int = 4096):
+        """
+        Args:
+            driver: Neo4j driver
+            max_entries: Files kept; the least recently used are evicted first
+        """
+        self.driver = driver
+        self.max_entries = max_entries
+        self.entries: 'OrderedDict[str, Optional[Dict[str, Any]]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.queries = 0
+        self.evictions = 0
+        # Paths fetched by the latest prefetch, already counted as misses
+        self.batch: set = set()
+
+    def prefetch(self, paths: Iterable[str]):
+        """Fetch the uncached files among ``paths`` with a single query"""
+        missing = list({path for path in paths if path not in self.entries})
+        self.batch = set(missing)
+        if not missing:
+            return
+        self.misses += len(missing)
+        self.queries += 1
+        with self.driver.session() as session:
+            found = {record['f']['path']: record['f'] for record in session.run(TARGET_FILE_QUERY, paths=missing)}
+        for path in missing:
+            self._put(path, found.get(path))
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        """Metadata of a File node, or None if there is no File node with that path"""
+        if path in self.entries:
+            if path not in self.batch:
+                self.hits += 1
+            self.entries.move_to_end(path)
+            return self.entries[path]
+        self.prefetch([path])
+        return self.entries.get(path)
+
+    def _put(self, path: str, file_node: Optional[Dict[str, Any]]):
+        self.entries[path] = file_node
+        self.entries.move_to_end(path)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Return the cache counters."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'queries': self.queries,
+            'entries': len(self.entries),
+            'evictions': self.evictions
+        }
@@ -0,0 +1,34 @@
+import pytest
+
+from call_matcher import extract_calls
+from file_node_creator_ts import TypeScriptFileNodeCreator
+
+SERVICE = """import { format } from './format';
+
+export class UserService {
+    @Log()
+    describe(user: User): string {
+        return format(this.label(user));
+    }
+
+    private label(user: User): string {
+        return user.name;
+    }
+}
+"""
+
+
+@pytest.mark.parametrize('backend', ['visitor', 'query'])
+def test_method_calls_are_found(tmp_path, backend):
+    (tmp_path / 'format.ts').write_text("export function format(text: string) { return text; }\n")
+    service = tmp_path / 'service.ts'
+    service.write_text(SERVICE)
+
+    creator = TypeScriptFileNodeCreator(remove=str(tmp_path) + '/', connect=False, dump_ast=False, backend=backend)
+    node = creator.create_file_node(str(service))
+
+    # Methods become Function nodes, whose bodies test_analyzer scans for calls
+    assert {'describe', 'label'} <= set(node['names_of_functions_defined'])
+    describe = next(f for f in node['function_definitions'] if f['function_name'] == 'describe')
+    assert describe['start_line'] == 5
+    assert extract_calls(describe['function_code']) == ['format', 'this.label']